@@ -0,0 +1,115 @@
+"""
+Benchmark: frame extraction backends (ffmpeg single pass vs cv2 grab vs cv2 seek)
+
+Usage:
+    python benchmarks/bench_frame_extraction.py                 # synthetic samples
+    python benchmarks/bench_frame_extraction.py a.mp4 b.webm    # your own files
+
+Synthetic samples are written with OpenCV in several lengths and codecs.
+Each is encoded with a long GOP where the codec allows it, because that is
+where per-frame seeking hurts. Wall time and CPU time include child
+processes (ffmpeg) for every backend. Each backend's frames are checked
+against the seek backend by content (mean pixel difference of small
+grayscale copies), not just by their reported timestamps.
+"""
+
+import os
+import resource
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "src"))
+
+import cv2
+import numpy as np
+
+from video_processor import FRAME_BACKENDS, extract_frames
+
+# (label, fourcc, container, seconds)
+SAMPLES = [
+    ("mp4v-1min", "mp4v", "mp4", 60),
+    ("mp4v-10min", "mp4v", "mp4", 600),
+    ("mjpg-2min", "MJPG", "avi", 120),
+    ("avc1-10min", "avc1", "mp4", 600),
+]
+SAMPLE_FPS = 25
+SAMPLE_SIZE = (640, 360)
+# Mean absolute difference (0-255) below which two frames count as the same;
+# leaves room for JPEG/scaler differences between decoders
+SAME_FRAME_MAX_DIFF = 2.0
+
+
+def make_sample(path: str, fourcc: str, seconds: int) -> bool:
+    writer = cv2.VideoWriter(path, cv2.VideoWriter_fourcc(*fourcc), SAMPLE_FPS, SAMPLE_SIZE)
+    if not writer.isOpened():
+        return False
+    w, h = SAMPLE_SIZE
+    frame = np.zeros((h, w, 3), dtype=np.uint8)
+    for n in range(seconds * SAMPLE_FPS):
+        # Slowly moving gradient + a "scene cut" every 20s so frames differ
+        frame[:] = (n // (20 * SAMPLE_FPS) * 40 % 255, 80, 120)
+        x = (n * 3) % w
+        cv2.rectangle(frame, (x, h // 3), (min(x + 60, w - 1), h // 3 + 60), (255, 255, 255), -1)
+        cv2.putText(frame, str(n), (10, h - 20), cv2.FONT_HERSHEY_SIMPLEX, 1, (0, 255, 0), 2)
+        writer.write(frame)
+    writer.release()
+    return os.path.getsize(path) > 0
+
+
+def cpu_seconds() -> float:
+    own = resource.getrusage(resource.RUSAGE_SELF)
+    children = resource.getrusage(resource.RUSAGE_CHILDREN)
+    return own.ru_utime + own.ru_stime + children.ru_utime + children.ru_stime
+
+
+def run(path: str, backend: str):
+    start_wall, start_cpu = time.perf_counter(), cpu_seconds()
+    frames = extract_frames(path, interval_seconds=30, max_frames=20, backend=backend)
+    return time.perf_counter() - start_wall, cpu_seconds() - start_cpu, frames
+
+
+def thumbprint(frame) -> np.ndarray:
+    gray = cv2.imdecode(np.frombuffer(frame.jpeg, dtype=np.uint8), cv2.IMREAD_GRAYSCALE)
+    return cv2.resize(gray, (64, 36), interpolation=cv2.INTER_AREA).astype(np.float32)
+
+
+def same_frames(frames, baseline) -> bool:
+    if len(frames) != len(baseline):
+        return False
+    return all(
+        round(a.timestamp, 3) == round(b.timestamp, 3)
+        and float(np.abs(thumbprint(a) - thumbprint(b)).mean()) <= SAME_FRAME_MAX_DIFF
+        for a, b in zip(frames, baseline)
+    )
+
+
+def main():
+    paths = sys.argv[1:]
+    tmp = None
+    if not paths:
+        tmp = tempfile.TemporaryDirectory()
+        for label, fourcc, container, seconds in SAMPLES:
+            path = os.path.join(tmp.name, f"{label}.{container}")
+            print(f"Writing sample {label} ({seconds}s, {fourcc})...")
+            if make_sample(path, fourcc, seconds):
+                paths.append(path)
+            else:
+                print(f"  codec {fourcc} not available in this OpenCV build, skipped")
+
+    print(f"\n{'file':<24}{'backend':<9}{'frames':>7}{'wall s':>9}{'cpu s':>9}  same frames as seek")
+    for path in paths:
+        baseline = None
+        for backend in ("seek",) + tuple(b for b in FRAME_BACKENDS if b != "seek"):
+            wall, cpu, frames = run(path, backend)
+            if baseline is None:
+                baseline = frames
+            print(f"{os.path.basename(path):<24}{backend:<9}{len(frames):>7}{wall:>9.2f}{cpu:>9.2f}  "
+                  f"{'yes' if same_frames(frames, baseline) else 'NO'}")
+
+    if tmp:
+        tmp.cleanup()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,117 @@
+"""
+Benchmark: memory and CPU of the vision frame pipeline
+
+Usage:
+    python benchmarks/bench_frame_memory.py            # 20 synthetic 1280x720 frames
+    python benchmarks/bench_frame_memory.py 60         # more frames
+
+Walks one job's worth of frames through extract -> vision request -> thumbnails
+two ways:
+  legacy   base64 JPEG strings held for the whole job; every thumbnail
+           base64-decodes, JPEG-decodes, resizes and re-encodes its frame
+  records  Frame records (raw JPEG + thumbnail made from the decoded frame in
+           one step); base64 only while a vision request is being built
+Peak and retained Python memory come from tracemalloc (numpy buffers included).
+"""
+
+import base64
+import os
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "src"))
+
+import cv2
+import numpy as np
+
+from video_processor import _encode_frame
+
+WIDTH, HEIGHT = 1280, 720
+
+
+def _background() -> np.ndarray:
+    yy, xx = np.mgrid[0:HEIGHT, 0:WIDTH]
+    return np.dstack([
+        xx * 255 // WIDTH, yy * 255 // HEIGHT, (xx + yy) * 255 // (WIDTH + HEIGHT)
+    ]).astype(np.uint8)
+
+
+BACKGROUND = _background()
+
+
+def decoded_frames(count: int):
+    """Photo-like frames: smooth gradient, some shapes and text, mild noise.
+    Only one decoded frame is alive at a time, as in extract_frames()."""
+    rng = np.random.default_rng(0)
+    for i in range(count):
+        frame = cv2.add(BACKGROUND, (i * 7) % 64)
+        cv2.circle(frame, (200 + i * 40 % 900, 360), 120, (40, 200, 90), -1)
+        cv2.putText(frame, f"Slide {i}: some on-screen text", (80, 120), cv2.FONT_HERSHEY_SIMPLEX, 2, (255, 255, 255), 3)
+        frame = cv2.add(frame, rng.integers(0, 12, frame.shape, dtype=np.uint8))
+        yield i * 30.0, frame
+
+
+def vision_request(data_url: str) -> int:
+    # Stand-in for the HTTP call: the payload exists only for the duration of the request
+    return len(data_url)
+
+
+def legacy_pipeline(count: int):
+    frames = []
+    for timestamp, frame in decoded_frames(count):
+        _, buffer = cv2.imencode('.jpg', frame, [cv2.IMWRITE_JPEG_QUALITY, 85])
+        frames.append((timestamp, base64.b64encode(buffer).decode('utf-8')))
+
+    for timestamp, b64 in frames:
+        vision_request(f"data:image/jpeg;base64,{b64}")
+
+    thumbs = []
+    for timestamp, b64 in frames:
+        img = cv2.imdecode(np.frombuffer(base64.b64decode(b64), dtype=np.uint8), cv2.IMREAD_COLOR)
+        h, w = img.shape[:2]
+        thumb = cv2.resize(img, (320, int(h * 320 / w)))
+        _, jpeg = cv2.imencode('.jpg', thumb, [cv2.IMWRITE_JPEG_QUALITY, 80])
+        thumbs.append(jpeg.tobytes())
+    return frames, thumbs
+
+
+def records_pipeline(count: int):
+    frames = [_encode_frame(timestamp, frame) for timestamp, frame in decoded_frames(count)]
+
+    for frame in frames:
+        vision_request(f"data:image/jpeg;base64,{frame.base64}")
+
+    thumbs = [frame.thumbnail for frame in frames]
+    return frames, thumbs
+
+
+def measure(pipeline, count: int):
+    tracemalloc.start()
+    start_cpu, start_wall = time.process_time(), time.perf_counter()
+    result = pipeline(count)
+    cpu, wall = time.process_time() - start_cpu, time.perf_counter() - start_wall
+    retained, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del result
+    return peak, retained, cpu, wall
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 20
+    # Frame generation is identical for both paths; time it once so it can be subtracted
+    start_cpu = time.process_time()
+    for _ in decoded_frames(count):
+        pass
+    generate_cpu = time.process_time() - start_cpu
+
+    print(f"{count} frames at {WIDTH}x{HEIGHT} (frame generation {generate_cpu:.2f}s CPU excluded)\n")
+    print(f"{'pipeline':<10}{'peak MB':>10}{'retained MB':>13}{'cpu s':>8}{'wall s':>8}")
+    for name, pipeline in (("legacy", legacy_pipeline), ("records", records_pipeline)):
+        peak, retained, cpu, wall = measure(pipeline, count)
+        print(f"{name:<10}{peak / 1e6:>10.1f}{retained / 1e6:>13.1f}"
+              f"{cpu - generate_cpu:>8.2f}{wall - generate_cpu:>8.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,102 @@
+"""
+Benchmark: speaker/transcript merge on synthetic 3-hour meetings
+
+Usage:
+    python benchmarks/bench_speaker_merge.py            # 3 hours, 6 speakers
+    python benchmarks/bench_speaker_merge.py 5 8        # 5 hours, 8 speakers
+
+Compares the previous merge (midpoint lookup scanning every diarization
+segment for each transcript segment) with speaker_diarization.merge_speakers
+(sorted sweep, maximum overlap, speaker stats in the same pass) on:
+  normal   Whisper-sized segments (2-10 s), turns of 1-40 s, ~5% crosstalk
+  dense    short segments (0.5-3 s) and rapid turns (0.3-8 s), ~15% crosstalk
+"""
+
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "src"))
+
+from speaker_diarization import merge_speakers
+
+
+def legacy_merge(transcript_segments, speaker_segments):
+    merged = []
+    for t_seg in transcript_segments:
+        t_start = t_seg.get("start", 0)
+        t_end = t_seg.get("end", t_start)
+        t_mid = (t_start + t_end) / 2
+        speaker = "Unknown"
+        for s_seg in speaker_segments:
+            if s_seg["start"] <= t_mid <= s_seg["end"]:
+                speaker = s_seg["speaker"]
+                break
+        merged.append({"start": t_start, "end": t_end, "text": t_seg.get("text", ""), "speaker": speaker})
+    return merged
+
+
+def synthetic_meeting(hours, speakers, turn_range, segment_range, crosstalk, seed=0):
+    """Diarization turns (with pauses and overlapping speech) and transcript segments"""
+    rng = random.Random(seed)
+    names = [f"SPEAKER_{i:02d}" for i in range(speakers)]
+    length = hours * 3600
+
+    turns, t, current = [], 0.0, names[0]
+    while t < length:
+        duration = rng.uniform(*turn_range)
+        turns.append({"start": t, "end": t + duration, "speaker": current})
+        if rng.random() < crosstalk:
+            # Someone talks over the end of this turn
+            other = rng.choice([n for n in names if n != current])
+            overlap_start = t + duration * rng.uniform(0.5, 0.9)
+            turns.append({"start": overlap_start, "end": t + duration + rng.uniform(0, 2), "speaker": other})
+        current = rng.choice([n for n in names if n != current])
+        t += duration + rng.uniform(0, 1.5)
+    # pyannote yields turns per track, not globally sorted by start
+    rng.shuffle(turns)
+
+    segments, t = [], 0.0
+    while t < length:
+        duration = rng.uniform(*segment_range)
+        segments.append({"start": round(t, 2), "end": round(t + duration, 2), "text": "..."})
+        t += duration + rng.uniform(0, 0.3)
+    return segments, turns
+
+
+def timed(fn, *args, repeat=3):
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn(*args)
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+
+def main():
+    hours = float(sys.argv[1]) if len(sys.argv) > 1 else 3
+    speakers = int(sys.argv[2]) if len(sys.argv) > 2 else 6
+    scenarios = {
+        "normal": dict(turn_range=(1, 40), segment_range=(2, 10), crosstalk=0.05),
+        "dense": dict(turn_range=(0.3, 8), segment_range=(0.5, 3), crosstalk=0.15),
+    }
+
+    print(f"{hours:g}h meetings, {speakers} speakers\n")
+    print(f"{'scenario':<10}{'segments':>10}{'turns':>8}{'legacy ms':>11}{'sweep ms':>10}{'speedup':>9}{'same label':>12}")
+    for name, params in scenarios.items():
+        segments, turns = synthetic_meeting(hours, speakers, **params)
+        legacy_time, legacy = timed(legacy_merge, segments, turns, repeat=1)
+        sweep_time, (merged, stats) = timed(merge_speakers, segments, turns)
+        agree = sum(a["speaker"] == b["speaker"] for a, b in zip(legacy, merged)) / len(merged)
+        print(f"{name:<10}{len(segments):>10}{len(turns):>8}{legacy_time * 1000:>11.0f}"
+              f"{sweep_time * 1000:>10.1f}{legacy_time / sweep_time:>8.0f}x{agree:>11.1%}")
+
+    print("\nSpeaker stats (dense):")
+    for speaker, entry in sorted(stats.items()):
+        print(f"  {speaker}: {entry['talk_time'] / 60:.1f} min ({entry['share']:.0%}), "
+              f"{entry['turns']} turns, longest {entry['longest_turn']:.0f}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,138 @@
+"""
+Benchmark: yt-dlp subprocess vs in-process engine on caption fast-path jobs
+
+Usage:
+    python benchmarks/bench_ytdlp_engine.py                     # local HTTP source, 5 jobs
+    python benchmarks/bench_ytdlp_engine.py URL [jobs]          # e.g. a YouTube URL (needs network)
+
+A caption fast-path job calls yt-dlp for billing metadata and, when frames are
+analyzed, again to download the video. Each job runs:
+  metadata   get_video_metadata_fast()
+  +video     get_video_metadata_fast() then download_video() into an empty dir
+with YTDLP_BACKEND=subprocess (a yt-dlp process per call) and =inprocess in
+two shapes:
+  inprocess  one engine for the whole run, every job in this process. Later
+             jobs reuse its extractors; an in-process-loop number only.
+  fork       the engine is built up front and each job runs in a forked
+             child, as under RQ's fork-per-job worker (run_worker.py): jobs
+             inherit the loaded module but start with an empty info cache,
+             and anything built during a job is lost with the child.
+The first job of a run pays any remaining setup; "steady" is the mean of the
+rest.
+
+Without a URL a generated clip is served from a local HTTP server, which
+measures process/extractor overhead only. On YouTube the in-process engine
+also skips the repeated player JS challenge, so the saving is larger.
+"""
+
+import functools
+import http.server
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "src"))
+
+import ytdlp_engine
+from config import get_config
+from video_processor import download_video, get_ffmpeg_path, get_video_metadata_fast
+
+
+class _QuietHandler(http.server.SimpleHTTPRequestHandler):
+    def log_message(self, *args):
+        pass
+
+
+def serve_sample_clip(directory: str) -> str:
+    """Generate a 60s 640x360 HLS clip and serve it over HTTP; returns its URL.
+
+    HLS rather than a bare .mp4 so the formats carry a height and
+    download_video()'s best[height<=720] selector applies as on YouTube.
+    """
+    subprocess.run([
+        get_ffmpeg_path(), "-y", "-v", "error",
+        "-f", "lavfi", "-i", "testsrc2=size=640x360:rate=25:duration=60",
+        "-f", "lavfi", "-i", "sine=frequency=440:duration=60",
+        "-c:v", "libx264", "-preset", "ultrafast", "-c:a", "aac", "-shortest",
+        "-f", "hls", "-hls_time", "6", "-hls_playlist_type", "vod",
+        os.path.join(directory, "sample_360.m3u8"),
+    ], check=True)
+    with open(os.path.join(directory, "sample.m3u8"), "w") as f:
+        f.write("#EXTM3U\n"
+                '#EXT-X-STREAM-INF:BANDWIDTH=800000,RESOLUTION=640x360,CODECS="avc1.42c01e,mp4a.40.2"\n'
+                "sample_360.m3u8\n")
+
+    handler = functools.partial(_QuietHandler, directory=directory)
+    server = http.server.ThreadingHTTPServer(("127.0.0.1", 0), handler)
+    server.handle_error = lambda request, client_address: None  # clients hang up mid-body
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return f"http://127.0.0.1:{server.server_address[1]}/sample.m3u8"
+
+
+def use_backend(name: str):
+    get_config().video.ytdlp_backend = name
+    ytdlp_engine._engine = None
+    ytdlp_engine._engine_unavailable = False
+
+
+def run_job(url: str, with_video: bool, job_dir: str):
+    get_video_metadata_fast(url)
+    if with_video:
+        download_video(url, job_dir)
+
+
+def run_forked_job(url: str, with_video: bool, job_dir: str):
+    pid = os.fork()
+    if pid == 0:
+        try:
+            run_job(url, with_video, job_dir)
+        except BaseException:
+            os._exit(1)
+        os._exit(0)
+    _, status = os.waitpid(pid, 0)
+    if os.waitstatus_to_exitcode(status) != 0:
+        raise RuntimeError("forked job failed")
+
+
+def run_jobs(url: str, jobs: int, with_video: bool, workdir: str, fork: bool = False) -> list:
+    if fork:
+        ytdlp_engine.get_ytdlp_engine()  # Built before forking, as run_worker.py does
+    timings = []
+    for i in range(jobs):
+        # Each job is a different "video" as far as the info cache is concerned
+        job_url = f"{url}{'&' if '?' in url else '?'}bench_job={time.time_ns()}"
+        start = time.perf_counter()
+        (run_forked_job if fork else run_job)(job_url, with_video, os.path.join(workdir, f"job{i}"))
+        timings.append(time.perf_counter() - start)
+    return timings
+
+
+def main():
+    url = sys.argv[1] if len(sys.argv) > 1 else None
+    jobs = int(sys.argv[2]) if len(sys.argv) > 2 else 5
+
+    with tempfile.TemporaryDirectory() as workdir:
+        if url is None:
+            url = serve_sample_clip(workdir)
+        print(f"Source: {url}, {jobs} jobs per run\n")
+        print(f"{'job':<10}{'backend':<12}{'first s':>9}{'steady s':>10}{'total s':>9}")
+        for with_video in (False, True):
+            label = "+video" if with_video else "metadata"
+            for backend in ("subprocess", "inprocess", "fork"):
+                use_backend("subprocess" if backend == "subprocess" else "inprocess")
+                run_dir = os.path.join(workdir, f"{backend}-{label}")
+                try:
+                    timings = run_jobs(url, jobs, with_video, run_dir, fork=backend == "fork")
+                except Exception as e:
+                    print(f"{label:<10}{backend:<12}failed: {str(e).splitlines()[-1]}")
+                    continue
+                steady = statistics.mean(timings[1:]) if len(timings) > 1 else timings[0]
+                print(f"{label:<10}{backend:<12}{timings[0]:>9.2f}{steady:>10.2f}{sum(timings):>9.2f}")
+
+
+if __name__ == "__main__":
+    main()
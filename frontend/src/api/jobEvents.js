@@ -0,0 +1,59 @@
+import { API_BASE } from '../lib/apiBase'
+
+// Server-Sent Events from /jobs/events. Read with fetch rather than
+// EventSource so the token goes in the Authorization header, not the URL.
+export const jobEventsApi = {
+  /**
+   * Stream job updates until the connection closes or signal aborts.
+   * onOpen() fires once connected; onEvent(job) gets {id, ...changed fields}.
+   * Resolves when the stream ends; rejects on HTTP or network errors.
+   */
+  async stream(token, { onOpen, onEvent, signal }) {
+    const response = await fetch(`${API_BASE}/jobs/events`, {
+      headers: {
+        'Authorization': `Bearer ${token}`,
+        'Accept': 'text/event-stream'
+      },
+      signal
+    })
+    if (!response.ok || !response.body) {
+      const error = new Error(`Job events stream failed (${response.status})`)
+      error.status = response.status
+      throw error
+    }
+    onOpen?.()
+
+    const reader = response.body.getReader()
+    const decoder = new TextDecoder()
+    let buffer = ''
+
+    while (true) {
+      const { done, value } = await reader.read()
+      if (done) return
+      buffer += decoder.decode(value, { stream: true })
+
+      // Events are separated by a blank line
+      let boundary
+      while ((boundary = buffer.indexOf('\n\n')) !== -1) {
+        const frame = buffer.slice(0, boundary)
+        buffer = buffer.slice(boundary + 2)
+
+        let eventType = 'message'
+        const data = []
+        for (const line of frame.split('\n')) {
+          if (line.startsWith('event:')) eventType = line.slice(6).trim()
+          else if (line.startsWith('data:')) data.push(line.slice(5).trimStart())
+        }
+        if (eventType === 'job' && data.length) {
+          try {
+            onEvent(JSON.parse(data.join('\n')))
+          } catch (err) {
+            console.error('Bad job event:', err)
+          }
+        }
+      }
+    }
+  },
+}
+
+export default jobEventsApi
@@ -29,11 +29,16 @@ function ContentCard({
   })
 
   // Thumbnail source priority: youtube_thumbnail > blob URL > API proxy > none
+  // (card payloads carry it pre-resolved as content.thumbnail; full content has metadata)
   const metadata = content.metadata || {}
   const firstThumb = metadata.thumbnails?.[0]
-  const cardThumbnail = metadata.youtube_thumbnail
+  const resolvedThumb = content.thumbnail
+    || metadata.youtube_thumbnail
     || (firstThumb?.url)
-    || (firstThumb ? `${import.meta.env.VITE_API_URL || ''}/api/thumbnails/${content.id}/${firstThumb.filename}` : null)
+    || (firstThumb ? `/api/thumbnails/${content.id}/${firstThumb.filename}` : null)
+  const cardThumbnail = resolvedThumb?.startsWith('/api/')
+    ? `${import.meta.env.VITE_API_URL || ''}${resolvedThumb}`
+    : resolvedThumb
 
   const similarity = content._similarity
   const matchPercent = similarity != null ? Math.round(similarity * 100) : null
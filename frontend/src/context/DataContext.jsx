@@ -4,12 +4,18 @@ import { useAuth } from './AuthContext'
 import { toast } from '../hooks/use-toast'
 import { searchApi } from '../api/search'
 import { tagsApi } from '../api/tags'
+import { jobEventsApi } from '../api/jobEvents'
 
 import { API_BASE } from '../lib/apiBase'
 import { trackEvent } from '../utils/analytics'
 
 const DataContext = createContext(null)
 
+// Card fields requested from /library (recipe for recipe-card meta, collections for report source counts)
+const LIBRARY_CARD_FIELDS = 'title,summary,mode,content_type,tags,thumbnail,duration,source_url,created_at,recipe,collections'
+
+const TERMINAL_JOB_STATUSES = ['completed', 'failed', 'cancelled']
+
 export function DataProvider({ children }) {
   const { token } = useAuth()
 
@@ -49,14 +55,25 @@ export function DataProvider({ children }) {
   const libraryLoaded = useRef(false)
   const pollTimeoutRef = useRef(null)
   const isPollingRef = useRef(false)
+  const streamConnectedRef = useRef(false)
+  const jobsRef = useRef([])
 
   // --- Data methods ---
 
   const refreshLibrary = useCallback(async () => {
     if (!libraryLoaded.current) setIsLoadingLibrary(true)
     try {
-      const res = await api.get('/library')
-      setLibraryContents(res.data.contents || [])
+      // Library is keyset-paginated and card-only; full content comes from /content/:id
+      const contents = []
+      let cursor = null
+      do {
+        const res = await api.get('/library', {
+          params: { limit: 200, cursor, fields: LIBRARY_CARD_FIELDS }
+        })
+        contents.push(...(res.data.contents || []))
+        cursor = res.data.next_cursor
+      } while (cursor)
+      setLibraryContents(contents)
       libraryLoaded.current = true
     } catch (err) {
       console.error('Failed to fetch library:', err)
@@ -121,6 +138,38 @@ export function DataProvider({ children }) {
     isPollingRef.current = false
   }, [])
 
+  // Toasts for jobs that just completed or failed (skipped on first load)
+  const notifyJobChanges = useCallback((changedJobs) => {
+    if (hasInitialized.current) {
+      changedJobs.forEach(job => {
+        const prevState = previousJobStates.current.get(job.id)
+
+        if (prevState && prevState !== 'completed' && job.status === 'completed') {
+          toast({
+            variant: 'success',
+            title: 'Video ready',
+            description: job.title || 'Processing complete',
+            duration: 5000
+          })
+          refreshLibrary()
+        }
+
+        if (prevState && prevState !== 'failed' && job.status === 'failed') {
+          toast({
+            variant: 'destructive',
+            title: 'Processing failed',
+            description: job.error || 'An error occurred',
+            duration: 8000
+          })
+        }
+      })
+    }
+
+    changedJobs.forEach(job => {
+      previousJobStates.current.set(job.id, job.status)
+    })
+  }, [refreshLibrary])
+
   const pollJobs = useCallback(async () => {
     try {
       const res = await api.get('/jobs')
@@ -150,42 +199,14 @@ export function DataProvider({ children }) {
         return mergedJobs
       })
 
-      // Show notifications for status changes (skip on first load)
-      if (hasInitialized.current) {
-        apiJobs.forEach(job => {
-          const prevState = previousJobStates.current.get(job.id)
-
-          if (prevState && prevState !== 'completed' && job.status === 'completed') {
-            toast({
-              variant: 'success',
-              title: 'Video ready',
-              description: job.title || 'Processing complete',
-              duration: 5000
-            })
-            refreshLibrary()
-          }
-
-          if (prevState && prevState !== 'failed' && job.status === 'failed') {
-            toast({
-              variant: 'destructive',
-              title: 'Processing failed',
-              description: job.error || 'An error occurred',
-              duration: 8000
-            })
-          }
-        })
-      }
-
-      apiJobs.forEach(job => {
-        previousJobStates.current.set(job.id, job.status)
-      })
+      notifyJobChanges(apiJobs)
       hasInitialized.current = true
 
-      // Schedule next poll only if there are active (non-terminal) jobs
-      const terminalStatuses = ['completed', 'failed', 'cancelled']
-      const hasActive = apiJobs.some(j => !terminalStatuses.includes(j.status))
+      // Schedule next poll only if there are active (non-terminal) jobs and
+      // no event stream is pushing their updates
+      const hasActive = apiJobs.some(j => !TERMINAL_JOB_STATUSES.includes(j.status))
 
-      if (hasActive) {
+      if (hasActive && !streamConnectedRef.current) {
         pollTimeoutRef.current = setTimeout(pollJobs, 3000)
       } else {
         // No active jobs — stop polling
@@ -197,9 +218,28 @@ export function DataProvider({ children }) {
         console.error('Failed to fetch jobs:', err)
       }
       // Retry after 10s on error
-      pollTimeoutRef.current = setTimeout(pollJobs, 10000)
+      if (!streamConnectedRef.current) {
+        pollTimeoutRef.current = setTimeout(pollJobs, 10000)
+      } else {
+        isPollingRef.current = false
+      }
     }
-  }, [api, refreshLibrary])
+  }, [api, notifyJobChanges])
+
+  // Merge one pushed job update ({id, ...changed fields}) into the list
+  const applyJobEvent = useCallback((event) => {
+    if (!previousJobStates.current.has(event.id)) {
+      // Job started elsewhere (another tab or device): fetch the list
+      pollJobs()
+      return
+    }
+    const current = jobsRef.current.find(j => j.id === event.id)
+    // Progress that raced a cancel/failure must not bring a finished job back
+    if (TERMINAL_JOB_STATUSES.includes(current?.status) && !TERMINAL_JOB_STATUSES.includes(event.status)) return
+    const job = { ...current, ...event }
+    setJobs(prev => prev.map(j => j.id === event.id ? { ...j, ...event } : j))
+    if (event.status) notifyJobChanges([job])
+  }, [pollJobs, notifyJobChanges])
 
   const startJobPolling = useCallback(() => {
     if (isPollingRef.current) return
@@ -216,6 +256,10 @@ export function DataProvider({ children }) {
     }
   }, [startJobPolling])
 
+  useEffect(() => {
+    jobsRef.current = jobs
+  }, [jobs])
+
   // --- Search methods ---
   const performSearch = useCallback(async (query, filters = {}) => {
     setSearchQuery(query)
@@ -279,6 +323,48 @@ export function DataProvider({ children }) {
     return () => stopJobPolling()
   }, [token]) // eslint-disable-line react-hooks/exhaustive-deps
 
+  // --- Job event stream (replaces polling while connected) ---
+  useEffect(() => {
+    if (!token) return
+
+    const controller = new AbortController()
+    let retryTimeout = null
+
+    const connect = () => {
+      let retry = true
+      jobEventsApi.stream(token, {
+        signal: controller.signal,
+        onOpen: () => {
+          streamConnectedRef.current = true
+          // Updates are pushed from here on; sync once for anything missed
+          stopJobPolling()
+          pollJobs()
+        },
+        onEvent: applyJobEvent,
+      }).catch(err => {
+        if (controller.signal.aborted) return
+        if (err.status === 401) {
+          retry = false
+        } else {
+          console.error('Job event stream failed:', err)
+        }
+      }).finally(() => {
+        streamConnectedRef.current = false
+        if (controller.signal.aborted) return
+        // Poll until the stream is back
+        startJobPolling()
+        if (retry) retryTimeout = setTimeout(connect, 5000)
+      })
+    }
+    connect()
+
+    return () => {
+      controller.abort()
+      clearTimeout(retryTimeout)
+      streamConnectedRef.current = false
+    }
+  }, [token]) // eslint-disable-line react-hooks/exhaustive-deps
+
   // --- Context value ---
   const value = {
     libraryContents,
@@ -0,0 +1,82 @@
+"""
+Migration script to backfill collection_items from content_vectors.collections.
+
+Collection membership used to live in the content_vectors.collections JSON
+list. It now lives in the collection_items table (created by init_db).
+This copies every existing (collection, content) pair across once. It is
+safe to re-run: pairs already present, and ids whose collection no longer
+exists, are skipped.
+"""
+
+import json
+import os
+import sys
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from datetime import datetime
+from sqlalchemy import create_engine, text
+from src.database import DATABASE_URL, Base
+
+BATCH_SIZE = 1000
+
+
+def migrate():
+    """Copy JSON collection membership into collection_items"""
+
+    if "postgresql" in DATABASE_URL or "postgres" in DATABASE_URL:
+        engine = create_engine(DATABASE_URL, connect_args={"sslmode": "require"})
+    else:
+        engine = create_engine(DATABASE_URL, connect_args={"check_same_thread": False})
+
+    # Make sure the table (and its indexes) exist even if init_db hasn't run yet
+    Base.metadata.tables["collection_items"].create(bind=engine, checkfirst=True)
+    print("✓ collection_items table ready")
+
+    with engine.connect() as conn:
+        collection_ids = {row[0] for row in conn.execute(text("SELECT id FROM collections"))}
+        existing = {
+            (row[0], row[1])
+            for row in conn.execute(text("SELECT collection_id, content_id FROM collection_items"))
+        }
+
+        rows = conn.execute(text(
+            "SELECT id, user_id, collections, updated_at FROM content_vectors "
+            "WHERE collections IS NOT NULL"
+        )).fetchall()
+
+        pending, skipped = [], 0
+        for content_id, user_id, collections, updated_at in rows:
+            if isinstance(collections, str):  # SQLite returns raw JSON text
+                collections = json.loads(collections or "[]")
+            for collection_id in collections or []:
+                if collection_id not in collection_ids:
+                    skipped += 1
+                    continue
+                if (collection_id, content_id) in existing:
+                    continue
+                existing.add((collection_id, content_id))
+                pending.append({
+                    "collection_id": collection_id,
+                    "content_id": content_id,
+                    "user_id": user_id,
+                    # Best available approximation of when it was added
+                    "added_at": updated_at or datetime.utcnow(),
+                })
+
+        insert = text(
+            "INSERT INTO collection_items (collection_id, content_id, user_id, added_at) "
+            "VALUES (:collection_id, :content_id, :user_id, :added_at)"
+        )
+        for i in range(0, len(pending), BATCH_SIZE):
+            conn.execute(insert, pending[i:i + BATCH_SIZE])
+        conn.commit()
+
+        print(f"✓ Backfilled {len(pending)} collection memberships from {len(rows)} content rows")
+        if skipped:
+            print(f"Note: Skipped {skipped} references to deleted collections")
+
+    print("\nMigration complete!")
+
+if __name__ == "__main__":
+    print("Running collection_items backfill...")
+    migrate()
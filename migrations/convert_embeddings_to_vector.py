@@ -0,0 +1,82 @@
+"""
+Migration script to convert JSON embeddings to native pgvector columns.
+
+Rewrites the content_vectors, entity_vectors and transcript_passages
+embedding columns from JSON lists to vector(384) in one bulk ALTER per
+table, then builds HNSW cosine indexes so VectorMemory.search can
+ORDER BY embedding <=> :q in PostgreSQL.
+SQLite databases keep JSON embeddings (Python similarity fallback).
+"""
+
+import os
+import sys
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy import create_engine, text
+from src.database import DATABASE_URL, EMBEDDING_DIMS
+
+TABLES = ("content_vectors", "entity_vectors", "transcript_passages")
+
+
+def migrate():
+    """Convert embedding columns to vector(384) and create HNSW indexes"""
+
+    if not ("postgresql" in DATABASE_URL or "postgres" in DATABASE_URL):
+        print("SQLite database — embeddings stay JSON, nothing to migrate")
+        return
+
+    engine = create_engine(DATABASE_URL, connect_args={"sslmode": "require"})
+
+    with engine.connect() as conn:
+        conn.execute(text("CREATE EXTENSION IF NOT EXISTS vector"))
+        conn.commit()
+        print("✓ pgvector extension enabled")
+
+        for table in TABLES:
+            udt = conn.execute(text(
+                "SELECT udt_name FROM information_schema.columns "
+                "WHERE table_name = :table AND column_name = 'embedding'"
+            ), {"table": table}).scalar()
+
+            if udt is None:
+                print(f"Note: {table}.embedding not found, skipping")
+                continue
+            if udt == "vector":
+                print(f"✓ {table}.embedding is already vector")
+                continue
+
+            # Rows with the wrong dimension would abort the whole ALTER
+            bad = conn.execute(text(
+                f"SELECT COUNT(*) FROM {table} "
+                f"WHERE json_array_length(embedding::json) <> :dims"
+            ), {"dims": EMBEDDING_DIMS}).scalar()
+            if bad:
+                print(f"✗ {table} has {bad} rows without {EMBEDDING_DIMS}-dim embeddings — "
+                      f"re-embed or remove them, then run again")
+                continue
+
+            # JSON text '[0.1, 0.2, ...]' is valid pgvector input — convert in bulk
+            conn.execute(text(
+                f"ALTER TABLE {table} ALTER COLUMN embedding "
+                f"TYPE vector({EMBEDDING_DIMS}) USING (embedding::text)::vector"
+            ))
+            conn.commit()
+            print(f"✓ Converted {table}.embedding to vector({EMBEDDING_DIMS})")
+
+    # Build indexes outside a transaction so CONCURRENTLY doesn't block writes
+    with engine.connect().execution_options(isolation_level="AUTOCOMMIT") as conn:
+        for table in TABLES:
+            try:
+                conn.execute(text(
+                    f"CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_{table}_embedding_hnsw "
+                    f"ON {table} USING hnsw (embedding vector_cosine_ops)"
+                ))
+                print(f"✓ Created HNSW index on {table}.embedding")
+            except Exception as e:
+                print(f"Note: Could not create HNSW index on {table}: {e}")
+
+    print("\nMigration complete!")
+
+if __name__ == "__main__":
+    print("Running database migration for pgvector embeddings...")
+    migrate()
@@ -0,0 +1,94 @@
+"""
+Migration script to move heavy content fields into content_bodies.
+
+Older rows keep transcript, timeline, frame_descriptions and frame_analyses
+inside content_vectors.full_content. Those rows are still read correctly,
+but every query touching full_content pays for them. This copies each
+row's heavy fields into content_bodies and rewrites full_content without
+them. Rows are processed in id order, in batches, so the script can be
+stopped and re-run.
+"""
+
+import json
+import os
+import sys
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from datetime import datetime
+from sqlalchemy import bindparam, create_engine, text
+from src.database import DATABASE_URL, Base, CONTENT_BODY_FIELDS
+
+BATCH_SIZE = 200
+
+
+def _as_json(value):
+    # SQLite hands back JSON columns as text, PostgreSQL as parsed objects
+    return json.loads(value) if isinstance(value, str) else value
+
+
+def migrate():
+    """Split heavy full_content fields into content_bodies"""
+
+    if "postgresql" in DATABASE_URL or "postgres" in DATABASE_URL:
+        engine = create_engine(DATABASE_URL, connect_args={"sslmode": "require"})
+    else:
+        engine = create_engine(DATABASE_URL, connect_args={"check_same_thread": False})
+
+    Base.metadata.tables["content_bodies"].create(bind=engine, checkfirst=True)
+    print("✓ content_bodies table ready")
+
+    insert_body = text(
+        "INSERT INTO content_bodies (content_id, user_id, transcript, timeline, "
+        "frame_descriptions, frame_analyses, updated_at) "
+        "VALUES (:content_id, :user_id, :transcript, :timeline, :frame_descriptions, "
+        ":frame_analyses, :updated_at)"
+    )
+    update_content = text("UPDATE content_vectors SET full_content = :full_content WHERE id = :id")
+
+    moved, last_id = 0, ""
+    with engine.connect() as conn:
+        while True:
+            rows = conn.execute(text(
+                "SELECT id, user_id, full_content FROM content_vectors "
+                "WHERE id > :last_id ORDER BY id LIMIT :limit"
+            ), {"last_id": last_id, "limit": BATCH_SIZE}).fetchall()
+            if not rows:
+                break
+            last_id = rows[-1][0]
+
+            ids = [row[0] for row in rows]
+            has_body = {
+                r[0] for r in conn.execute(
+                    text("SELECT content_id FROM content_bodies WHERE content_id IN :ids").bindparams(
+                        bindparam("ids", expanding=True)
+                    ), {"ids": ids}
+                )
+            }
+
+            for content_id, user_id, full_content in rows:
+                full_content = _as_json(full_content) or {}
+                if not any(field in full_content for field in CONTENT_BODY_FIELDS):
+                    continue
+                if content_id not in has_body:
+                    conn.execute(insert_body, {
+                        "content_id": content_id,
+                        "user_id": user_id,
+                        "transcript": full_content.get("transcript"),
+                        "timeline": json.dumps(full_content.get("timeline")),
+                        "frame_descriptions": json.dumps(full_content.get("frame_descriptions")),
+                        "frame_analyses": json.dumps(full_content.get("frame_analyses")),
+                        "updated_at": datetime.utcnow(),
+                    })
+                light = {k: v for k, v in full_content.items() if k not in CONTENT_BODY_FIELDS}
+                conn.execute(update_content, {"id": content_id, "full_content": json.dumps(light)})
+                moved += 1
+
+            conn.commit()
+            print(f"  ...processed through {last_id}")
+
+    print(f"✓ Moved heavy fields of {moved} content rows into content_bodies")
+    print("\nMigration complete!")
+
+if __name__ == "__main__":
+    print("Running content_bodies split migration...")
+    migrate()
@@ -14,11 +14,12 @@ from pathlib import Path
 # Add src/ to path so worker.py can import sibling modules (database, billing, etc.)
 sys.path.insert(0, str(Path(__file__).parent / "src"))
 
-from config import init_config
+from config import get_config, init_config
 init_config(validate=True, strict=False)
 
 from redis_client import get_redis_client
 from rq import Worker, Queue
+from ytdlp_engine import get_ytdlp_engine
 
 
 if __name__ == "__main__":
@@ -27,6 +28,32 @@ if __name__ == "__main__":
         print("ERROR: Redis connection required for worker. Set REDIS_URL.")
         sys.exit(1)
 
+    # RQ forks a process per job: building the in-process yt-dlp engine here
+    # means every job inherits the loaded extractors instead of paying for them
+    get_ytdlp_engine()
+
+    # Same for the diarization pipeline. CUDA state doesn't survive a fork,
+    # so on GPU hosts each job process loads its own.
+    if get_config().diarization.preload:
+        from speaker_diarization import TORCH_AVAILABLE, get_diarizer_pool, torch
+        if not TORCH_AVAILABLE:
+            print("Skipping diarization preload: torch is not installed")
+        elif torch.cuda.is_available():
+            print("Skipping diarization preload: CUDA can't be shared with forked job processes")
+        else:
+            try:
+                get_diarizer_pool().preload()
+            except Exception as e:
+                print(f"Diarization preload failed, jobs will load it on demand: {e}")
+
+    # Mode classifier: train (or fetch from Redis) once for all jobs, then
+    # drop the DB connections so forked jobs don't share the parent's sockets
+    if get_config().extraction.mode_classifier:
+        from database import engine
+        from mode_classifier import get_mode_classifier
+        get_mode_classifier().preload()
+        engine.dispose()
+
     listen = ["default"]
     print(f"Starting RQ worker, listening on queues: {listen}")
     worker = Worker(
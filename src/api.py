@@ -4,7 +4,7 @@ With authentication, billing, notes, tags, search, and collection chat features
 """
 from fastapi import FastAPI, HTTPException, Depends, Request, Header, UploadFile, File, Form
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import Response, FileResponse, JSONResponse
+from fastapi.responses import Response, FileResponse, JSONResponse, StreamingResponse
 from pydantic import BaseModel
 from typing import List, Optional, Dict, Any
 import sysh
@@ -40,7 +40,14 @@ from search import SearchService
 from config import get_config, init_config
 from middleware.rate_limit import RateLimitMiddleware, rate_limiter
 from job_service import JobService
+from job_events import get_job_event_bus
 from vector_memory import VectorMemory
+from embedding_cache import get_embedding_cache
+from media_cache import get_media_cache
+from speaker_diarization import get_diarizer_pool
+from translation_cache import get_translation_cache
+from mode_classifier import get_mode_classifier
+from embedding_matrix import get_matrix_cache, get_passage_matrix_cache
 from redis_client import cache_set, cache_get, cache_delete
 from team.service import TeamService
 
@@ -103,6 +110,35 @@ def _get_chat_model(db: Session, user_id: int) -> str:
     limits = get_tier_limits(sub.tier)
     return limits.get("ai_model", "gpt-4o-mini")
 
+def _transcript_context(vector_memory: VectorMemory, query: str, content: dict, limit: int) -> str:
+    """Transcript text for chat context: the whole transcript when it fits in
+    ``limit`` chars, otherwise the passages closest to the question, in order."""
+    transcript = content.get("transcript", "") or ""
+    if len(transcript) <= limit:
+        return transcript
+    try:
+        passages = vector_memory.search_passages(
+            query,
+            n_results=max(1, limit // vector_memory.PASSAGE_TARGET_CHARS),
+            content_ids=[content.get("id")],
+        )
+    except Exception as e:
+        logger.warning(f"[Chat] Passage search failed, using transcript prefix: {e}")
+        passages = []
+    if not passages:
+        return transcript[:limit]
+
+    passages.sort(key=lambda p: p["start"] if p["start"] is not None else 0)
+    parts, used = [], 0
+    for p in passages:
+        label = f"[{int(p['start'] // 60)}:{int(p['start'] % 60):02d}] " if p["start"] is not None else ""
+        text = f"{label}{p['text']}"
+        if used + len(text) > limit:
+            break
+        parts.append(text)
+        used += len(text)
+    return "\n...\n".join(parts) or transcript[:limit]
+
 def _process_referral(db: Session, new_user: User, code: str):
     """Award referral credits to both referrer and new user."""
     if not code:
@@ -277,8 +313,12 @@ class SearchRequest(BaseModel):
     tag_ids: Optional[List[int]] = None
     content_type: Optional[str] = None
     has_notes: Optional[bool] = None
+    has_bookmarks: Optional[bool] = None
     n_results: int = 20
     match_all_tags: bool = False
+    search_mode: str = "semantic"  # semantic, keyword, hybrid
+    vector_weight: float = 1.0     # hybrid rank-fusion weights
+    keyword_weight: float = 1.0
 
 
 class SupportRequest(BaseModel):
@@ -967,7 +1007,10 @@ async def detailed_health_check(
         doc_count = vector_memory.count_user_content(current_user.id)
         health_status["components"]["vector_memory"] = {
             "status": "healthy",
-            "documents": doc_count
+            "documents": doc_count,
+            "embedding_cache": get_embedding_cache().get_stats(),
+            "matrix_cache": get_matrix_cache().get_stats(),
+            "passage_matrix_cache": get_passage_matrix_cache().get_stats(),
         }
     except Exception as e:
         health_status["components"]["vector_memory"] = {
@@ -976,6 +1019,41 @@ async def detailed_health_check(
         }
         health_status["status"] = "degraded"
 
+    # Downloaded media cache (index shared with the worker on this disk)
+    try:
+        health_status["components"]["media_cache"] = {
+            "status": "healthy",
+            **get_media_cache("data/videos").get_stats()
+        }
+    except Exception as e:
+        health_status["components"]["media_cache"] = {
+            "status": "unhealthy",
+            "error": str(e)
+        }
+
+    health_status["components"]["translation_cache"] = {
+        "status": "healthy",
+        **get_translation_cache().get_stats()
+    }
+
+    # Auto mode detection: share of predictions answered without the LLM
+    health_status["components"]["mode_classifier"] = {
+        "status": "healthy",
+        **get_mode_classifier().get_stats()
+    }
+
+    # Job event streams served by this process
+    health_status["components"]["job_events"] = {
+        "status": "healthy",
+        **get_job_event_bus().get_stats()
+    }
+
+    # Diarization pipelines loaded in this process (thread-fallback jobs run here)
+    health_status["components"]["diarization"] = {
+        "status": "healthy",
+        **get_diarizer_pool().get_stats()
+    }
+
     # Check OpenAI configuration
     health_status["components"]["openai"] = {
         "status": "configured" if config.openai.is_configured else "not_configured"
@@ -1499,6 +1577,8 @@ async def search_content(
     db: Session = Depends(get_db)
 ):
     """Advanced search with filters"""
+    if request.search_mode not in VectorMemory.SEARCH_MODES:
+        raise HTTPException(status_code=400, detail=f"search_mode must be one of {', '.join(VectorMemory.SEARCH_MODES)}")
     # Search is free for all tiers (no credit cost)
     ai = get_app(current_user.id, db)
     results = SearchService.search(
@@ -1509,8 +1589,11 @@ async def search_content(
         tag_ids=request.tag_ids,
         content_type=request.content_type,
         has_notes=request.has_notes,
+        has_bookmarks=request.has_bookmarks,
         n_results=request.n_results,
-        match_all_tags=request.match_all_tags
+        match_all_tags=request.match_all_tags,
+        search_mode=request.search_mode,
+        weights={"vector": request.vector_weight, "lexical": request.keyword_weight}
     )
     return {"results": results, "total": len(results)}
 
@@ -1521,8 +1604,7 @@ async def get_search_stats(
     db: Session = Depends(get_db)
 ):
     """Get search statistics for user"""
-    ai = get_app(current_user.id, db)
-    return SearchService.get_search_stats(ai.memory, db, current_user.id)
+    return SearchService.get_search_stats(db, current_user.id)
 
 
 # =============================================
@@ -1806,6 +1888,44 @@ async def get_jobs(
     }
 
 
+@app.get("/api/jobs/events")
+async def stream_job_events(
+    request: Request,
+    current_user: User = Depends(get_current_active_user),
+    db: Session = Depends(get_db)
+):
+    """Server-Sent Events stream of the current user's job updates.
+
+    Each "job" event carries the changed fields of one job ({id, status,
+    progress, ...}); merge them into the list from /api/jobs, fetched after
+    the stream opens. Replaces polling /api/jobs while jobs are running.
+    """
+    user_id = current_user.id
+    # The stream can stay open for hours; don't hold a pooled connection
+    db.close()
+    bus = get_job_event_bus()
+    keepalive = config.progress.stream_keepalive
+
+    async def event_stream():
+        subscription = bus.subscribe(user_id)
+        try:
+            yield "retry: 5000\n\n"
+            while not await request.is_disconnected():
+                events = await subscription.next_batch(timeout=keepalive)
+                if not events:
+                    yield ": keepalive\n\n"
+                for event in events:
+                    yield f"event: job\ndata: {json.dumps(event)}\n\n"
+        finally:
+            bus.unsubscribe(subscription)
+
+    return StreamingResponse(
+        event_stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
 @app.get("/api/jobs/{job_id}")
 async def get_job(
     job_id: str,
@@ -1858,13 +1978,45 @@ async def delete_job(
 
 @app.get("/api/library")
 async def get_library(
+    limit: int = 50,
+    cursor: Optional[str] = None,
+    sort: str = "created_at",
+    order: str = "desc",
+    mode: Optional[str] = None,
+    content_type: Optional[str] = None,
+    tag: Optional[str] = None,
+    fields: Optional[str] = None,
     current_user: User = Depends(get_current_active_user),
     db: Session = Depends(get_db)
 ):
-    """Get all content in library for current user"""
+    """List library cards for current user (keyset-paginated, newest first).
+
+    Returns card fields only; pass next_cursor back as cursor for the next page.
+    fields= is a comma-separated projection; full content is on /api/content/{id}.
+    """
+    if not 1 <= limit <= 200:
+        raise HTTPException(status_code=400, detail="limit must be between 1 and 200")
+    if sort not in VectorMemory.LIBRARY_SORTS:
+        raise HTTPException(status_code=400, detail=f"sort must be one of {', '.join(VectorMemory.LIBRARY_SORTS)}")
+    if order not in ("asc", "desc"):
+        raise HTTPException(status_code=400, detail="order must be asc or desc")
+
     vector_memory = VectorMemory(db, current_user.id)
-    contents = vector_memory.list_all(current_user.id)
-    return {"contents": contents}
+    try:
+        contents, next_cursor = vector_memory.list_page(
+            current_user.id,
+            limit=limit,
+            cursor=cursor,
+            sort=sort,
+            descending=order == "desc",
+            mode=mode,
+            content_type=content_type,
+            tag=tag,
+            fields=[f.strip() for f in fields.split(",") if f.strip()] if fields else None,
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return {"contents": contents, "next_cursor": next_cursor}
 
 
 @app.get("/api/content/{content_id}")
@@ -1881,6 +2033,34 @@ async def get_content(
     return {"content": content}
 
 
+@app.get("/api/content/{content_id}/transcript")
+async def get_content_transcript(
+    content_id: str,
+    current_user: User = Depends(get_current_active_user),
+    db: Session = Depends(get_db)
+):
+    """Get just the transcript of a content item"""
+    vector_memory = VectorMemory(db, current_user.id)
+    body = vector_memory.get_content_body(content_id, ["transcript"], current_user.id)
+    if body is None:
+        raise HTTPException(status_code=404, detail="Content not found")
+    return {"content_id": content_id, "transcript": body["transcript"] or ""}
+
+
+@app.get("/api/content/{content_id}/timeline")
+async def get_content_timeline(
+    content_id: str,
+    current_user: User = Depends(get_current_active_user),
+    db: Session = Depends(get_db)
+):
+    """Get just the timeline (transcript + frame analyses) of a content item"""
+    vector_memory = VectorMemory(db, current_user.id)
+    body = vector_memory.get_content_body(content_id, ["timeline", "frame_analyses"], current_user.id)
+    if body is None:
+        raise HTTPException(status_code=404, detail="Content not found")
+    return {"content_id": content_id, "timeline": body["timeline"] or [], "frame_analyses": body["frame_analyses"] or []}
+
+
 @app.delete("/api/content/{content_id}")
 async def delete_content(
     content_id: str,
@@ -1969,6 +2149,7 @@ async def generate_thumbnails(
 ):
     """Generate thumbnails for existing content from already-downloaded video"""
     from video_processor import save_frame_thumbnails, extract_frames_at_timestamps, _extract_video_id as _evi
+    from media_cache import media_source_key
     import re as _re
 
     vector_memory = VectorMemory(db, current_user.id)
@@ -1989,15 +2170,7 @@ async def generate_thumbnails(
     if source_video and Path(source_video).exists():
         video_path = source_video
     elif source_url:
-        video_id = _evi(source_url)
-        if video_id:
-            videos_dir = Path("data/videos")
-            if videos_dir.exists():
-                for ext in ['*.mp4', '*.webm', '*.mkv']:
-                    files = [f for f in videos_dir.glob(ext) if video_id in f.stem]
-                    if files:
-                        video_path = str(max(files, key=lambda f: f.stat().st_mtime))
-                        break
+        video_path = get_media_cache("data/videos").lookup(media_source_key(source_url), "video")
 
     if not video_path:
         raise HTTPException(status_code=404, detail="Source video not found on disk. Cannot generate thumbnails.")
@@ -2058,11 +2231,13 @@ async def backfill_all_thumbnails(
     if not current_user.is_superuser:
         raise HTTPException(status_code=403, detail="Admin access required")
     from video_processor import save_frame_thumbnails, extract_frames_at_timestamps, _extract_video_id as _evi
+    from media_cache import media_source_key
     import re as _re
 
     vector_memory = VectorMemory(db, current_user.id)
     all_content = vector_memory.list_all(user_id=current_user.id)
 
+    media_cache = get_media_cache("data/videos")
     results = {"processed": 0, "skipped": 0, "failed": 0, "details": []}
 
     for item in all_content:
@@ -2088,15 +2263,7 @@ async def backfill_all_thumbnails(
         if source_video and Path(source_video).exists():
             video_path = source_video
         elif source_url:
-            vid = _evi(source_url)
-            if vid:
-                videos_dir = Path("data/videos")
-                if videos_dir.exists():
-                    for ext in ['*.mp4', '*.webm', '*.mkv']:
-                        files = [f for f in videos_dir.glob(ext) if vid in f.stem]
-                        if files:
-                            video_path = str(max(files, key=lambda f: f.stat().st_mtime))
-                            break
+            video_path = media_cache.lookup(media_source_key(source_url), "video")
 
         if not video_path:
             results["failed"] += 1
@@ -2691,7 +2858,7 @@ async def chat_with_video(
     # Build context from the video's data
     title = content.get("title", "Untitled")
     summary = content.get("summary", "")
-    transcript = content.get("transcript", "")[:8000]
+    transcript = _transcript_context(vector_memory, request.message, content, 8000)
     key_points = content.get("key_points", [])
     kp_text = "\n".join([
         f"- {kp.get('point', str(kp))} ({kp.get('timestamp', '')})" if isinstance(kp, dict) else f"- {kp}"
@@ -2726,7 +2893,7 @@ async def chat_with_video(
         f"If the content doesn't fully answer the question, say so.\n\n"
         f"SUMMARY: {summary}\n\n"
         f"KEY POINTS:\n{kp_text}\n{mode_context}\n\n"
-        f"TRANSCRIPT (partial):\n{transcript}"
+        f"TRANSCRIPT (most relevant parts):\n{transcript}"
     )
 
     messages = [{"role": "system", "content": system_msg}]
@@ -3242,7 +3409,7 @@ async def chat_with_knowledge(
         content_type = r.get("content_type", "video")
         summary = r.get("summary", "")
         key_points = r.get("key_points", [])
-        transcript = r.get("transcript", "")[:transcript_limit]
+        transcript = _transcript_context(vector_memory, request.message, r, transcript_limit)
 
         # Mode-specific context
         mode = r.get("mode", "general")
@@ -4,6 +4,7 @@ Extracts structured information from videos and stores in memory for later retri
 """
 
 import os
+import re
 import sys
 import threading
 import time
@@ -14,10 +15,13 @@ from typing import Optional
 # Add src to path
 sys.path.insert(0, str(Path(__file__).parent))
 
-from video_processor import download_video, download_audio, extract_frames, extract_audio, get_video_info, save_frame_thumbnails, _extract_video_id, fetch_youtube_captions, get_video_metadata_fast
-from transcriber import Transcriber
+from video_processor import download_video, download_audio, extract_frames, extract_audio, save_frame_thumbnails, _extract_video_id, get_video_metadata_fast, JobArtifacts, stream_audio_segments, STREAM_FULL_AUDIO
+from media_cache import get_media_cache, media_source_key
+from translation_cache import get_translation_cache
+from keyframes import select_keyframes
+from transcriber import StreamInterrupted, Transcriber
 from content_analyzer import ContentAnalyzer, ContentExtract
-from speaker_diarization import SpeakerDiarizer
+from speaker_diarization import get_diarizer_pool, merge_speakers
 from content_creator import TopTenGenerator, ContentSpinner, TopTenScript, SpunContent
 
 import json
@@ -60,7 +64,6 @@ class VideoMemoryAI:
 
         # Initialize components
         self.transcriber = None  # Lazy load to save memory
-        self.diarizer = None  # Lazy load speaker diarization
 
         self.analyzer = ContentAnalyzer(provider=llm_provider, tier=tier)
 
@@ -110,6 +113,67 @@ class VideoMemoryAI:
             self.transcriber = Transcriber()
         return self.transcriber
 
+    def _transcribe_streaming(
+        self,
+        source: str,
+        videos_dir: str,
+        task: str,
+        update_progress: callable,
+        cookies_file: str = None,
+        expected_duration: float = 0
+    ) -> tuple:
+        """Download a URL's audio and transcribe it segment by segment as it arrives.
+
+        Progress counts finished segments; until the download ends the total
+        is estimated from expected_duration (when known).
+
+        Returns:
+            (transcript_result, audio_path) - the full audio is kept in the
+            media cache for diarization and later jobs
+        """
+        import math
+        import shutil
+        import tempfile
+
+        config = get_config().transcription
+        expected = math.ceil(expected_duration / config.stream_segment_seconds) if expected_duration else 0
+        last_pct = 15
+
+        def segment_progress(completed, submitted, input_done):
+            nonlocal last_pct
+            total = submitted if input_done else max(expected, submitted + 1)
+            state = "Transcribing" if input_done else "Downloading & transcribing"
+            # The estimated total can grow, but the bar shouldn't go backwards
+            last_pct = max(last_pct, 15 + int(15 * completed / max(total, 1)))
+            update_progress(last_pct, f"{state} audio ({completed}/{total} segments)")
+
+        source_key = media_source_key(source)
+        segment_dir = tempfile.mkdtemp(prefix="_stream_", dir=videos_dir)
+        segment_stream = None
+        try:
+            segment_stream = stream_audio_segments(
+                source, segment_dir,
+                segment_seconds=config.stream_segment_seconds,
+                kbps=config.preprocess_kbps,
+                cookies_file=cookies_file,
+            )
+            result = self._get_transcriber().transcribe_stream(
+                segment_stream, task=task, progress_callback=segment_progress
+            )
+            audio_path = os.path.join(videos_dir, f"{source_key}.opus")
+            os.replace(os.path.join(segment_dir, STREAM_FULL_AUDIO), audio_path)
+            get_media_cache(videos_dir).insert(source_key, "audio", audio_path)
+        finally:
+            # If transcription failed mid-stream, closing the generator kills yt-dlp
+            # and ffmpeg before their output directory goes (and before any fallback
+            # download starts alongside them)
+            try:
+                if segment_stream is not None:
+                    segment_stream.close()
+            finally:
+                shutil.rmtree(segment_dir, ignore_errors=True)
+        return result, audio_path
+
     def _translate_chunk(self, text: str, lang_name: str, preserve_timestamps: bool = False) -> str:
         """Translate a single chunk of text using GPT."""
         if preserve_timestamps:
@@ -140,76 +204,120 @@ class VideoMemoryAI:
             )
             return response["message"]["content"].strip()
 
+    # Paragraph header line in _format_transcript() output: "[m:ss]" and an optional speaker
+    _PARAGRAPH_HEADER = re.compile(r"^\[\d+:\d{2}\]")
+
     def _translate_transcript(self, raw_text: str, formatted_text: str, target_lang: str):
         """Translate transcript text to the target language using GPT.
-        Splits long transcripts into chunks to avoid token limits."""
+
+        Only the timestamped paragraphs are translated; the raw text is rebuilt
+        from them, so nothing is translated twice. Paragraphs are packed into
+        chunks that are translated concurrently and reassembled in order.
+
+        Returns:
+            (raw_text, formatted_text) translated, or the originals on failure
+        """
         lang_name = self.LANGUAGE_NAMES.get(target_lang, target_lang)
         chunk_size = 10000  # chars per chunk (safe for gpt-4o-mini context)
 
         try:
-            # Translate formatted transcript (with timestamps) in chunks
-            if len(formatted_text) <= chunk_size:
-                translated_formatted = self._translate_chunk(formatted_text, lang_name, preserve_timestamps=True)
-            else:
-                # Split on line breaks to keep timestamps intact
-                lines = formatted_text.split('\n')
-                chunks = []
-                current = []
-                current_len = 0
-                for line in lines:
-                    if current_len + len(line) > chunk_size and current:
-                        chunks.append('\n'.join(current))
-                        current = []
-                        current_len = 0
-                    current.append(line)
-                    current_len += len(line) + 1
-                if current:
-                    chunks.append('\n'.join(current))
-
-                translated_parts = []
-                for i, chunk in enumerate(chunks):
-                    print(f"  Translating chunk {i+1}/{len(chunks)}...")
-                    translated_parts.append(self._translate_chunk(chunk, lang_name, preserve_timestamps=True))
-                translated_formatted = '\n'.join(translated_parts)
-
-            # Translate raw text (used for content extraction)
-            if len(raw_text) <= chunk_size:
-                translated_raw = self._translate_chunk(raw_text, lang_name, preserve_timestamps=False)
-            else:
-                # Split raw text by sentences/paragraphs
-                parts = raw_text.split('. ')
-                chunks = []
-                current = []
-                current_len = 0
-                for part in parts:
-                    if current_len + len(part) > chunk_size and current:
-                        chunks.append('. '.join(current))
-                        current = []
-                        current_len = 0
-                    current.append(part)
-                    current_len += len(part) + 2
-                if current:
-                    chunks.append('. '.join(current))
+            if not formatted_text.strip():
+                # Nothing timestamped to work from: translate the raw text alone
+                chunks = self._pack_chunks(raw_text.split('. '), '. ', chunk_size)
                 translated_raw = ' '.join(
-                    self._translate_chunk(c, lang_name, preserve_timestamps=False) for c in chunks
+                    self._translate_chunks(chunks, lang_name, target_lang, preserve_timestamps=False)
                 )
+                print(f"Translated transcript to {lang_name} ({len(translated_raw)} chars)")
+                return translated_raw, formatted_text
+
+            # Split between paragraphs to keep each timestamp with its text
+            chunks = self._pack_chunks(formatted_text.split('\n\n'), '\n\n', chunk_size)
+            translated_formatted = '\n\n'.join(
+                self._translate_chunks(chunks, lang_name, target_lang, preserve_timestamps=True)
+            )
+            translated_raw = self._text_from_formatted(translated_formatted)
 
-            print(f"Translated transcript to {lang_name} ({len(translated_formatted)} chars)")
+            print(f"Translated transcript to {lang_name} ({len(translated_formatted)} chars, {len(chunks)} chunks)")
             return translated_raw, translated_formatted
 
         except Exception as e:
             print(f"Translation failed, keeping original: {e}")
             return raw_text, formatted_text
 
-    def _get_diarizer(self):
-        """Lazy load speaker diarizer"""
-        if self.diarizer is None:
-            try:
-                self.diarizer = SpeakerDiarizer()
-            except Exception as e:
-                print(f"Speaker diarization not available: {e}")
-                return None
-        return self.diarizer
+    @staticmethod
+    def _pack_chunks(parts: list, separator: str, chunk_size: int) -> list:
+        """Join consecutive parts with separator into chunks of about chunk_size chars"""
+        chunks = []
+        current = []
+        current_len = 0
+        for part in parts:
+            if current_len + len(part) > chunk_size and current:
+                chunks.append(separator.join(current))
+                current = []
+                current_len = 0
+            current.append(part)
+            current_len += len(part) + len(separator)
+        if current:
+            chunks.append(separator.join(current))
+        return chunks
+
+    def _translate_chunks(self, chunks: list, lang_name: str, target_lang: str,
+                          preserve_timestamps: bool) -> list:
+        """Translate chunks concurrently, in input order, through the translation cache.
+
+        Each chunk is retried on its own if the call fails or (with
+        preserve_timestamps) the reply lost paragraph headers; a reply still
+        missing headers after the last attempt is used but not cached.
+        """
+        config = get_config().translation
+        cache = get_translation_cache()
+        model = "gpt-4o-mini" if self.analyzer.provider == "openai" else self.analyzer.model
+
+        def header_count(text: str) -> int:
+            return sum(1 for line in text.split('\n') if self._PARAGRAPH_HEADER.match(line.strip()))
+
+        def translate(index: int, chunk: str) -> str:
+            key = cache.make_key(model, target_lang, chunk)
+            cached = cache.get(key)
+            if cached is not None:
+                return cached
+
+            expected_headers = header_count(chunk) if preserve_timestamps else 0
+            for attempt in range(config.retries + 1):
+                try:
+                    translated = self._translate_chunk(chunk, lang_name, preserve_timestamps=preserve_timestamps)
+                except Exception as e:
+                    if attempt == config.retries:
+                        raise RuntimeError(
+                            f"Chunk {index + 1}/{len(chunks)} failed after {attempt + 1} attempts: {e}"
+                        ) from e
+                    print(f"  Translation chunk {index + 1}/{len(chunks)} failed ({type(e).__name__}), retrying...")
+                    time.sleep(2 ** attempt)
+                    continue
+                if header_count(translated) == expected_headers:
+                    cache.put(key, translated)
+                    return translated
+                if attempt == config.retries:
+                    print(f"  Translation chunk {index + 1}/{len(chunks)} lost timestamps, using it anyway")
+                    return translated
+                print(f"  Translation chunk {index + 1}/{len(chunks)} lost timestamps, retrying...")
+
+        if len(chunks) == 1:
+            return [translate(0, chunks[0])]
+        with ThreadPoolExecutor(max_workers=max(1, min(config.workers, len(chunks)))) as executor:
+            return list(executor.map(translate, range(len(chunks)), chunks))
+
+    @classmethod
+    def _text_from_formatted(cls, formatted_text: str) -> str:
+        """Plain transcript text from _format_transcript() output (headers dropped)"""
+        paragraphs = []
+        for block in formatted_text.split('\n\n'):
+            lines = [line.strip() for line in block.split('\n') if line.strip()]
+            if lines and cls._PARAGRAPH_HEADER.match(lines[0]):
+                lines = lines[1:]
+            if lines:
+                paragraphs.append(' '.join(lines))
+        return ' '.join(paragraphs)
 
     def _group_transcript_paragraphs(self, segments: list) -> list:
         """Group transcript segments into paragraphs with timestamps, end times, and speakers.
@@ -316,7 +424,7 @@ class VideoMemoryAI:
 
     def _build_timeline(self, segments: list, frame_descriptions: list,
                          content_id: str = None, frame_analyses: list = None,
-                         thumbnail_manifest: list = None) -> list:
+                         thumbnail_manifest: list = None, reused_frames: dict = None) -> list:
         """Build a unified chronological timeline merging transcript paragraphs and vision frame descriptions.
 
         Args:
@@ -324,6 +432,8 @@ class VideoMemoryAI:
             frame_descriptions: Vision descriptions ["[Ns] description", ...]
             content_id: Content ID for thumbnail paths
             frame_analyses: Optional [{timestamp, caption, description}] from analyzer
+            reused_frames: Optional {skipped_timestamp: kept_timestamp} from keyframe
+                selection; each skipped timestamp gets a copy of the kept frame's entry
 
         Returns:
             List of timeline entries sorted by timestamp:
@@ -388,6 +498,17 @@ class VideoMemoryAI:
                         entry["thumbnail"] = blob_url_map[ts_key]
                     timeline.append(entry)
 
+        # Frames skipped by keyframe selection reuse the nearest analyzed frame
+        if reused_frames:
+            vision = {e["timestamp"]: e for e in timeline if e["type"] == "vision"}
+            for ts, kept_ts in reused_frames.items():
+                source = vision.get(round(kept_ts))
+                if source is None and vision:
+                    # The kept frame's analysis failed - fall back to the closest one that didn't
+                    source = vision[min(vision, key=lambda v: abs(v - ts))]
+                if source is not None:
+                    timeline.append({**source, "timestamp": float(round(ts)), "reused_from": source["timestamp"]})
+
         # Sort by timestamp
         timeline.sort(key=lambda e: e["timestamp"])
 
@@ -398,6 +519,7 @@ class VideoMemoryAI:
         source: str,
         analyze_frames: bool = True,
         frame_interval: int = 30,
+        frame_budget: int = None,
         save_content: bool = True,
         progress_callback: callable = None,
         detect_speakers: bool = True,
@@ -405,7 +527,8 @@ class VideoMemoryAI:
         mode: str = "general",
         youtube_stats: dict = None,
         language: str = None,
-        cookies_file: str = None
+        cookies_file: str = None,
+        artifacts: JobArtifacts = None
     ) -> ContentExtract:
         """
         Process a video and extract structured information
@@ -414,14 +537,21 @@ class VideoMemoryAI:
             source: Video file path or YouTube URL
             analyze_frames: Whether to analyze video frames (uses vision API)
             frame_interval: Seconds between frame extractions
+            frame_budget: Max frames sent to the vision model (default config.video.keyframe_budget)
             save_content: Whether to save to memory
             progress_callback: Optional callback(percent, status) for progress updates
             detect_speakers: Whether to detect different speakers
             user_id: Optional user ID for multi-tenant isolation
+            artifacts: Captions, downloads and video info the caller already
+                fetched for this source; anything missing is fetched here and
+                recorded on it
 
         Returns:
             Extracted ContentExtract object
         """
+        if artifacts is None:
+            artifacts = JobArtifacts()
+
         def update_progress(pct, status):
             if progress_callback:
                 progress_callback(pct, status)
@@ -432,6 +562,7 @@ class VideoMemoryAI:
         source_url = None
         caption_fast_path = False  # True when YouTube captions bypass Whisper
         caption_result = None      # Holds YouTube caption data for fast path
+        stream_audio = False       # True when audio is transcribed while it downloads
 
         # =============================================
         # Phase 0: YouTube caption fast path check
@@ -441,7 +572,7 @@ class VideoMemoryAI:
             video_id = _extract_video_id(source)
             if video_id:
                 update_progress(3, "Checking for captions...")
-                caption_result = fetch_youtube_captions(video_id)
+                caption_result = artifacts.get_captions(video_id)
                 if caption_result:
                     caption_fast_path = True
                     print(f"YouTube captions found! Fast path enabled ({caption_result['language']})")
@@ -471,29 +602,41 @@ class VideoMemoryAI:
 
             try:
                 videos_dir = str(self.data_dir / "videos")
+                # Transcribe audio while it downloads (Phase 2) unless it's already on disk
+                stream_audio = (
+                    not caption_fast_path and get_config().transcription.streaming
+                    and not artifacts.cached_path("audio_path")
+                    and not get_media_cache(videos_dir).lookup(media_source_key(source), "audio")
+                )
                 if caption_fast_path:
                     # Fast path: skip audio download entirely
                     if analyze_frames:
                         # Still need video for frame extraction
-                        video_path = download_video(source, videos_dir, cookies_file=cookies_file)
+                        video_path = artifacts.cached_path("video_path") or download_video(source, videos_dir, cookies_file=cookies_file)
                         print(f"  Video (for frames): {video_path}")
                     else:
                         video_path = source  # No file needed
                 elif analyze_frames:
                     # Need both audio (for transcription) and video (for frames)
                     # Download sequentially to limit peak memory (avoid 2 concurrent yt-dlp subprocesses)
-                    audio_path = download_audio(source, videos_dir, cookies_file=cookies_file)
-                    print(f"  Audio: {audio_path}")
-                    video_path = download_video(source, videos_dir, cookies_file=cookies_file)
+                    if not stream_audio:
+                        audio_path = artifacts.cached_path("audio_path") or download_audio(source, videos_dir, cookies_file=cookies_file)
+                        print(f"  Audio: {audio_path}")
+                    video_path = artifacts.cached_path("video_path") or download_video(source, videos_dir, cookies_file=cookies_file)
                     print(f"  Video: {video_path}")
+                elif stream_audio:
+                    video_path = source  # Replaced by the audio file once it has streamed
                 else:
                     # No frame analysis — only need audio (~5MB instead of ~300MB)
-                    audio_path = download_audio(source, videos_dir, cookies_file=cookies_file)
+                    audio_path = artifacts.cached_path("audio_path") or download_audio(source, videos_dir, cookies_file=cookies_file)
                     video_path = audio_path  # Used for get_video_info fallback
                     print(f"  Audio only: {audio_path}")
             finally:
                 download_done.set()
                 dl_progress_thread.join(timeout=1)
+            artifacts.audio_path = audio_path or artifacts.audio_path
+            if analyze_frames and video_path != source:
+                artifacts.video_path = video_path
 
             update_progress(15, "Downloaded" if not caption_fast_path else "Metadata ready")
         else:
@@ -507,7 +650,7 @@ class VideoMemoryAI:
             # No local file — use metadata from yt-dlp
             info = {"duration": 0, "width": 0, "height": 0}
         else:
-            info = get_video_info(video_path) if analyze_frames or not is_url else {"duration": 0, "width": 0, "height": 0}
+            info = artifacts.get_video_info(video_path) if analyze_frames or not is_url else {"duration": 0, "width": 0, "height": 0}
         if info.get("duration", 0) > 0:
             print(f"Duration: {info['duration']:.1f}s, Resolution: {info['width']}x{info['height']}")
 
@@ -522,6 +665,21 @@ class VideoMemoryAI:
         frame_descriptions = []
         frame_analyses = []
         raw_frames = []
+        reused_frames = {}  # skipped frame timestamp -> kept frame timestamp
+        speaker_stats = {}  # speaker -> talk time / turn statistics
+        diarization_timings = {}  # pool wait / model load / diarize seconds
+
+        def pick_keyframes(frames):
+            """Drop near-duplicate frames and apply the frame budget before vision calls"""
+            nonlocal reused_frames
+            if not get_config().video.keyframe_selection:
+                return frames
+            try:
+                kept, reused_frames = select_keyframes(frames, budget=frame_budget)
+                return kept
+            except Exception as e:
+                print(f"Warning: keyframe selection failed, analyzing all frames: {e}")
+                return frames
 
         if caption_fast_path:
             # --- FAST PATH: use YouTube captions as transcript ---
@@ -538,8 +696,9 @@ class VideoMemoryAI:
                 print(f"\n[Fast path] Extracting frames (every {frame_interval}s)...")
                 raw_frames = extract_frames(video_path, interval_seconds=frame_interval)
                 total_frames = len(raw_frames)
-                update_progress(45, f"Extracted {total_frames} frames")
-                print(f"[Fast path] Extracted {total_frames} frames, analyzing in parallel...")
+                raw_frames = pick_keyframes(raw_frames)
+                update_progress(45, f"Extracted {total_frames} frames, analyzing {len(raw_frames)}")
+                print(f"[Fast path] Extracted {total_frames} frames, analyzing {len(raw_frames)} in parallel...")
 
                 def frame_progress(completed, total):
                     pct = 45 + int((completed / max(total, 1)) * 40)
@@ -559,7 +718,7 @@ class VideoMemoryAI:
             # --- STANDARD PATH: download + Whisper ---
             def do_transcription():
                 """Thread A: Transcribe audio, diarize, format transcript."""
-                nonlocal transcript, transcript_result, segments
+                nonlocal transcript, transcript_result, segments, audio_path, video_path, speaker_stats, diarization_timings
                 update_progress(15, "Transcribing audio...")
                 print("\n[Thread A] Transcribing audio...")
 
@@ -568,8 +727,27 @@ class VideoMemoryAI:
                 if language and language == "en":
                     whisper_task = "translate"
 
-                # Transcribe using audio file (much smaller than video)
-                transcript_result = transcriber.transcribe(audio_path, task=whisper_task)
+                if stream_audio:
+                    try:
+                        transcript_result, audio_path = self._transcribe_streaming(
+                            source, videos_dir, whisper_task, update_progress,
+                            cookies_file=cookies_file,
+                            expected_duration=(artifacts.metadata or {}).get("duration", 0),
+                        )
+                    except StreamInterrupted as e:
+                        # The download/segmenting failed, not transcription: fetch the
+                        # audio normally and only transcribe what the stream didn't cover
+                        print(f"[Thread A] Streaming download failed, downloading first: {e}")
+                        audio_path = download_audio(source, videos_dir, cookies_file=cookies_file)
+                        transcript_result = transcriber.transcribe_after(
+                            audio_path, e.partial, e.covered_seconds, task=whisper_task
+                        )
+                    artifacts.audio_path = audio_path
+                    if not analyze_frames:
+                        video_path = audio_path
+                else:
+                    # Transcribe using audio file (much smaller than video)
+                    transcript_result = transcriber.transcribe(audio_path, task=whisper_task)
                 transcript = transcript_result["text"]
                 segments = transcript_result["segments"]
                 print(f"[Thread A] Transcribed {len(transcript)} characters in {transcript_result['language']}")
@@ -581,11 +759,13 @@ class VideoMemoryAI:
                     update_progress(30, "Detecting speakers...")
                     print("[Thread A] Detecting speakers...")
                     try:
-                        diarizer = self._get_diarizer()
-                        if diarizer:
-                            speaker_segs = diarizer.diarize(audio_path)
-                            segments[:] = diarizer.merge_with_transcript(segments, speaker_segs)
-                            print(f"[Thread A] Detected {len(set(s.get('speaker') for s in segments))} speakers")
+                        # Pipelines are loaded once per process and shared between jobs
+                        speaker_segs, diarization_timings = get_diarizer_pool().diarize(audio_path)
+                        merged, speaker_stats = merge_speakers(segments, speaker_segs)
+                        segments[:] = merged
+                        print(f"[Thread A] Detected {len(set(s.get('speaker') for s in segments))} speakers "
+                              f"(waited {diarization_timings['wait_seconds']:.1f}s, "
+                              f"model load {diarization_timings['load_seconds']:.1f}s)")
                     except Exception as e:
                         print(f"[Thread A] Speaker detection skipped: {e}")
 
@@ -599,8 +779,9 @@ class VideoMemoryAI:
 
                 raw_frames = extract_frames(video_path, interval_seconds=frame_interval)
                 total_frames = len(raw_frames)
-                update_progress(45, f"Extracted {total_frames} frames")
-                print(f"[Thread B] Extracted {total_frames} frames, analyzing in parallel...")
+                raw_frames = pick_keyframes(raw_frames)
+                update_progress(45, f"Extracted {total_frames} frames, analyzing {len(raw_frames)}")
+                print(f"[Thread B] Extracted {total_frames} frames, analyzing {len(raw_frames)} in parallel...")
 
                 def frame_progress(completed, total):
                     pct = 45 + int((completed / max(total, 1)) * 40)
@@ -625,6 +806,12 @@ class VideoMemoryAI:
                     # Wait for both to complete, propagate exceptions
                     transcription_future.result()
                     frame_future.result()
+            elif stream_audio:
+                # No frame analysis; streaming reports real per-segment progress
+                do_transcription()
+
+                print("\n[3/4] Skipping frame analysis")
+                update_progress(50, "Skipped frames")
             else:
                 # No frame analysis — just transcribe sequentially
                 # Simulate progress during transcription
@@ -732,6 +919,15 @@ class VideoMemoryAI:
         content.metadata = content.metadata or {}
         if thumbnail_manifest:
             content.metadata["thumbnails"] = thumbnail_manifest
+        if speaker_stats:
+            content.metadata["speakers"] = speaker_stats
+        if diarization_timings:
+            content.metadata["diarization"] = diarization_timings
+        if reused_frames:
+            content.metadata["keyframes"] = {
+                "analyzed": len(frame_analyses),
+                "reused": len(reused_frames)
+            }
 
         # Store YouTube thumbnail URL for library cards
         if source_url:
@@ -745,7 +941,8 @@ class VideoMemoryAI:
                 segments, frame_descriptions,
                 content_id=content.id,
                 frame_analyses=frame_analyses,
-                thumbnail_manifest=thumbnail_manifest
+                thumbnail_manifest=thumbnail_manifest,
+                reused_frames=reused_frames
             )
 
         update_progress(95, "Saving")
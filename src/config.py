@@ -149,6 +149,207 @@ class VectorConfig:
     embedding_model: str = field(default_factory=lambda: os.getenv(
         "EMBEDDING_MODEL", "sentence-transformers/all-MiniLM-L6-v2"
     ))
+    # In-memory per-user embedding matrices (non-pgvector search path), shared LRU budget
+    matrix_cache_mb: int = field(
+        default_factory=lambda: int(os.getenv("VECTOR_MATRIX_CACHE_MB", "256"))
+    )
+    # Same, for transcript passage embeddings (many rows per content item)
+    passage_matrix_cache_mb: int = field(
+        default_factory=lambda: int(os.getenv("VECTOR_PASSAGE_CACHE_MB", "256"))
+    )
+    # Content-addressed embedding cache: in-process LRU entries + Redis TTL (seconds)
+    embedding_cache_size: int = field(
+        default_factory=lambda: int(os.getenv("EMBEDDING_CACHE_SIZE", "4096"))
+    )
+    embedding_cache_ttl: int = field(
+        default_factory=lambda: int(os.getenv("EMBEDDING_CACHE_TTL", str(30 * 24 * 3600)))
+    )
+
+
+@dataclass
+class JobProgressConfig:
+    """Job progress reporting configuration"""
+    # Every progress update is pushed to the user's event streams; the jobs
+    # table only gets milestones: the first update of each phase, a jump of
+    # db_step points, or the latest state once db_interval seconds have passed
+    db_interval: int = field(
+        default_factory=lambda: int(os.getenv("JOB_PROGRESS_DB_INTERVAL", "30"))
+    )
+    db_step: int = field(
+        default_factory=lambda: int(os.getenv("JOB_PROGRESS_DB_STEP", "10"))
+    )
+    # Seconds between keepalive comments on an idle event stream
+    stream_keepalive: int = field(
+        default_factory=lambda: int(os.getenv("JOB_EVENTS_KEEPALIVE", "15"))
+    )
+
+
+@dataclass
+class VideoConfig:
+    """Video processing configuration"""
+    # Frame extraction: "seek" (OpenCV, seek per sample), "ffmpeg" (one
+    # sequential decode pass over a pipe) or "grab" (OpenCV, grab() between
+    # samples). The sequential backends decode every frame, so they only pay
+    # off when samples are closer together than the keyframe interval.
+    frame_backend: str = field(default_factory=lambda: os.getenv(
+        "FRAME_EXTRACT_BACKEND", "seek"
+    ).lower())
+    # Keyframe selection before vision analysis: drop near-duplicate frames
+    # and cap how many frames per video go to the vision model (0 = no cap)
+    keyframe_selection: bool = field(default_factory=lambda: os.getenv(
+        "KEYFRAME_SELECTION", "true"
+    ).lower() == "true")
+    keyframe_budget: int = field(
+        default_factory=lambda: int(os.getenv("KEYFRAME_BUDGET", "12"))
+    )
+    keyframe_hash_distance: int = field(
+        default_factory=lambda: int(os.getenv("KEYFRAME_HASH_DISTANCE", "10"))
+    )
+    # Downloaded media cache (data/videos): LRU eviction past this many MB
+    # (0 = unlimited); files used within the protect window are never evicted
+    media_cache_mb: int = field(
+        default_factory=lambda: int(os.getenv("MEDIA_CACHE_MB", "10240"))
+    )
+    media_cache_protect_seconds: int = field(
+        default_factory=lambda: int(os.getenv("MEDIA_CACHE_PROTECT_SECONDS", "3600"))
+    )
+    # yt-dlp backend: "inprocess" (Python API, long-lived per process, falls
+    # back to the subprocess on error) or "subprocess" (one yt-dlp run per call)
+    ytdlp_backend: str = field(default_factory=lambda: os.getenv(
+        "YTDLP_BACKEND", "inprocess"
+    ).lower())
+    # Seconds an extracted info dict is reused (metadata probe -> download)
+    ytdlp_info_ttl: int = field(
+        default_factory=lambda: int(os.getenv("YTDLP_INFO_TTL", "1800"))
+    )
+    # Extractor instances per process, i.e. concurrent extractions (jobs run
+    # as threads share the engine when there is no separate worker)
+    ytdlp_extractors: int = field(
+        default_factory=lambda: int(os.getenv("YTDLP_EXTRACTORS", "4"))
+    )
+
+
+@dataclass
+class TranscriptionConfig:
+    """Whisper transcription configuration"""
+    # Files over the API size limit are split into chunks transcribed concurrently
+    chunk_workers: int = field(
+        default_factory=lambda: int(os.getenv("WHISPER_CHUNK_WORKERS", "4"))
+    )
+    # Extra attempts for a chunk whose API call fails, before the file fails
+    chunk_retries: int = field(
+        default_factory=lambda: int(os.getenv("WHISPER_CHUNK_RETRIES", "2"))
+    )
+    # Move chunk boundaries into nearby silence so words aren't cut in half
+    align_chunks_to_silence: bool = field(default_factory=lambda: os.getenv(
+        "WHISPER_SILENCE_ALIGN", "true"
+    ).lower() == "true")
+    # Re-encode audio for speech (mono 16 kHz, low bitrate) before upload so
+    # long recordings fit in one request: codec "opus" (.webm) or "aac" (.m4a)
+    preprocess: bool = field(default_factory=lambda: os.getenv(
+        "WHISPER_PREPROCESS", "true"
+    ).lower() == "true")
+    preprocess_codec: str = field(default_factory=lambda: os.getenv(
+        "WHISPER_PREPROCESS_CODEC", "opus"
+    ).lower())
+    preprocess_kbps: int = field(
+        default_factory=lambda: int(os.getenv("WHISPER_PREPROCESS_KBPS", "16"))
+    )
+    # While preprocessing, cut long silences out (timestamps are mapped back)
+    vad_trim: bool = field(default_factory=lambda: os.getenv(
+        "WHISPER_VAD_TRIM", "false"
+    ).lower() == "true")
+    # Transcribe URL audio while it downloads: yt-dlp is piped into an ffmpeg
+    # segmenter and each finished segment goes straight to the chunk pool
+    stream: bool = field(default_factory=lambda: os.getenv(
+        "WHISPER_STREAM", "true"
+    ).lower() == "true")
+    stream_segment_seconds: int = field(
+        default_factory=lambda: int(os.getenv("WHISPER_STREAM_SEGMENT_SECONDS", "300"))
+    )
+
+    @property
+    def streaming(self) -> bool:
+        """Whether URL jobs stream audio into transcription (VAD trimming needs the whole file)"""
+        return self.stream and not self.vad_trim
+
+
+@dataclass
+class TranslationConfig:
+    """Transcript translation configuration"""
+    # Chunks of the timestamped transcript translated concurrently
+    workers: int = field(
+        default_factory=lambda: int(os.getenv("TRANSLATION_WORKERS", "4"))
+    )
+    # Extra attempts for a chunk whose call fails or loses its timestamps
+    retries: int = field(
+        default_factory=lambda: int(os.getenv("TRANSLATION_RETRIES", "2"))
+    )
+    # Translated chunks cache: in-process LRU entries + Redis TTL (seconds)
+    cache_size: int = field(
+        default_factory=lambda: int(os.getenv("TRANSLATION_CACHE_SIZE", "1024"))
+    )
+    cache_ttl: int = field(
+        default_factory=lambda: int(os.getenv("TRANSLATION_CACHE_TTL", str(30 * 24 * 3600)))
+    )
+
+
+@dataclass
+class ExtractionConfig:
+    """LLM content extraction configuration"""
+    # Transcripts over this many estimated tokens (~4 chars each) are
+    # extracted map-reduce: windows of paragraphs are condensed in parallel
+    # and one reduce call builds the mode-specific result from the notes
+    map_reduce: bool = field(default_factory=lambda: os.getenv(
+        "EXTRACTION_MAP_REDUCE", "true"
+    ).lower() == "true")
+    map_reduce_tokens: int = field(
+        default_factory=lambda: int(os.getenv("EXTRACTION_MAP_REDUCE_TOKENS", "24000"))
+    )
+    window_tokens: int = field(
+        default_factory=lambda: int(os.getenv("EXTRACTION_WINDOW_TOKENS", "6000"))
+    )
+    # Windows extracted concurrently, and extra attempts for a failed window
+    workers: int = field(
+        default_factory=lambda: int(os.getenv("EXTRACTION_WORKERS", "4"))
+    )
+    retries: int = field(
+        default_factory=lambda: int(os.getenv("EXTRACTION_RETRIES", "2"))
+    )
+    # Auto mode tries a local classifier trained on the modes of stored
+    # content first; predictions under the confidence floor (or before
+    # min_docs labelled documents exist) go to the LLM
+    mode_classifier: bool = field(default_factory=lambda: os.getenv(
+        "MODE_CLASSIFIER", "true"
+    ).lower() == "true")
+    mode_classifier_confidence: float = field(
+        default_factory=lambda: float(os.getenv("MODE_CLASSIFIER_CONFIDENCE", "0.85"))
+    )
+    mode_classifier_min_docs: int = field(
+        default_factory=lambda: int(os.getenv("MODE_CLASSIFIER_MIN_DOCS", "50"))
+    )
+    mode_classifier_max_docs: int = field(
+        default_factory=lambda: int(os.getenv("MODE_CLASSIFIER_MAX_DOCS", "5000"))
+    )
+    # Seconds before the model is retrained with newly stored content
+    mode_classifier_refresh: int = field(
+        default_factory=lambda: int(os.getenv("MODE_CLASSIFIER_REFRESH", str(6 * 3600)))
+    )
+
+
+@dataclass
+class DiarizationConfig:
+    """Speaker diarization configuration"""
+    # Loaded pyannote pipelines kept per process; each serves one job at a
+    # time. torch already spreads one pipeline over the cores, so 1 is
+    # usually right; raise it on large machines running several jobs at once.
+    pool_size: int = field(
+        default_factory=lambda: int(os.getenv("DIARIZATION_POOL_SIZE", "1"))
+    )
+    # Load a pipeline at worker startup instead of in the first job
+    preload: bool = field(default_factory=lambda: os.getenv(
+        "DIARIZATION_PRELOAD", os.getenv("ENABLE_SPEAKER_DETECTION", "false")
+    ).lower() == "true")
 
 
 @dataclass
@@ -169,6 +370,12 @@ class AppConfig:
     rate_limit: RateLimitConfig = field(default_factory=RateLimitConfig)
     redis: RedisConfig = field(default_factory=RedisConfig)
     vector: VectorConfig = field(default_factory=VectorConfig)
+    progress: JobProgressConfig = field(default_factory=JobProgressConfig)
+    video: VideoConfig = field(default_factory=VideoConfig)
+    transcription: TranscriptionConfig = field(default_factory=TranscriptionConfig)
+    translation: TranslationConfig = field(default_factory=TranslationConfig)
+    extraction: ExtractionConfig = field(default_factory=ExtractionConfig)
+    diarization: DiarizationConfig = field(default_factory=DiarizationConfig)
 
     def validate(self, strict: bool = False) -> bool:
         """
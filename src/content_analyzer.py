@@ -5,10 +5,16 @@ Uses LLM (OpenAI or Ollama) to extract structured information from video content
 
 import json
 import os
-from typing import List, Tuple, Optional
+import re
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Optional
 from dataclasses import dataclass, asdict, field
 from datetime import datetime
 
+from config import get_config
+from mode_classifier import get_mode_classifier
+
 
 @dataclass
 class ContentExtract:
@@ -657,6 +663,61 @@ ANALYSIS RULES:
 Return ONLY the JSON object, no other text."""
 
 
+# =============================================
+# Map-reduce extraction (long transcripts)
+# =============================================
+
+MAP_EXTRACTION_PROMPT = """You are taking notes on one part of a long video transcript. These notes will later be combined with notes from the other parts, so capture everything worth keeping from THIS part only.
+
+PART {index} OF {count}:
+{transcript}
+
+Return a JSON object with this exact structure:
+{{
+    "summary": "2-3 sentences on what happens in this part",
+    "speakers": ["Names or labels of people speaking in this part"],
+    "key_points": [
+        {{"point": "Main point, step, decision or concept", "timestamp": "MM:SS", "details": "Specifics: numbers, names, reasoning, instructions"}}
+    ],
+    "entities": [
+        {{"name": "Entity name", "type": "person|product|company|concept|tool|ingredient|other", "description": "Brief description"}}
+    ],
+    "quotes": [
+        {{"text": "Exact memorable quote", "speaker": "Who said it", "timestamp": "MM:SS"}}
+    ],
+    "action_items": ["Actionable takeaways, tasks or tips mentioned in this part"],
+    "resources": [
+        {{"name": "Resource name", "url": "URL if mentioned", "description": "What it is"}}
+    ]
+}}
+
+Guidelines:
+1. Timestamps come from the [M:SS] paragraph headers; use the header of the paragraph the point is in
+2. Keep quotes verbatim and only include ones worth repeating
+3. Be specific and complete rather than brief: the final result is built from these notes alone
+
+Return ONLY the JSON object, no other text."""
+
+# [M:SS] header opening each paragraph of the formatted transcript
+_TIMESTAMP_HEADER = re.compile(r"^\[(\d+:\d{2})\]", re.MULTILINE)
+
+# Output budget for one window's notes: about as many tokens as the window
+# itself (notes are asked to be complete), within the model's output limit.
+# A reply cut off at the cap is re-split rather than retried; windows are
+# not split below MIN_SPLIT_WINDOW_TOKENS.
+MAP_MIN_OUTPUT_TOKENS = 2000
+MAP_MAX_OUTPUT_TOKENS = 16000
+MIN_SPLIT_WINDOW_TOKENS = 500
+
+
+class TruncatedResponse(ValueError):
+    """The model stopped at max_tokens, so its JSON is incomplete"""
+
+REDUCE_PREAMBLE = """This video is too long to include its transcript. The TRANSCRIPT section below instead holds notes taken from {count} consecutive parts of it, in order, with timestamps from the original video. Treat the notes as the full content: combine them into one result covering the whole video, merge duplicates across parts, and keep the original timestamps.
+
+"""
+
+
 class ContentAnalyzer:
     def __init__(self, provider: str = "openai", model: str = None, tier: str = "free"):
         """
@@ -772,9 +833,10 @@ class ContentAnalyzer:
             "formatted": f"[{timestamp:.0f}s] {description}"
         }
 
-    def analyze_frames(self, frames: List[Tuple[float, str]], with_captions: bool = True) -> List[str]:
+    def analyze_frames(self, frames: list, with_captions: bool = True) -> List[str]:
         """
-        Analyze video frames using vision model (sequential, one at a time).
+        Analyze video frames (video_processor.Frame records) using vision model
+        (sequential, one at a time).
         Returns descriptions of what's happening in each frame.
 
         When with_captions=True, also populates self._last_frame_analyses with
@@ -783,9 +845,10 @@ class ContentAnalyzer:
         descriptions = []
         self._last_frame_analyses = []
 
-        for timestamp, base64_image in frames:
+        for frame in frames:
+            timestamp = frame.timestamp
             try:
-                result = self._analyze_single_frame(timestamp, base64_image, with_captions)
+                result = self._analyze_single_frame(timestamp, frame.base64, with_captions)
 
                 descriptions.append(result["formatted"])
                 self._last_frame_analyses.append({
@@ -803,7 +866,7 @@ class ContentAnalyzer:
 
     def analyze_frames_parallel(
         self,
-        frames: List[Tuple[float, str]],
+        frames: list,
         with_captions: bool = True,
         max_workers: int = 5,
         progress_callback: callable = None
@@ -813,7 +876,7 @@ class ContentAnalyzer:
         Returns descriptions in the same order as input frames.
 
         Args:
-            frames: List of (timestamp, base64_image) tuples
+            frames: video_processor.Frame records (base64-encoded per request, in the worker)
             with_captions: Whether to generate captions
             max_workers: Max concurrent API calls (default 5)
             progress_callback: Optional callback(completed, total) for progress
@@ -827,14 +890,14 @@ class ContentAnalyzer:
         self._last_frame_analyses = []
         completed_count = 0
 
-        def analyze_with_index(idx, timestamp, base64_image):
-            return idx, self._analyze_single_frame(timestamp, base64_image, with_captions)
+        def analyze_with_index(idx, frame):
+            return idx, self._analyze_single_frame(frame.timestamp, frame.base64, with_captions)
 
         try:
             with ThreadPoolExecutor(max_workers=max_workers) as executor:
                 futures = {
-                    executor.submit(analyze_with_index, i, ts, img): i
-                    for i, (ts, img) in enumerate(frames)
+                    executor.submit(analyze_with_index, i, frame): i
+                    for i, frame in enumerate(frames)
                 }
 
                 for future in as_completed(futures):
@@ -852,7 +915,7 @@ class ContentAnalyzer:
                         if progress_callback:
                             progress_callback(completed_count, len(frames))
                     except Exception as frame_err:
-                        ts = frames[idx][0]
+                        ts = frames[idx].timestamp
                         print(f"  WARNING: Frame at {ts:.0f}s failed ({type(frame_err).__name__}), skipping")
                         completed_count += 1
                         if progress_callback:
@@ -870,9 +933,35 @@ class ContentAnalyzer:
         """
         Auto-detect the content mode from transcript
 
+        The local classifier (mode_classifier) answers when it's confident;
+        otherwise the LLM classifies the transcript preview.
+
         Returns:
-            dict with keys: mode, confidence, reason
+            dict with keys: mode, confidence, reason, path ("local", "llm",
+            or "fallback" when the LLM call failed), plus
+            local_mode/local_confidence when the LLM overruled a
+            low-confidence local prediction
         """
+        local = None
+        if get_config().extraction.mode_classifier:
+            start = time.perf_counter()
+            try:
+                local = get_mode_classifier().classify(transcript)
+            except Exception as e:
+                print(f"  Local mode classifier failed: {e}")
+            latency_ms = round((time.perf_counter() - start) * 1000, 3)
+            if local and local["accepted"]:
+                print(f"  Auto-detected mode: {local['mode']} "
+                      f"(local classifier, confidence: {local['confidence']}, {latency_ms}ms)")
+                return {
+                    "mode": local["mode"],
+                    "confidence": local["confidence"],
+                    "reason": "Local classifier",
+                    "path": "local",
+                    "latency_ms": latency_ms,
+                }
+        local_fields = {"local_mode": local["mode"], "local_confidence": local["confidence"]} if local else {}
+
         # Use first 2000 chars for detection (faster, cheaper)
         transcript_preview = transcript[:2000] if len(transcript) > 2000 else transcript
 
@@ -908,11 +997,212 @@ class ContentAnalyzer:
             return {
                 "mode": detected_mode,
                 "confidence": result.get("confidence", 0.5),
-                "reason": result.get("reason", "")
+                "reason": result.get("reason", ""),
+                "path": "llm",
+                **local_fields
             }
         except Exception as e:
             print(f"  Mode detection failed, defaulting to 'general': {e}")
-            return {"mode": "general", "confidence": 0.0, "reason": f"Detection failed: {e}"}
+            return {"mode": "general", "confidence": 0.0, "reason": f"Detection failed: {e}",
+                    "path": "fallback", **local_fields}
+
+    def _chat_json(self, prompt: str, max_tokens: int = None) -> dict:
+        """Send one prompt in JSON mode and parse the returned object"""
+        if self.provider == "openai":
+            kwargs = {"max_tokens": max_tokens} if max_tokens else {}
+            response = self.client.chat.completions.create(
+                model=self.model,
+                messages=[{"role": "user", "content": prompt}],
+                response_format={"type": "json_object"},
+                **kwargs
+            )
+            content = response.choices[0].message.content
+            truncated = response.choices[0].finish_reason == "length"
+        else:
+            response = self.client.chat(
+                model=self.model,
+                messages=[{"role": "user", "content": prompt}],
+                format="json"
+            )
+            content = response["message"]["content"]
+            truncated = response.get("done_reason") == "length"
+        if truncated:
+            raise TruncatedResponse(f"Response cut off at max_tokens={max_tokens}")
+
+        # Parse JSON response
+        try:
+            return json.loads(content)
+        except json.JSONDecodeError:
+            # Try to extract JSON from response
+            match = re.search(r'\{.*\}', content, re.DOTALL)
+            if match:
+                return json.loads(match.group())
+            raise ValueError(f"Could not parse JSON from response: {content[:500]}")
+
+    @staticmethod
+    def _estimate_tokens(text: str) -> int:
+        """Rough token count (~4 characters per token for English text)"""
+        return len(text) // 4
+
+    @classmethod
+    def _transcript_windows(cls, text: str, window_tokens: int) -> List[str]:
+        """
+        Split a transcript into windows of about window_tokens each.
+
+        Windows are cut between the "\\n\\n"-separated paragraphs of the
+        formatted transcript (app._group_transcript_paragraphs boundaries), so
+        every window starts on a [M:SS] header. A paragraph that is longer
+        than a window on its own (plain transcripts have none) is cut at
+        whitespace.
+        """
+        max_chars = max(1, window_tokens) * 4
+        pieces = []
+        for block in text.split("\n\n"):
+            block = block.strip()
+            while len(block) > max_chars:
+                cut = block.rfind(" ", 0, max_chars)
+                if cut <= 0:
+                    cut = max_chars
+                pieces.append(block[:cut])
+                block = block[cut:].strip()
+            if block:
+                pieces.append(block)
+
+        windows, current, size = [], [], 0
+        for piece in pieces:
+            if current and size + len(piece) > max_chars:
+                windows.append("\n\n".join(current))
+                current, size = [], 0
+            current.append(piece)
+            size += len(piece) + 2
+        if current:
+            windows.append("\n\n".join(current))
+        return windows
+
+    def _extract_window(self, index: int, count: int, window: str, retries: int,
+                        window_tokens: int) -> Optional[dict]:
+        """Partial extraction of one window; None once every attempt failed.
+
+        A reply truncated at the output cap would be truncated again on retry,
+        so the window is halved (at paragraph boundaries) and the halves'
+        notes are combined instead.
+        """
+        prompt = MAP_EXTRACTION_PROMPT.format(index=index + 1, count=count, transcript=window)
+        max_tokens = min(MAP_MAX_OUTPUT_TOKENS, max(MAP_MIN_OUTPUT_TOKENS, window_tokens))
+        for attempt in range(retries + 1):
+            try:
+                return self._chat_json(prompt, max_tokens=max_tokens)
+            except TruncatedResponse as e:
+                halves = self._transcript_windows(window, window_tokens // 2)
+                if window_tokens // 2 < MIN_SPLIT_WINDOW_TOKENS or len(halves) < 2:
+                    print(f"  WARNING: Window {index + 1}/{count} too dense to split further, skipping: {e}")
+                    return None
+                print(f"  Window {index + 1}/{count} notes hit the output cap, splitting into {len(halves)}")
+                parts = [
+                    self._extract_window(index, count, half, retries, window_tokens // 2)
+                    for half in halves
+                ]
+                return self._merge_window_notes([p for p in parts if p is not None])
+            except Exception as e:
+                if attempt < retries:
+                    print(f"  Window {index + 1}/{count} failed ({e}), retrying")
+                else:
+                    print(f"  WARNING: Window {index + 1}/{count} failed after {retries + 1} attempts, skipping: {e}")
+        return None
+
+    @staticmethod
+    def _merge_window_notes(parts: List[dict]) -> Optional[dict]:
+        """Combine the notes of consecutive sub-windows into one window's notes"""
+        if not parts:
+            return None
+        merged = {"summary": " ".join(p["summary"] for p in parts if isinstance(p.get("summary"), str) and p["summary"])}
+        for key in ("key_points", "entities", "quotes", "action_items", "resources"):
+            merged[key] = [item for p in parts for item in (p.get(key) or [])]
+        merged["speakers"] = list(dict.fromkeys(s for p in parts for s in (p.get("speakers") or [])
+                                                if isinstance(s, str)))
+        return merged
+
+    @staticmethod
+    def _format_window_notes(index: int, count: int, window: str, notes: Optional[dict]) -> str:
+        """One window's partial extraction as compact text for the reduce prompt"""
+        headers = _TIMESTAMP_HEADER.findall(window)
+        span = f" [{headers[0]} - {headers[-1]}]" if headers else ""
+        lines = [f"=== PART {index + 1}/{count}{span} ==="]
+        if notes is None:
+            lines.append("(Notes unavailable for this part.)")
+            return "\n".join(lines)
+
+        if notes.get("summary"):
+            lines.append(f"Summary: {notes['summary']}")
+        speakers = [s for s in notes.get("speakers", []) if isinstance(s, str) and s]
+        if speakers:
+            lines.append(f"Speakers: {', '.join(speakers)}")
+        key_points = [kp for kp in notes.get("key_points", []) if isinstance(kp, dict)]
+        if key_points:
+            lines.append("Key points:")
+            for kp in key_points:
+                details = f" - {kp['details']}" if kp.get("details") else ""
+                lines.append(f"- [{kp.get('timestamp', '')}] {kp.get('point', '')}{details}")
+        entities = [e for e in notes.get("entities", []) if isinstance(e, dict)]
+        if entities:
+            lines.append("Entities:")
+            for e in entities:
+                lines.append(f"- {e.get('name', '')} ({e.get('type', 'other')}): {e.get('description', '')}")
+        quotes = [q for q in notes.get("quotes", []) if isinstance(q, dict)]
+        if quotes:
+            lines.append("Quotes:")
+            for q in quotes:
+                lines.append(f"- [{q.get('timestamp', '')}] {q.get('speaker', 'Unknown')}: \"{q.get('text', '')}\"")
+        action_items = [a for a in notes.get("action_items", []) if isinstance(a, str) and a]
+        if action_items:
+            lines.append("Action items:")
+            lines.extend(f"- {a}" for a in action_items)
+        resources = [r for r in notes.get("resources", []) if isinstance(r, dict)]
+        if resources:
+            lines.append("Resources:")
+            for r in resources:
+                url = f" <{r['url']}>" if r.get("url") else ""
+                lines.append(f"- {r.get('name', '')}{url}: {r.get('description', '')}")
+        return "\n".join(lines)
+
+    def _map_transcript(self, text: str) -> tuple:
+        """
+        Map step of map-reduce extraction: partial extractions of every
+        window, run concurrently.
+
+        Returns:
+            (notes, stats) where notes is the combined text that stands in for
+            the transcript in the reduce prompt and stats has windows,
+            failed_windows and map_seconds
+        """
+        config = get_config().extraction
+        windows = self._transcript_windows(text, config.window_tokens)
+        count = len(windows)
+        print(f"  Long transcript (~{self._estimate_tokens(text):,} tokens): "
+              f"extracting {count} windows with {min(config.workers, count)} workers")
+
+        start = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=max(1, min(config.workers, count))) as executor:
+            results = list(executor.map(
+                lambda i: self._extract_window(i, count, windows[i], config.retries, config.window_tokens),
+                range(count)
+            ))
+        map_seconds = time.perf_counter() - start
+
+        failed = sum(1 for r in results if r is None)
+        if failed == count:
+            raise ValueError(f"Extraction failed for all {count} transcript windows")
+
+        notes = "\n\n".join(
+            self._format_window_notes(i, count, windows[i], results[i]) for i in range(count)
+        )
+        print(f"  Extracted {count - failed}/{count} windows in {map_seconds:.1f}s "
+              f"(~{self._estimate_tokens(notes):,} tokens of notes)")
+        return notes, {
+            "windows": count,
+            "failed_windows": failed,
+            "map_seconds": round(map_seconds, 2),
+        }
 
     def extract_content(
         self,
@@ -932,24 +1222,41 @@ class ContentAnalyzer:
 
         Args:
             mode: Extraction mode - "auto" (detect), "general", "recipe", "learn", "creator", "meeting"
+
+        Transcripts over config.extraction.map_reduce_tokens are extracted
+        map-reduce (see _map_transcript); metadata["extraction"] records the
+        strategy used, and metadata["mode_detection"] how an auto mode was
+        picked (see detect_mode).
         """
         frame_text = "\n".join(frame_descriptions) if frame_descriptions else "No visual descriptions available."
 
         # Auto-detect mode if not specified
+        detection = None
         if mode == "auto" or mode not in EXTRACTION_MODES:
             print("  Detecting content type...")
             detection = self.detect_mode(transcript)
             mode = detection.get("mode", "general")
 
+        # Long transcripts go map-reduce: windows of paragraphs are condensed
+        # into notes in parallel, and the mode prompt below runs on the notes
+        prompt_transcript = transcript
+        extraction_stats = {"strategy": "single"}
+        extraction_config = get_config().extraction
+        source_text = formatted_transcript or transcript
+        if (extraction_config.map_reduce
+                and self._estimate_tokens(source_text) > extraction_config.map_reduce_tokens):
+            prompt_transcript, map_stats = self._map_transcript(source_text)
+            extraction_stats = {"strategy": "map_reduce", **map_stats}
+
         # Select prompt based on mode
         if mode == "recipe":
             prompt = RECIPE_EXTRACTION_PROMPT.format(
-                transcript=transcript,
+                transcript=prompt_transcript,
                 frame_descriptions=frame_text
             )
         elif mode == "learn":
             prompt = LEARN_EXTRACTION_PROMPT.format(
-                transcript=transcript,
+                transcript=prompt_transcript,
                 frame_descriptions=frame_text
             )
         elif mode == "creator":
@@ -967,27 +1274,30 @@ class ContentAnalyzer:
                     f"- Categories: {', '.join(youtube_stats.get('categories', []))}\n"
                 )
             prompt = CREATOR_EXTRACTION_PROMPT.format(
-                transcript=transcript,
+                transcript=prompt_transcript,
                 frame_descriptions=frame_text,
                 youtube_stats=stats_text
             )
         elif mode == "meeting":
             prompt = MEETING_EXTRACTION_PROMPT.format(
-                transcript=transcript,
+                transcript=prompt_transcript,
                 frame_descriptions=frame_text
             )
         elif mode == "deepdive":
             prompt = DEEPDIVE_EXTRACTION_PROMPT.format(
-                transcript=transcript,
+                transcript=prompt_transcript,
                 frame_descriptions=frame_text
             )
         else:
             # Default to general extraction
             prompt = EXTRACTION_PROMPT.format(
-                transcript=transcript,
+                transcript=prompt_transcript,
                 frame_descriptions=frame_text
             )
 
+        if extraction_stats["strategy"] == "map_reduce":
+            prompt = REDUCE_PREAMBLE.format(count=extraction_stats["windows"]) + prompt
+
         # Prepend language instruction if a specific language is requested
         LANGUAGE_NAMES = {
             "af": "Afrikaans", "am": "Amharic", "ar": "Arabic", "as": "Assamese",
@@ -1020,32 +1330,10 @@ class ContentAnalyzer:
                 f"{prompt}\n\nREMINDER: All text values in the JSON output MUST be in {lang_name}."
             )
 
-        if self.provider == "openai":
-            response = self.client.chat.completions.create(
-                model=self.model,
-                messages=[{"role": "user", "content": prompt}],
-                response_format={"type": "json_object"}
-            )
-            content = response.choices[0].message.content
-        else:
-            response = self.client.chat(
-                model=self.model,
-                messages=[{"role": "user", "content": prompt}],
-                format="json"
-            )
-            content = response["message"]["content"]
-
-        # Parse JSON response
-        try:
-            data = json.loads(content)
-        except json.JSONDecodeError:
-            # Try to extract JSON from response
-            import re
-            match = re.search(r'\{.*\}', content, re.DOTALL)
-            if match:
-                data = json.loads(match.group())
-            else:
-                raise ValueError(f"Could not parse JSON from response: {content[:500]}")
+        start = time.perf_counter()
+        data = self._chat_json(prompt)
+        if extraction_stats["strategy"] == "map_reduce":
+            extraction_stats["reduce_seconds"] = round(time.perf_counter() - start, 2)
 
         # Generate unique ID
         content_id = f"content_{datetime.now().strftime('%Y%m%d_%H%M%S')}"
@@ -1092,7 +1380,7 @@ class ContentAnalyzer:
             tips = recipe_data.get("tips", [])
             action_items = [tip.get("tip", "") for tip in tips if isinstance(tip, dict)]
 
-            return ContentExtract(
+            content = ContentExtract(
                 id=content_id,
                 title=title,
                 summary=summary,
@@ -1148,7 +1436,7 @@ class ContentAnalyzer:
             if difficulty:
                 tags.append(difficulty)
 
-            return ContentExtract(
+            content = ContentExtract(
                 id=content_id,
                 title=title,
                 summary=summary,
@@ -1209,7 +1497,7 @@ class ContentAnalyzer:
                     "comments": youtube_stats.get("comment_count", 0),
                 }
 
-            return ContentExtract(
+            content = ContentExtract(
                 id=content_id,
                 title=title,
                 summary=summary,
@@ -1274,7 +1562,7 @@ class ContentAnalyzer:
             # Tags
             tags = ["meeting", meeting_type]
 
-            return ContentExtract(
+            content = ContentExtract(
                 id=content_id,
                 title=title,
                 summary=summary,
@@ -1332,7 +1620,7 @@ class ContentAnalyzer:
             tags = dd.get("tags", [])
             tags.insert(0, "deep-dive")
 
-            return ContentExtract(
+            content = ContentExtract(
                 id=content_id,
                 title=title,
                 summary=summary,
@@ -1363,7 +1651,7 @@ class ContentAnalyzer:
                 if isinstance(quote, dict) and quote.get("speaker") in ("Unknown", "", None):
                     quote["speaker"] = speaker_name
 
-            return ContentExtract(
+            content = ContentExtract(
                 id=content_id,
                 title=data.get("title", "Untitled Content"),
                 summary=data.get("summary", ""),
@@ -1384,10 +1672,15 @@ class ContentAnalyzer:
                 source_video=video_path
             )
 
+        content.metadata["extraction"] = extraction_stats
+        if detection:
+            content.metadata["mode_detection"] = detection
+        return content
+
 
 def analyze_video_content(
     transcript: str,
-    frames: List[Tuple[float, str]] = None,
+    frames: list = None,
     provider: str = "openai",
     video_path: str = None,
     source_url: str = None,
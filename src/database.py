@@ -5,12 +5,18 @@ SQLAlchemy models and session management
 
 from sqlalchemy import create_engine, Column, Integer, String, Boolean, DateTime, Float, ForeignKey, Text, JSON, Index, text, UniqueConstraint
 from sqlalchemy.ext.declarative import declarative_base
-from sqlalchemy.orm import sessionmaker, relationship
+from sqlalchemy.orm import sessionmaker, relationship, deferred
 from sqlalchemy import event
+from sqlalchemy.types import TypeDecorator
 from datetime import datetime
 import os
 import uuid
 
+try:
+    from pgvector.sqlalchemy import VECTOR as PgVector
+except ImportError:  # pgvector not installed — embeddings stay JSON everywhere
+    PgVector = None
+
 # Database URL - SQLite for development, can switch to PostgreSQL for production
 DATABASE_URL = os.getenv("DATABASE_URL", "sqlite:///./data/video_memory.db")
 
@@ -48,6 +54,40 @@ SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 # Base class for models
 Base = declarative_base()
 
+# OpenAI text-embedding-3-small requested at 384 dims (see VectorMemory)
+EMBEDDING_DIMS = 384
+
+
+if PgVector is not None:
+    class _PgEmbedding(PgVector):
+        """pgvector column that also reads rows still stored as JSON lists."""
+        cache_ok = True
+
+        def result_processor(self, dialect, coltype):
+            parse = super().result_processor(dialect, coltype)
+
+            def process(value):
+                # Not yet converted by migrations/convert_embeddings_to_vector.py
+                if isinstance(value, list):
+                    return value
+                return parse(value)
+            return process
+
+
+class EmbeddingVector(TypeDecorator):
+    """Embedding column: native ``vector(384)`` on PostgreSQL, JSON list elsewhere.
+
+    Python always sees a plain list of floats, so callers don't care which
+    backend stored it.
+    """
+    impl = JSON
+    cache_ok = True
+
+    def load_dialect_impl(self, dialect):
+        if dialect.name == "postgresql" and PgVector is not None:
+            return dialect.type_descriptor(_PgEmbedding(EMBEDDING_DIMS))
+        return dialect.type_descriptor(JSON())
+
 
 # =============================================
 # User Model
@@ -297,8 +337,9 @@ class ContentVector(Base):
     id = Column(String, primary_key=True)  # content_id from ContentExtract
     user_id = Column(Integer, ForeignKey("users.id"), nullable=False, index=True)
     
-    # Vector embedding (384 dimensions for all-MiniLM-L6-v2)
-    embedding = Column(JSON, nullable=False)
+    # Vector embedding (384 dimensions, pgvector on PostgreSQL); deferred so
+    # loading a ContentVector never pulls it unless asked (undefer/column query)
+    embedding = deferred(Column(EmbeddingVector, nullable=False))
 
     # Content metadata
     title = Column(String(255), nullable=False, index=True)
@@ -307,20 +348,46 @@ class ContentVector(Base):
     summary = Column(Text, nullable=True)
     topics = Column(JSON, nullable=True)
     tags = Column(JSON, nullable=True)
-    collections = Column(JSON, nullable=True)
+    collections = Column(JSON, nullable=True)  # Legacy; membership lives in collection_items
     source_url = Column(String, nullable=True)
     has_transcript = Column(Boolean, default=False)
-    full_content = Column(JSON, nullable=False)  # Full ContentExtract as JSON
+    # ContentExtract as JSON minus the heavy fields in content_bodies (CONTENT_BODY_FIELDS)
+    full_content = Column(JSON, nullable=False)
 
     # File size tracking for storage enforcement
     file_size_bytes = Column(Integer, nullable=True, default=0)
 
-    # Searchable text (for full-text search)
-    searchable_text = Column(Text, nullable=False)
+    # Searchable text (for full-text search); deferred like embedding
+    searchable_text = deferred(Column(Text, nullable=False))
 
     created_at = Column(DateTime, default=datetime.utcnow, index=True)
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
 
+    # Keyset pagination of a user's library: WHERE user_id = ? AND (created_at, id) < (?, ?)
+    __table_args__ = (
+        Index("ix_content_vectors_user_created_id", "user_id", "created_at", "id"),
+    )
+
+
+# =============================================
+# Content Body Model (heavy ContentExtract fields)
+# =============================================
+# Fields stored here instead of in ContentVector.full_content
+CONTENT_BODY_FIELDS = ("transcript", "timeline", "frame_descriptions", "frame_analyses")
+
+
+class ContentBody(Base):
+    __tablename__ = "content_bodies"
+
+    content_id = Column(String, ForeignKey("content_vectors.id", ondelete="CASCADE"), primary_key=True)
+    user_id = Column(Integer, ForeignKey("users.id"), nullable=False, index=True)
+    transcript = Column(Text, nullable=True)
+    timeline = Column(JSON, nullable=True)
+    frame_descriptions = Column(JSON, nullable=True)
+    frame_analyses = Column(JSON, nullable=True)
+
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+
 
 # =============================================
 # Entity Vector Model (for pgvector)
@@ -333,7 +400,7 @@ class EntityVector(Base):
     content_id = Column(String, ForeignKey("content_vectors.id"), nullable=False, index=True)
     entity_name = Column(String(255), nullable=False)
     entity_type = Column(String(50), nullable=True)  # person, place, concept, etc.
-    embedding = Column(JSON, nullable=False)  # Vector(384) with pgvector
+    embedding = Column(EmbeddingVector, nullable=False)  # Vector(384) with pgvector
     
     created_at = Column(DateTime, default=datetime.utcnow)
     
@@ -341,6 +408,24 @@ class EntityVector(Base):
     content = relationship("ContentVector", backref="entities")
 
 
+# =============================================
+# Transcript Passage Model (chunk-level retrieval)
+# =============================================
+class TranscriptPassage(Base):
+    __tablename__ = "transcript_passages"
+
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    user_id = Column(Integer, ForeignKey("users.id"), nullable=False, index=True)
+    content_id = Column(String, ForeignKey("content_vectors.id", ondelete="CASCADE"), nullable=False, index=True)
+    chunk_index = Column(Integer, nullable=False)
+    start_seconds = Column(Float, nullable=True)  # null when the transcript has no timestamps
+    end_seconds = Column(Float, nullable=True)
+    text = Column(Text, nullable=False)
+    embedding = Column(EmbeddingVector, nullable=False)  # Vector(384) with pgvector
+
+    created_at = Column(DateTime, default=datetime.utcnow)
+
+
 # =============================================
 # Collection Model (replaces ChromaDB collections_store)
 # =============================================
@@ -354,6 +439,25 @@ class Collection(Base):
     created_at = Column(DateTime, default=datetime.utcnow)
 
 
+# =============================================
+# Collection Item Model (collection membership)
+# =============================================
+class CollectionItem(Base):
+    __tablename__ = "collection_items"
+
+    collection_id = Column(String, ForeignKey("collections.id", ondelete="CASCADE"), primary_key=True)
+    content_id = Column(String, ForeignKey("content_vectors.id", ondelete="CASCADE"), primary_key=True)
+    user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
+    added_at = Column(DateTime, default=datetime.utcnow)
+
+    # PK (collection_id, content_id) serves collection reads/joins; these serve
+    # per-user listing in added order and "which collections is this content in"
+    __table_args__ = (
+        Index("ix_collection_items_user_collection_added", "user_id", "collection_id", "added_at"),
+        Index("ix_collection_items_content", "content_id"),
+    )
+
+
 # =============================================
 # Chat Session Model (persistent chat history)
 # =============================================
@@ -572,10 +676,102 @@ def _add_column_if_missing(conn, table: str, column: str, col_type: str, default
         print(f"  Added {table}.{column}")
 
 
+def ensure_vector_indexes(conn) -> bool:
+    """Create HNSW cosine indexes on embedding columns that are native pgvector.
+
+    Columns still stored as JSON are skipped (run
+    migrations/convert_embeddings_to_vector.py first). Returns True when
+    every embedding column is a ``vector``.
+    """
+    all_native = True
+    for table in ("content_vectors", "entity_vectors", "transcript_passages"):
+        udt = conn.execute(text(
+            "SELECT udt_name FROM information_schema.columns "
+            "WHERE table_name = :table AND column_name = 'embedding'"
+        ), {"table": table}).scalar()
+        if udt != "vector":
+            all_native = False
+            continue
+        conn.execute(text(
+            f"CREATE INDEX IF NOT EXISTS ix_{table}_embedding_hnsw "
+            f"ON {table} USING hnsw (embedding vector_cosine_ops)"
+        ))
+        conn.commit()
+    return all_native
+
+
+def ensure_fulltext_index(conn):
+    """Lexical index over content_vectors.searchable_text for keyword/hybrid search.
+
+    PostgreSQL gets a GIN index on to_tsvector('english', searchable_text);
+    SQLite gets an FTS5 external-content table kept in sync by triggers.
+
+    The FTS table is keyed on content_vectors' implicit rowid (its primary
+    key is a string), which VACUUM is allowed to renumber. An existing index
+    is therefore integrity-checked against the table on every startup and
+    rebuilt when it no longer matches.
+    """
+    if "postgresql" in DATABASE_URL or "postgres" in DATABASE_URL:
+        conn.execute(text(
+            "CREATE INDEX IF NOT EXISTS ix_content_vectors_fts ON content_vectors "
+            "USING gin (to_tsvector('english'::regconfig, searchable_text))"
+        ))
+        conn.commit()
+        return
+
+    existed = conn.execute(text(
+        "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'content_vectors_fts'"
+    )).fetchone() is not None
+    conn.execute(text(
+        "CREATE VIRTUAL TABLE IF NOT EXISTS content_vectors_fts USING fts5("
+        "searchable_text, content='content_vectors', content_rowid='rowid')"
+    ))
+    conn.execute(text(
+        "CREATE TRIGGER IF NOT EXISTS content_vectors_fts_ai AFTER INSERT ON content_vectors BEGIN "
+        "INSERT INTO content_vectors_fts(rowid, searchable_text) VALUES (new.rowid, new.searchable_text); END"
+    ))
+    conn.execute(text(
+        "CREATE TRIGGER IF NOT EXISTS content_vectors_fts_ad AFTER DELETE ON content_vectors BEGIN "
+        "INSERT INTO content_vectors_fts(content_vectors_fts, rowid, searchable_text) "
+        "VALUES ('delete', old.rowid, old.searchable_text); END"
+    ))
+    conn.execute(text(
+        "CREATE TRIGGER IF NOT EXISTS content_vectors_fts_au AFTER UPDATE OF searchable_text ON content_vectors BEGIN "
+        "INSERT INTO content_vectors_fts(content_vectors_fts, rowid, searchable_text) "
+        "VALUES ('delete', old.rowid, old.searchable_text); "
+        "INSERT INTO content_vectors_fts(rowid, searchable_text) VALUES (new.rowid, new.searchable_text); END"
+    ))
+    conn.commit()
+    rebuild = not existed  # Index rows saved before the FTS table existed
+    if existed:
+        try:
+            conn.execute(text(
+                "INSERT INTO content_vectors_fts(content_vectors_fts, rank) VALUES ('integrity-check', 1)"
+            ))
+        except Exception as e:
+            print(f"Full-text index out of sync with content_vectors ({getattr(e, 'orig', e)}), rebuilding")
+            conn.rollback()
+            rebuild = True
+    if rebuild:
+        conn.execute(text("INSERT INTO content_vectors_fts(content_vectors_fts) VALUES ('rebuild')"))
+    conn.commit()
+
+
 def init_db():
     """Create all database tables"""
     # Ensure data directory exists
     os.makedirs("data", exist_ok=True)
+
+    # Enable pgvector before create_all so new tables get native vector columns
+    if "postgresql" in DATABASE_URL or "postgres" in DATABASE_URL:
+        try:
+            with engine.connect() as conn:
+                conn.execute(text("CREATE EXTENSION IF NOT EXISTS vector"))
+                conn.commit()
+            print("pgvector extension enabled")
+        except Exception as e:
+            print(f"Note: Could not enable pgvector extension (may already exist): {e}")
+
     Base.metadata.create_all(bind=engine)
 
     # Auto-migrate: add columns introduced after initial schema
@@ -607,15 +803,34 @@ def init_db():
             except Exception as e:
                 print(f"Note: Migration {table}.{column}: {e}")
 
-    # Enable pgvector extension if using PostgreSQL
-    if "postgresql" in DATABASE_URL or "postgres" in DATABASE_URL:
+    # Indexes added to existing tables (create_all only creates them for new tables)
+    late_indexes = [
+        "CREATE INDEX IF NOT EXISTS ix_content_vectors_user_created_id "
+        "ON content_vectors (user_id, created_at, id)",
+    ]
+    with engine.connect() as conn:
+        for statement in late_indexes:
+            try:
+                conn.execute(text(statement))
+                conn.commit()
+            except Exception as e:
+                print(f"Note: Could not create index: {e}")
+
+    # Full-text index for keyword / hybrid search
+    try:
+        with engine.connect() as conn:
+            ensure_fulltext_index(conn)
+    except Exception as e:
+        print(f"Note: Could not create full-text index: {e}")
+
+    # ANN indexes for native vector columns (no-op until the JSON migration ran)
+    if ("postgresql" in DATABASE_URL or "postgres" in DATABASE_URL) and PgVector is not None:
         try:
             with engine.connect() as conn:
-                conn.execute(text("CREATE EXTENSION IF NOT EXISTS vector"))
-                conn.commit()
-            print("pgvector extension enabled")
+                if not ensure_vector_indexes(conn):
+                    print("Note: embeddings still stored as JSON — run migrations/convert_embeddings_to_vector.py")
         except Exception as e:
-            print(f"Note: Could not enable pgvector extension (may already exist): {e}")
+            print(f"Note: Could not create vector indexes: {e}")
 
     print("Database initialized successfully")
 
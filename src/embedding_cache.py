@@ -0,0 +1,123 @@
+"""
+Content-addressed embedding cache
+Embeddings keyed by hash(model, dims, text): bounded in-process LRU in front
+of an optional shared Redis tier, so repeated queries skip the API entirely.
+"""
+import base64
+import hashlib
+import threading
+from collections import OrderedDict
+from typing import Dict, List, Optional
+
+import numpy as np
+
+from config import get_config
+from redis_client import get_redis_client
+
+
+class EmbeddingCache:
+    """Two-tier (memory LRU, then Redis) cache of embedding vectors."""
+
+    KEY_PREFIX = "emb:"
+
+    def __init__(self, max_entries: int, redis_ttl: int, use_redis: bool = True):
+        self.max_entries = max_entries
+        self.redis_ttl = redis_ttl
+        self.use_redis = use_redis
+        self._entries: "OrderedDict[str, List[float]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._stats = {"memory_hits": 0, "redis_hits": 0, "misses": 0}
+
+    @staticmethod
+    def make_key(model: str, dims: int, text: str) -> str:
+        digest = hashlib.sha256(f"{model}\x00{dims}\x00{text}".encode("utf-8")).hexdigest()
+        return f"{EmbeddingCache.KEY_PREFIX}{digest}"
+
+    @staticmethod
+    def _encode(embedding: List[float]) -> str:
+        # float32 bytes are ~4x smaller than a JSON list in Redis
+        return base64.b64encode(np.asarray(embedding, dtype=np.float32).tobytes()).decode("ascii")
+
+    @staticmethod
+    def _decode(value: str) -> List[float]:
+        return np.frombuffer(base64.b64decode(value), dtype=np.float32).tolist()
+
+    def get_many(self, keys: List[str]) -> Dict[str, List[float]]:
+        """Return cached embeddings for whichever keys are present."""
+        found = {}
+        with self._lock:
+            for key in keys:
+                if key in self._entries:
+                    self._entries.move_to_end(key)
+                    found[key] = self._entries[key]
+            self._stats["memory_hits"] += len(found)
+
+        missing = [k for k in dict.fromkeys(keys) if k not in found]
+        client = get_redis_client() if missing and self.use_redis else None
+        if client:
+            try:
+                values = client.mget(missing)
+                from_redis = {k: self._decode(v) for k, v in zip(missing, values) if v}
+            except Exception as e:
+                print(f"[EmbeddingCache] Redis get error: {e}")
+                from_redis = {}
+            if from_redis:
+                self._remember(from_redis)
+                found.update(from_redis)
+            with self._lock:
+                self._stats["redis_hits"] += len(from_redis)
+
+        with self._lock:
+            self._stats["misses"] += len([k for k in missing if k not in found])
+        return found
+
+    def put_many(self, items: Dict[str, List[float]]):
+        """Store freshly generated embeddings in both tiers."""
+        if not items:
+            return
+        self._remember(items)
+
+        client = get_redis_client() if self.use_redis else None
+        if client:
+            try:
+                pipe = client.pipeline(transaction=False)
+                for key, embedding in items.items():
+                    pipe.setex(key, self.redis_ttl, self._encode(embedding))
+                pipe.execute()
+            except Exception as e:
+                print(f"[EmbeddingCache] Redis set error: {e}")
+
+    def get_stats(self) -> Dict[str, int]:
+        with self._lock:
+            lookups = sum(self._stats.values())
+            hits = self._stats["memory_hits"] + self._stats["redis_hits"]
+            return {
+                **self._stats,
+                "entries": len(self._entries),
+                "max_entries": self.max_entries,
+                "hit_rate": round(hits / lookups, 3) if lookups else 0.0,
+            }
+
+    def _remember(self, items: Dict[str, List[float]]):
+        with self._lock:
+            for key, embedding in items.items():
+                self._entries[key] = embedding
+                self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+
+_embedding_cache: Optional[EmbeddingCache] = None
+
+
+def get_embedding_cache() -> EmbeddingCache:
+    """Get or create the process-wide embedding cache (singleton)"""
+    global _embedding_cache
+    if _embedding_cache is None:
+        config = get_config()
+        _embedding_cache = EmbeddingCache(
+            max_entries=config.vector.embedding_cache_size,
+            redis_ttl=config.vector.embedding_cache_ttl,
+            use_redis=config.redis.is_configured,
+        )
+    return _embedding_cache
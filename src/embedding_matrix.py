@@ -0,0 +1,240 @@
+"""
+Per-user embedding matrix cache for the non-pgvector search path
+Keeps pre-normalized float32 embeddings in one contiguous matrix per user so
+top-k is a single matrix-vector product instead of a loop over ORM rows.
+"""
+import threading
+from collections import OrderedDict
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+
+from config import get_config
+
+
+def _normalize(vector) -> np.ndarray:
+    vec = np.asarray(vector, dtype=np.float32)
+    norm = np.linalg.norm(vec)
+    return vec / norm if norm else vec
+
+
+class UserMatrix:
+    """Embeddings for one user's content, row-aligned with ids and filter columns."""
+
+    __slots__ = ("ids", "matrix", "content_types", "signature", "_positions")
+
+    def __init__(self, rows: Iterable[Tuple[str, list, Optional[str]]], dims: int, signature=None):
+        rows = list(rows)
+        self.ids: List[str] = [r[0] for r in rows]
+        self.matrix = np.empty((len(rows), dims), dtype=np.float32)
+        for i, row in enumerate(rows):
+            self.matrix[i] = _normalize(row[1])
+        self.content_types = np.array([r[2] or "" for r in rows], dtype=object)
+        self.signature = signature
+        self._positions: Dict[str, int] = {cid: i for i, cid in enumerate(self.ids)}
+
+    def copy(self) -> "UserMatrix":
+        """Independent copy, so updates never touch arrays a reader may be scanning."""
+        clone = UserMatrix.__new__(UserMatrix)
+        clone.ids = list(self.ids)
+        clone.matrix = self.matrix.copy()
+        clone.content_types = self.content_types.copy()
+        clone.signature = self.signature
+        clone._positions = dict(self._positions)
+        return clone
+
+    @property
+    def nbytes(self) -> int:
+        # Matrix dominates; ids/filters are charged a rough per-row overhead
+        return self.matrix.nbytes + len(self.ids) * 200
+
+    def upsert(self, content_id: str, embedding, content_type: Optional[str]):
+        pos = self._positions.get(content_id)
+        vec = _normalize(embedding)
+        if pos is None:
+            self._positions[content_id] = len(self.ids)
+            self.ids.append(content_id)
+            self.matrix = np.vstack([self.matrix, vec[None, :]])
+            self.content_types = np.append(self.content_types, content_type or "")
+        else:
+            self.matrix[pos] = vec
+            self.content_types[pos] = content_type or ""
+
+    def remove(self, content_id: str):
+        pos = self._positions.get(content_id)
+        if pos is None:
+            return
+        del self.ids[pos]
+        self.matrix = np.delete(self.matrix, pos, axis=0)
+        self.content_types = np.delete(self.content_types, pos)
+        self._positions = {cid: i for i, cid in enumerate(self.ids)}
+
+    def top_k(
+        self,
+        query_embedding,
+        k: int,
+        content_type: Optional[str] = None,
+        content_ids: Optional[Iterable[str]] = None,
+    ) -> List[Tuple[str, float]]:
+        """Return [(content_id, cosine_similarity)] best first, optionally within content_ids
+        (e.g. collection members, resolved by the caller with an indexed query)."""
+        n = len(self.ids)
+        if n == 0 or k <= 0:
+            return []
+
+        scores = self.matrix @ _normalize(query_embedding)
+
+        if content_type or content_ids is not None:
+            mask = np.ones(n, dtype=bool)
+            if content_type:
+                mask &= self.content_types == content_type
+            if content_ids is not None:
+                allowed = np.zeros(n, dtype=bool)
+                allowed[[self._positions[cid] for cid in content_ids if cid in self._positions]] = True
+                mask &= allowed
+            scores = np.where(mask, scores, -np.inf)
+            k = min(k, int(mask.sum()))
+            if k == 0:
+                return []
+
+        k = min(k, n)
+        top = np.argpartition(-scores, k - 1)[:k]
+        top = top[np.argsort(-scores[top])]
+        return [(self.ids[i], float(scores[i])) for i in top]
+
+
+class PassageMatrix:
+    """Embeddings for one user's transcript passages, row-aligned with passage and content ids.
+
+    Passage text stays in the database; callers load it for the top-k rows only.
+    """
+
+    __slots__ = ("ids", "content_ids", "matrix", "signature")
+
+    def __init__(self, rows: Iterable[Tuple[int, str, list]], dims: int, signature=None):
+        rows = list(rows)
+        self.ids: List[int] = [r[0] for r in rows]
+        self.content_ids = np.array([r[1] for r in rows], dtype=object)
+        self.matrix = np.empty((len(rows), dims), dtype=np.float32)
+        for i, row in enumerate(rows):
+            self.matrix[i] = _normalize(row[2])
+        self.signature = signature
+
+    @property
+    def nbytes(self) -> int:
+        return self.matrix.nbytes + len(self.ids) * 120
+
+    def top_k(self, query_embedding, k: int, content_ids: Optional[Iterable[str]] = None) -> List[Tuple[int, float]]:
+        """Return [(passage_id, cosine_similarity)] best first, optionally within content_ids."""
+        n = len(self.ids)
+        if n == 0 or k <= 0:
+            return []
+
+        scores = self.matrix @ _normalize(query_embedding)
+
+        if content_ids is not None:
+            mask = np.isin(self.content_ids, np.array(list(content_ids), dtype=object))
+            scores = np.where(mask, scores, -np.inf)
+            k = min(k, int(mask.sum()))
+            if k == 0:
+                return []
+
+        k = min(k, n)
+        top = np.argpartition(-scores, k - 1)[:k]
+        top = top[np.argsort(-scores[top])]
+        return [(self.ids[i], float(scores[i])) for i in top]
+
+
+class EmbeddingMatrixCache:
+    """Byte-bounded LRU of UserMatrix (or PassageMatrix) entries shared by all VectorMemory instances."""
+
+    def __init__(self, max_bytes: int):
+        self.max_bytes = max_bytes
+        self._entries: "OrderedDict[int, UserMatrix]" = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+
+    def get(self, user_id: int, signature) -> Optional[UserMatrix]:
+        """Cached matrix for user, or None when missing or stale."""
+        with self._lock:
+            entry = self._entries.get(user_id)
+            if entry is None:
+                return None
+            if entry.signature != signature:
+                self._drop(user_id)
+                return None
+            self._entries.move_to_end(user_id)
+            return entry
+
+    def put(self, user_id: int, entry: UserMatrix):
+        with self._lock:
+            self._drop(user_id)
+            if entry.nbytes > self.max_bytes:
+                return  # Larger than the whole budget — serve uncached
+            self._entries[user_id] = entry
+            self._bytes += entry.nbytes
+            self._evict()
+
+    def patch(self, user_id: int, apply: Callable[[UserMatrix], None], before, after):
+        """Apply a committed write to a cached user (no-op when not cached).
+
+        `before`/`after` are the signatures read around the write. The patch only
+        applies when the entry still matches `before`; otherwise it may be missing
+        other writers' rows, so it is dropped and rebuilt on the next read. The
+        update goes to a copy that is then swapped in (entries are never mutated
+        while cached, so top_k needs no lock).
+        """
+        with self._lock:
+            entry = self._entries.get(user_id)
+            if entry is None:
+                return
+            if entry.signature != before:
+                self._drop(user_id)
+                return
+            updated = entry.copy()
+            apply(updated)
+            updated.signature = after
+            self._drop(user_id)
+            self._entries[user_id] = updated
+            self._bytes += updated.nbytes
+            self._evict()
+
+    def invalidate(self, user_id: int):
+        with self._lock:
+            self._drop(user_id)
+
+    def get_stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {"users": len(self._entries), "bytes": self._bytes, "max_bytes": self.max_bytes}
+
+    def _drop(self, user_id: int):
+        entry = self._entries.pop(user_id, None)
+        if entry is not None:
+            self._bytes -= entry.nbytes
+
+    def _evict(self):
+        while self._bytes > self.max_bytes and self._entries:
+            _, entry = self._entries.popitem(last=False)
+            self._bytes -= entry.nbytes
+
+
+_matrix_cache: Optional[EmbeddingMatrixCache] = None
+
+
+def get_matrix_cache() -> EmbeddingMatrixCache:
+    """Get or create the process-wide embedding matrix cache (singleton)"""
+    global _matrix_cache
+    if _matrix_cache is None:
+        _matrix_cache = EmbeddingMatrixCache(get_config().vector.matrix_cache_mb * 1024 * 1024)
+    return _matrix_cache
+
+
+_passage_matrix_cache: Optional[EmbeddingMatrixCache] = None
+
+
+def get_passage_matrix_cache() -> EmbeddingMatrixCache:
+    """Get or create the process-wide transcript passage matrix cache (singleton)"""
+    global _passage_matrix_cache
+    if _passage_matrix_cache is None:
+        _passage_matrix_cache = EmbeddingMatrixCache(get_config().vector.passage_matrix_cache_mb * 1024 * 1024)
+    return _passage_matrix_cache
@@ -0,0 +1,208 @@
+"""
+Job progress event bus
+Job updates are published per user over Redis pub/sub, so the API process
+serving a user's event stream hears about jobs running in any worker.
+Without Redis (single-instance mode, jobs run as threads in the API process)
+events are delivered in-process.
+"""
+import asyncio
+import json
+import threading
+import time
+from collections import defaultdict
+from typing import Dict, List, Optional, Set
+
+from config import get_config
+from redis_client import get_redis_client
+
+
+class JobEventSubscription:
+    """One event stream's queue, owned by an asyncio loop.
+
+    Events for the same job are coalesced: a slow client gets the latest
+    state of each job rather than every intermediate update.
+    """
+
+    def __init__(self, user_id: int, loop: asyncio.AbstractEventLoop):
+        self.user_id = user_id
+        self._loop = loop
+        self._pending: Dict[str, dict] = {}
+        self._lock = threading.Lock()
+        self._wake = asyncio.Event()
+
+    def push(self, event: dict):
+        """Queue an event (safe from any thread)"""
+        with self._lock:
+            self._pending[event["id"]] = {**self._pending.get(event["id"], {}), **event}
+        try:
+            self._loop.call_soon_threadsafe(self._wake.set)
+        except RuntimeError:
+            pass  # Loop closed: the stream is going away
+
+    async def next_batch(self, timeout: float) -> List[dict]:
+        """Wait up to timeout seconds for events; [] on timeout"""
+        try:
+            await asyncio.wait_for(self._wake.wait(), timeout)
+        except asyncio.TimeoutError:
+            return []
+        self._wake.clear()
+        with self._lock:
+            events, self._pending = list(self._pending.values()), {}
+        return events
+
+
+class JobEventBus:
+    """Publishes job events and fans them out to this process's subscribers."""
+
+    CHANNEL_PREFIX = "jobs:events:"
+    # Jobs that reached a terminal state, so progress reporters still running
+    # for them (possibly in another process) stop publishing
+    TERMINAL_PREFIX = "jobs:terminal:"
+    TERMINAL_TTL = 86400
+    MAX_LOCAL_TERMINAL = 10000
+
+    def __init__(self, use_redis: bool = True):
+        self.use_redis = use_redis
+        self._subscribers: Dict[int, Set[JobEventSubscription]] = defaultdict(set)
+        self._lock = threading.Lock()
+        self._listener: Optional[threading.Thread] = None
+        self._terminal: Dict[str, None] = {}  # insertion-ordered set, this process's marks
+        self._stats = {"published": 0, "delivered": 0, "publish_errors": 0}
+
+    def publish(self, user_id: int, event: dict):
+        """Send an event ({id, ...job fields}) to every stream of user_id"""
+        event = {k: v for k, v in event.items() if v is not None}
+        client = get_redis_client() if self.use_redis else None
+        with self._lock:
+            self._stats["published"] += 1
+        if client:
+            try:
+                client.publish(f"{self.CHANNEL_PREFIX}{user_id}", json.dumps(event))
+                return
+            except Exception as e:
+                with self._lock:
+                    self._stats["publish_errors"] += 1
+                print(f"[JobEvents] Redis publish error, delivering locally: {e}")
+        self._dispatch(user_id, event)
+
+    def mark_terminal(self, job_id: str):
+        """Record that job_id failed, completed or was cancelled"""
+        with self._lock:
+            self._terminal[job_id] = None
+            while len(self._terminal) > self.MAX_LOCAL_TERMINAL:
+                del self._terminal[next(iter(self._terminal))]
+        client = get_redis_client() if self.use_redis else None
+        if client:
+            try:
+                client.setex(f"{self.TERMINAL_PREFIX}{job_id}", self.TERMINAL_TTL, 1)
+            except Exception as e:
+                print(f"[JobEvents] Redis terminal mark error: {e}")
+
+    def is_terminal(self, job_id: str) -> bool:
+        """Whether mark_terminal() was called for job_id, in any process"""
+        with self._lock:
+            if job_id in self._terminal:
+                return True
+        client = get_redis_client() if self.use_redis else None
+        if client:
+            try:
+                return bool(client.exists(f"{self.TERMINAL_PREFIX}{job_id}"))
+            except Exception:
+                return False
+        return False
+
+    def subscribe(self, user_id: int) -> JobEventSubscription:
+        """Subscribe from a running asyncio loop (the event stream's)"""
+        subscription = JobEventSubscription(user_id, asyncio.get_running_loop())
+        with self._lock:
+            self._subscribers[user_id].add(subscription)
+            if self.use_redis and self._listener is None:
+                self._listener = threading.Thread(target=self._listen, name="job-events", daemon=True)
+                self._listener.start()
+        return subscription
+
+    def unsubscribe(self, subscription: JobEventSubscription):
+        with self._lock:
+            subscribers = self._subscribers.get(subscription.user_id)
+            if subscribers:
+                subscribers.discard(subscription)
+                if not subscribers:
+                    del self._subscribers[subscription.user_id]
+
+    def _dispatch(self, user_id: int, event: dict):
+        with self._lock:
+            subscribers = list(self._subscribers.get(user_id, ()))
+            self._stats["delivered"] += len(subscribers)
+        for subscription in subscribers:
+            subscription.push(event)
+
+    def _listen(self):
+        """One pattern subscription per process, shared by every stream"""
+        while True:
+            client = get_redis_client()
+            if client is None:
+                time.sleep(5)
+                continue
+            pubsub = client.pubsub(ignore_subscribe_messages=True)
+            try:
+                pubsub.psubscribe(f"{self.CHANNEL_PREFIX}*")
+                while True:
+                    message = pubsub.get_message(timeout=1.0)
+                    if not message:
+                        continue
+                    try:
+                        user_id = int(message["channel"].rsplit(":", 1)[1])
+                        event = json.loads(message["data"])
+                    except (ValueError, IndexError, TypeError):
+                        continue
+                    self._dispatch(user_id, event)
+            except Exception as e:
+                print(f"[JobEvents] Redis subscription lost, reconnecting: {e}")
+                time.sleep(2)
+            finally:
+                try:
+                    pubsub.close()
+                except Exception:
+                    pass
+
+    def get_stats(self) -> Dict:
+        with self._lock:
+            return {
+                **self._stats,
+                "transport": "redis" if self.use_redis else "local",
+                "streams": sum(len(s) for s in self._subscribers.values()),
+            }
+
+
+_job_event_bus: Optional[JobEventBus] = None
+
+
+def get_job_event_bus() -> JobEventBus:
+    """Get or create the process-wide job event bus (singleton)"""
+    global _job_event_bus
+    if _job_event_bus is None:
+        _job_event_bus = JobEventBus(use_redis=get_config().redis.is_configured)
+    return _job_event_bus
+
+
+def publish_job_event(user_id: int, event: dict):
+    """Publish a job event; failures never affect the job itself"""
+    try:
+        get_job_event_bus().publish(user_id, event)
+    except Exception as e:
+        print(f"[JobEvents] Publish failed: {e}")
+
+
+def mark_job_terminal(job_id: str):
+    """Flag a job as finished so its progress reporter stops publishing"""
+    try:
+        get_job_event_bus().mark_terminal(job_id)
+    except Exception as e:
+        print(f"[JobEvents] Terminal mark failed: {e}")
+
+
+def is_job_terminal(job_id: str) -> bool:
+    try:
+        return get_job_event_bus().is_terminal(job_id)
+    except Exception:
+        return False
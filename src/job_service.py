@@ -1,13 +1,20 @@
 """
 Job Service - Manages video processing jobs in database
 """
+import re
+import threading
+import time
 from sqlalchemy.orm import Session
 from sqlalchemy import desc, update
 from datetime import datetime
 from typing import Optional, List, Dict
-from database import Job
+from config import get_config
+from database import Job, SessionLocal
+from job_events import is_job_terminal, mark_job_terminal, publish_job_event
 from redis_client import cache_delete
 
+TERMINAL_STATUSES = ("completed", "failed", "cancelled")
+
 
 # Only the columns the /api/jobs list endpoint actually returns.
 # Excludes result (~100KB-1MB), settings (~1-10KB), and error (only needed on fail).
@@ -72,9 +79,16 @@ class JobService:
         db: Session,
         job_id: str,
         progress: float,
-        status: Optional[str] = None
+        status: Optional[str] = None,
+        user_id: Optional[int] = None,
+        skip_terminal: bool = False
     ) -> Optional[Job]:
-        """Update job progress using a targeted UPDATE (avoids loading heavy columns)."""
+        """Update job progress using a targeted UPDATE (avoids loading heavy columns).
+
+        Passing user_id saves the lookup for cache invalidation and the event.
+        With skip_terminal, a job that already failed/completed/was cancelled
+        is left alone (returns None).
+        """
         values = {
             "progress": min(progress, 100.0),
             "updated_at": datetime.utcnow()
@@ -82,18 +96,22 @@ class JobService:
         if status:
             values["status"] = status
 
-        result = db.execute(
-            update(Job).where(Job.id == job_id).values(**values)
-        )
+        query = update(Job).where(Job.id == job_id)
+        if skip_terminal:
+            query = query.where(Job.status.notin_(TERMINAL_STATUSES))
+        result = db.execute(query.values(**values))
         if result.rowcount == 0:
             return None
 
         db.commit()
 
-        # Load lightweight version for cache invalidation
-        job = db.query(Job.user_id).filter(Job.id == job_id).first()
-        if job:
-            cache_delete(f"jobs:user:{job.user_id}")
+        if user_id is None:
+            # Load lightweight version for cache invalidation
+            job = db.query(Job.user_id).filter(Job.id == job_id).first()
+            user_id = job.user_id if job else None
+        if user_id is not None:
+            cache_delete(f"jobs:user:{user_id}")
+            publish_job_event(user_id, {"id": job_id, "status": status, "progress": values["progress"]})
 
         return True
 
@@ -118,11 +136,19 @@ class JobService:
             return None
 
         db.commit()
+        mark_job_terminal(job_id)
 
         # Invalidate cache
         job = db.query(Job.user_id).filter(Job.id == job_id).first()
         if job:
             cache_delete(f"jobs:user:{job.user_id}")
+            publish_job_event(job.user_id, {
+                "id": job_id,
+                "status": values["status"],
+                "progress": values.get("progress"),
+                "error": error,
+                "completed_at": now.isoformat(),
+            })
 
         return True
 
@@ -139,7 +165,9 @@ class JobService:
             return False
 
         db.commit()
+        mark_job_terminal(job_id)
         cache_delete(f"jobs:user:{user_id}")
+        publish_job_event(user_id, {"id": job_id, "status": "cancelled"})
         return True
 
     @staticmethod
@@ -156,3 +184,80 @@ class JobService:
         db.commit()
         cache_delete(f"jobs:user:{user_id}")
         return True
+
+
+class JobProgressReporter:
+    """progress_callback for a running job.
+
+    Every update is published to the user's event streams right away, but
+    only milestones are written to the jobs table: the first update of a
+    phase (the status text without its counters), a jump of db_step points,
+    or the latest state once db_interval seconds have passed since the last
+    write. Phases are remembered rather than compared with the previous
+    update, so two threads reporting interleaved phases (transcription and
+    frame analysis) don't turn every update into a write.
+
+    Once the job is failed, completed or cancelled (flagged through the
+    event bus, or found by a write) the reporter goes quiet. Calls may come
+    from several threads at once and are serialized.
+    """
+
+    # "Analyzing frame 3/12", "Transcribing audio (2/5 segments)" -> same phase
+    _COUNTERS = re.compile(r"[\d/%().]+")
+
+    def __init__(self, job_id: str, user_id: int):
+        config = get_config().progress
+        self.job_id = job_id
+        self.user_id = user_id
+        self.db_interval = config.db_interval
+        self.db_step = config.db_step
+        self.updates = 0
+        self.writes = 0
+        self._stopped = False
+        self._written = None  # (percent, status) of the last write
+        self._written_at = 0.0
+        self._phases = set()
+        self._lock = threading.Lock()
+
+    def __call__(self, percent, status):
+        with self._lock:
+            self._report(percent, status or "processing")
+
+    def _report(self, percent, status):
+        if self._stopped:
+            return
+        self.updates += 1
+
+        phase = self._COUNTERS.sub("", status).strip(" .")
+        now = time.monotonic()
+        last = self._written
+        milestone = (
+            last is None
+            or phase not in self._phases
+            or percent - last[0] >= self.db_step
+            or (now - self._written_at >= self.db_interval and (percent, status) != last)
+        )
+        if not milestone:
+            if is_job_terminal(self.job_id):
+                self._stopped = True
+                return
+            publish_job_event(self.user_id, {"id": self.job_id, "status": status, "progress": percent})
+            return
+
+        db = SessionLocal()
+        try:
+            written = JobService.update_job_progress(
+                db=db, job_id=self.job_id, progress=percent, status=status,
+                user_id=self.user_id, skip_terminal=True,
+            )
+            if written is None:
+                self._stopped = True
+                return
+            self.writes += 1
+            self._phases.add(phase)
+            self._written, self._written_at = (percent, status), now
+        except Exception as e:
+            print(f"[Job {self.job_id}] Progress update failed: {e}")
+            publish_job_event(self.user_id, {"id": self.job_id, "status": status, "progress": percent})
+        finally:
+            db.close()
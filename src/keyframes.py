@@ -0,0 +1,135 @@
+"""
+Keyframe Selection
+Picks which sampled video frames are worth sending to the vision model
+"""
+
+from typing import Dict, Optional, Tuple
+
+import cv2
+import numpy as np
+
+from config import get_config
+
+HASH_BITS = 64
+
+
+def dhash(gray: np.ndarray) -> int:
+    """64-bit difference hash: sign of horizontal gradients on a 9x8 thumbnail"""
+    small = cv2.resize(gray, (9, 8), interpolation=cv2.INTER_AREA)
+    bits = (small[:, 1:] > small[:, :-1]).flatten()
+    return int(np.packbits(bits).view(">u8")[0])
+
+
+def phash(gray: np.ndarray) -> int:
+    """64-bit perceptual hash: low-frequency 8x8 DCT block of a 32x32 thumbnail vs its median"""
+    small = cv2.resize(gray, (32, 32), interpolation=cv2.INTER_AREA).astype(np.float32)
+    low = cv2.dct(small)[:8, :8].flatten()
+    # Skip the DC term when taking the median so overall brightness doesn't dominate
+    bits = low > np.median(low[1:])
+    return int(np.packbits(bits).view(">u8")[0])
+
+
+def hamming(a: int, b: int) -> int:
+    return bin(a ^ b).count("1")
+
+
+def _frame_signature(frame) -> Optional[Tuple[int, int, np.ndarray]]:
+    """(dhash, phash, normalized grey histogram) for a Frame"""
+    # The 320px thumbnail is plenty for hashing and much cheaper to decode
+    gray = cv2.imdecode(np.frombuffer(frame.thumbnail, dtype=np.uint8), cv2.IMREAD_GRAYSCALE)
+    if gray is None:
+        return None
+    hist = cv2.calcHist([gray], [0], None, [32], [0, 256])
+    cv2.normalize(hist, hist)
+    return dhash(gray), phash(gray), hist
+
+
+def select_keyframes(
+    frames: list,
+    budget: Optional[int] = None,
+    hash_distance: Optional[int] = None
+) -> Tuple[list, Dict[float, float]]:
+    """
+    Choose the frames to analyze from a list of sampled frames.
+
+    A frame is dropped as a near-duplicate when both its dHash and pHash are
+    within hash_distance bits of an already kept frame, so a talking head
+    that keeps cutting back to the same shot is analyzed once. If more than
+    `budget` frames survive, the ones with the largest scene change from the
+    previous sample are kept (the first frame always is).
+
+    Args:
+        frames: Frame records from video_processor.extract_frames(), in time order
+        budget: Max frames to keep (defaults to config.video.keyframe_budget; 0 = no limit)
+        hash_distance: Max Hamming distance, in bits, for a near-duplicate
+            (defaults to config.video.keyframe_hash_distance)
+
+    Returns:
+        (kept_frames, reused) where kept_frames keeps the input order and
+        reused maps each dropped timestamp to the kept timestamp whose
+        description should stand in for it
+    """
+    video_config = get_config().video
+    budget = video_config.keyframe_budget if budget is None else budget
+    hash_distance = video_config.keyframe_hash_distance if hash_distance is None else hash_distance
+
+    if len(frames) <= 1:
+        return list(frames), {}
+
+    candidates = []     # (index, scene_score, dhash, phash)
+    kept_hashes = []    # (index, dhash, phash) of candidates so far
+    duplicate_of = {}   # dropped index -> kept index it matched
+    previous_hist = None
+
+    for i, frame in enumerate(frames):
+        signature = _frame_signature(frame)
+        if signature is None:
+            # Can't judge it - let the vision model have a look
+            candidates.append((i, 1.0, None, None))
+            continue
+        d, p, hist = signature
+
+        # Scene change vs the previous sample: the larger of the histogram
+        # distance and the normalized pHash distance
+        if previous_hist is None:
+            scene_score = 1.0
+        else:
+            scene_score = max(
+                cv2.compareHist(previous_hist, hist, cv2.HISTCMP_BHATTACHARYYA),
+                hamming(p, previous_phash) / HASH_BITS
+            )
+        previous_hist, previous_phash = hist, p
+
+        match = None
+        best = HASH_BITS + 1
+        for kept_index, kept_d, kept_p in kept_hashes:
+            dd, pd = hamming(d, kept_d), hamming(p, kept_p)
+            if dd <= hash_distance and pd <= hash_distance and dd + pd < best:
+                match, best = kept_index, dd + pd
+        if match is not None:
+            duplicate_of[i] = match
+            continue
+
+        kept_hashes.append((i, d, p))
+        candidates.append((i, scene_score, d, p))
+
+    if budget and len(candidates) > budget:
+        first, rest = candidates[0], candidates[1:]
+        rest.sort(key=lambda c: c[1], reverse=True)
+        candidates = [first] + rest[:budget - 1]
+    kept = sorted(c[0] for c in candidates)
+    kept_set = set(kept)
+
+    reused = {}
+    for i, frame in enumerate(frames):
+        if i in kept_set:
+            continue
+        source = duplicate_of.get(i)
+        if source not in kept_set:
+            # Dropped for the budget (or its match was): nearest kept frame in time
+            source = min(kept, key=lambda k: abs(frames[k].timestamp - frame.timestamp))
+        reused[frame.timestamp] = frames[source].timestamp
+
+    print(f"[Keyframes] Keeping {len(kept)}/{len(frames)} frames "
+          f"({len(duplicate_of)} near-duplicates, budget {budget or 'none'})")
+    return [frames[i] for i in kept], reused
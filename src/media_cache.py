@@ -0,0 +1,220 @@
+"""
+Media cache index
+Downloaded videos and audio keyed by (source id, kind) in a SQLite index that
+lives next to the files, with LRU eviction against a disk budget.
+"""
+import hashlib
+import os
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Dict, Optional
+
+from config import get_config
+
+MEDIA_KINDS = ("video", "audio")
+
+# Extensions adopted into a new index from files downloaded before it existed.
+# None: either kind (yt-dlp writes {id}.webm for bestaudio too), so probed
+_LEGACY_EXTENSIONS = {".mp4": "video", ".mkv": "video", ".webm": None, ".m4a": "audio", ".opus": "audio"}
+
+
+def media_source_key(url: str) -> str:
+    """Cache key for a source URL: the YouTube video id, else a hash of the URL"""
+    from video_processor import _extract_video_id
+
+    video_id = _extract_video_id(url)
+    if video_id:
+        return video_id
+    return "url-" + hashlib.sha256(url.strip().encode("utf-8")).hexdigest()[:24]
+
+
+def _probe_kind(path: str) -> Optional[str]:
+    """Kind of a media file by its streams: "video", "audio" (audio only) or None if unreadable"""
+    import subprocess
+    from video_processor import get_ffmpeg_path
+
+    try:
+        # No output file: ffmpeg exits non-zero but still lists the streams
+        result = subprocess.run(
+            [get_ffmpeg_path(), "-hide_banner", "-nostdin", "-i", path],
+            capture_output=True, text=True, encoding="utf-8", errors="replace", timeout=30
+        )
+    except (OSError, subprocess.SubprocessError):
+        return None
+    if " Video: " in result.stderr:
+        return "video"
+    if " Audio: " in result.stderr:
+        return "audio"
+    return None
+
+
+class MediaCache:
+    """Index of downloaded media files in one directory.
+
+    Entries are only inserted once a download has completed and been moved
+    into place, so a lookup never returns a partial file. Each lookup bumps
+    last_access; when the indexed total exceeds the budget, least recently
+    used files are deleted. Entries used within `protect_seconds` are never
+    evicted, since a running job may still be reading them.
+
+    The index is a SQLite file, so the API and worker processes sharing a
+    disk see the same entries.
+    """
+
+    INDEX_NAME = ".media_index.sqlite3"
+
+    def __init__(self, directory: str, max_bytes: int, protect_seconds: int = 3600):
+        self.directory = Path(directory)
+        self.max_bytes = max_bytes
+        self.protect_seconds = protect_seconds
+        self._lock = threading.Lock()
+        self._stats = {"hits": 0, "misses": 0, "inserts": 0, "evictions": 0}
+
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self._index_path = str(self.directory / self.INDEX_NAME)
+        with self._connect() as conn:
+            # WAL lets readers in other processes proceed during a write
+            conn.execute("PRAGMA journal_mode=WAL")
+            created = conn.execute(
+                "SELECT name FROM sqlite_master WHERE type = 'table' AND name = 'media'"
+            ).fetchone() is None
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS media ("
+                " source_id TEXT NOT NULL, kind TEXT NOT NULL, path TEXT NOT NULL,"
+                " size_bytes INTEGER NOT NULL, created_at REAL NOT NULL, last_access REAL NOT NULL,"
+                " PRIMARY KEY (source_id, kind))"
+            )
+            conn.execute("CREATE INDEX IF NOT EXISTS ix_media_last_access ON media (last_access)")
+        if created:
+            self._adopt_existing()
+
+    @contextmanager
+    def _connect(self):
+        """Short-lived connection; commits on success, always closes"""
+        conn = sqlite3.connect(self._index_path, timeout=30)
+        try:
+            with conn:
+                yield conn
+        finally:
+            conn.close()
+
+    def _adopt_existing(self):
+        """Index files downloaded before the index existed (named {id}.{ext})"""
+        now = time.time()
+        rows = []
+        for entry in os.scandir(self.directory):
+            ext = os.path.splitext(entry.name)[1].lower()
+            # Leading underscore: transcriber temp files (_audio_*, _speech_*)
+            if entry.is_file() and ext in _LEGACY_EXTENSIONS and not entry.name.startswith("_"):
+                kind = _LEGACY_EXTENSIONS[ext] or _probe_kind(entry.path)
+                if kind is None:
+                    continue
+                stat = entry.stat()
+                rows.append((
+                    os.path.splitext(entry.name)[0], kind, entry.path,
+                    stat.st_size, stat.st_mtime, min(stat.st_mtime, now)
+                ))
+        if rows:
+            with self._connect() as conn:
+                # Newest file wins when several share an id and kind
+                rows.sort(key=lambda r: r[4])
+                conn.executemany("INSERT OR REPLACE INTO media VALUES (?, ?, ?, ?, ?, ?)", rows)
+            print(f"[MediaCache] Indexed {len(rows)} existing files in {self.directory}")
+
+    def lookup(self, source_id: str, kind: str) -> Optional[str]:
+        """Path of the cached file for (source_id, kind), or None"""
+        with self._connect() as conn:
+            row = conn.execute(
+                "SELECT path FROM media WHERE source_id = ? AND kind = ?", (source_id, kind)
+            ).fetchone()
+            if row and os.path.exists(row[0]):
+                conn.execute(
+                    "UPDATE media SET last_access = ? WHERE source_id = ? AND kind = ?",
+                    (time.time(), source_id, kind)
+                )
+            elif row:
+                # Deleted behind our back
+                conn.execute("DELETE FROM media WHERE source_id = ? AND kind = ?", (source_id, kind))
+                row = None
+        with self._lock:
+            self._stats["hits" if row else "misses"] += 1
+        return row[0] if row else None
+
+    def insert(self, source_id: str, kind: str, path: str) -> str:
+        """Record a completed download, then evict if over budget. Returns path."""
+        if kind not in MEDIA_KINDS:
+            raise ValueError(f"kind must be one of {MEDIA_KINDS}")
+        now = time.time()
+        with self._connect() as conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO media VALUES (?, ?, ?, ?, ?, ?)",
+                (source_id, kind, str(path), os.path.getsize(path), now, now)
+            )
+        with self._lock:
+            self._stats["inserts"] += 1
+        self.evict()
+        return path
+
+    def evict(self) -> int:
+        """Delete least recently used files until the total fits the budget"""
+        if not self.max_bytes:
+            return 0
+        evicted = 0
+        with self._connect() as conn:
+            total = conn.execute("SELECT COALESCE(SUM(size_bytes), 0) FROM media").fetchone()[0]
+            if total <= self.max_bytes:
+                return 0
+            candidates = conn.execute(
+                "SELECT source_id, kind, path, size_bytes FROM media "
+                "WHERE last_access < ? ORDER BY last_access",
+                (time.time() - self.protect_seconds,)
+            ).fetchall()
+            for source_id, kind, path, size in candidates:
+                if total <= self.max_bytes:
+                    break
+                try:
+                    os.remove(path)
+                except FileNotFoundError:
+                    pass
+                except OSError as e:
+                    print(f"[MediaCache] Could not evict {path}: {e}")
+                    continue
+                conn.execute("DELETE FROM media WHERE source_id = ? AND kind = ?", (source_id, kind))
+                total -= size
+                evicted += 1
+        if evicted:
+            print(f"[MediaCache] Evicted {evicted} files, {total / 1024 / 1024:.0f}MB cached")
+            with self._lock:
+                self._stats["evictions"] += evicted
+        return evicted
+
+    def get_stats(self) -> Dict[str, int]:
+        with self._connect() as conn:
+            entries, total = conn.execute(
+                "SELECT COUNT(*), COALESCE(SUM(size_bytes), 0) FROM media"
+            ).fetchone()
+        with self._lock:
+            return {**self._stats, "entries": entries, "bytes": total, "max_bytes": self.max_bytes}
+
+
+_media_caches: Dict[str, MediaCache] = {}
+_media_caches_lock = threading.Lock()
+
+
+def get_media_cache(directory: str = "data/videos") -> MediaCache:
+    """Get or create the media cache for a download directory (one per directory)"""
+    key = os.path.abspath(directory)
+    with _media_caches_lock:
+        cache = _media_caches.get(key)
+        if cache is None:
+            config = get_config().video
+            cache = MediaCache(
+                directory,
+                max_bytes=config.media_cache_mb * 1024 * 1024,
+                protect_seconds=config.media_cache_protect_seconds,
+            )
+            _media_caches[key] = cache
+        return cache
@@ -0,0 +1,237 @@
+"""
+Local content mode classifier
+Multinomial Naive Bayes over the transcript preview, trained from the modes
+the LLM detected for stored content (ContentVector.mode where
+metadata.mode_detection.path is "llm"), so auto mode can skip the LLM
+detection call. Predictions under the confidence floor go to the LLM.
+"""
+import json
+import math
+import re
+import threading
+import time
+from collections import Counter, defaultdict
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from config import get_config
+from redis_client import get_redis_client
+
+# Modes detect_mode can return (deepdive is only ever chosen explicitly)
+CLASSIFIER_MODES = ("general", "recipe", "learn", "creator", "meeting")
+
+# Same preview the LLM detection prompt sees
+PREVIEW_CHARS = 2000
+
+# Vocabulary size (terms by document frequency)
+MAX_FEATURES = 20000
+
+# Naive Bayes treats every word as independent evidence, so on a full
+# preview (~330 tokens) nearly every posterior is ~1.0. Scaling the
+# likelihood down to at most this many tokens tempers the confidence enough
+# to threshold on (MODE_CLASSIFIER_CONFIDENCE)
+EVIDENCE_TOKENS = 150
+
+# Seconds to wait before retrying after the model couldn't be loaded
+RETRY_SECONDS = 300
+
+_TOKEN = re.compile(r"[^\W\d_]{2,}")
+_STOPWORDS = frozenset("""
+    the and to of a in is it that you this for on with be are was as at so we
+    have but not or they he she what all can if my your just do there from
+    an by about me our one will like know get go up out now then them his her
+    speaker
+""".split())
+
+
+def tokenize(text: str) -> List[str]:
+    return [t for t in _TOKEN.findall(text.lower()) if t not in _STOPWORDS]
+
+
+class ModeClassifier:
+    """Process-wide mode classifier, retrained from the database periodically.
+
+    The trained model is shared through Redis, so forked job processes and
+    API replicas load it instead of each re-reading the content tables.
+    """
+
+    REDIS_KEY = "modeclf:model"
+
+    def __init__(self, min_confidence: float, min_docs: int, max_docs: int,
+                 refresh_seconds: int, use_redis: bool = True):
+        self.min_confidence = min_confidence
+        self.min_docs = min_docs
+        self.max_docs = max_docs
+        self.refresh_seconds = refresh_seconds
+        self.use_redis = use_redis
+        self._model: Optional[dict] = None
+        self._vocab: frozenset = frozenset()
+        self._next_load = 0.0
+        self._lock = threading.Lock()
+        self._stats = {"predictions": 0, "accepted": 0, "unavailable": 0}
+
+    @staticmethod
+    def fit(documents: Iterable[Tuple[str, str]]) -> dict:
+        """
+        Train from (text, mode) pairs.
+
+        Returns:
+            model dict: docs (count per mode), priors (log), log_probs
+            (mode -> term -> log P(term|mode) for terms seen in that mode) and
+            unseen (mode -> log P of a vocabulary term never seen in it)
+        """
+        doc_counts = Counter()
+        term_counts = defaultdict(Counter)
+        doc_freq = Counter()
+        for text, mode in documents:
+            if mode not in CLASSIFIER_MODES or not text:
+                continue
+            counts = Counter(tokenize(text[:PREVIEW_CHARS]))
+            if not counts:
+                continue
+            doc_counts[mode] += 1
+            term_counts[mode].update(counts)
+            doc_freq.update(counts.keys())
+
+        vocab = [term for term, _ in doc_freq.most_common(MAX_FEATURES)]
+        total_docs = sum(doc_counts.values())
+        model = {"docs": dict(doc_counts), "priors": {}, "log_probs": {}, "unseen": {}}
+        for mode, n_docs in doc_counts.items():
+            counts = term_counts[mode]
+            # Laplace smoothing over the vocabulary
+            denominator = sum(counts[t] for t in vocab) + len(vocab)
+            model["priors"][mode] = math.log(n_docs / total_docs)
+            model["log_probs"][mode] = {
+                t: round(math.log((counts[t] + 1) / denominator), 4) for t in vocab if counts[t]
+            }
+            model["unseen"][mode] = math.log(1 / denominator)
+        return model
+
+    def _train_from_database(self) -> dict:
+        from sqlalchemy import func
+        from database import SessionLocal, ContentVector, ContentBody
+
+        db = SessionLocal()
+        try:
+            rows = (
+                db.query(ContentVector.mode, func.substr(ContentBody.transcript, 1, PREVIEW_CHARS))
+                .join(ContentBody, ContentBody.content_id == ContentVector.id)
+                .filter(
+                    ContentVector.mode.in_(CLASSIFIER_MODES),
+                    ContentBody.transcript.isnot(None),
+                    # Only LLM labels: the classifier's own accepted predictions would
+                    # feed its errors back in, and forced modes aren't detections
+                    ContentVector.full_content[("metadata", "mode_detection", "path")].as_string() == "llm",
+                )
+                .order_by(ContentVector.created_at.desc())
+                .limit(self.max_docs)
+                .all()
+            )
+        finally:
+            db.close()
+        return self.fit((text, mode) for mode, text in rows)
+
+    def _load(self):
+        """Take the shared model from Redis, or train one and publish it"""
+        model = None
+        client = get_redis_client() if self.use_redis else None
+        if client:
+            try:
+                raw = client.get(self.REDIS_KEY)
+                model = json.loads(raw) if raw else None
+            except Exception as e:
+                print(f"[ModeClassifier] Redis get error: {e}")
+        if model is None:
+            start = time.perf_counter()
+            model = self._train_from_database()
+            print(f"[ModeClassifier] Trained on {sum(model['docs'].values())} documents "
+                  f"{model['docs']} in {time.perf_counter() - start:.1f}s")
+            if client:
+                try:
+                    client.setex(self.REDIS_KEY, self.refresh_seconds, json.dumps(model))
+                except Exception as e:
+                    print(f"[ModeClassifier] Redis set error: {e}")
+
+        self._model = model
+        self._vocab = frozenset(t for terms in model["log_probs"].values() for t in terms)
+
+    def _current_model(self) -> Optional[dict]:
+        with self._lock:
+            if time.time() >= self._next_load:
+                try:
+                    self._load()
+                    self._next_load = time.time() + self.refresh_seconds
+                except Exception as e:
+                    # Keep whatever model we had; retry later
+                    print(f"[ModeClassifier] Load failed: {e}")
+                    self._next_load = time.time() + RETRY_SECONDS
+            model = self._model
+        if not model or sum(model["docs"].values()) < self.min_docs or len(model["docs"]) < 2:
+            return None
+        return model
+
+    def preload(self):
+        """Load or train the model now instead of in the first auto-mode job"""
+        self._current_model()
+
+    def classify(self, transcript: str) -> Optional[dict]:
+        """
+        Predict the mode of a transcript from its preview.
+
+        Returns:
+            {mode, confidence, accepted} where accepted means confidence is at
+            least min_confidence, or None when there's no usable model (too
+            few labelled documents) or no known words in the preview
+        """
+        model = self._current_model()
+        tokens = [t for t in tokenize(transcript[:PREVIEW_CHARS]) if t in self._vocab] if model else []
+        if not tokens:
+            with self._lock:
+                self._stats["unavailable"] += 1
+            return None
+
+        counts = Counter(tokens)
+        scale = min(len(tokens), EVIDENCE_TOKENS) / len(tokens)
+        scores = {}
+        for mode, log_probs in model["log_probs"].items():
+            unseen = model["unseen"][mode]
+            likelihood = sum(n * log_probs.get(t, unseen) for t, n in counts.items())
+            scores[mode] = model["priors"][mode] + scale * likelihood
+
+        best = max(scores, key=scores.get)
+        # Softmax over the scaled scores
+        total = sum(math.exp(s - scores[best]) for s in scores.values())
+        confidence = 1 / total
+        accepted = confidence >= self.min_confidence
+        with self._lock:
+            self._stats["predictions"] += 1
+            self._stats["accepted"] += int(accepted)
+        return {"mode": best, "confidence": round(confidence, 3), "accepted": accepted}
+
+    def get_stats(self) -> Dict:
+        with self._lock:
+            model = self._model
+            predictions = self._stats["predictions"]
+            return {
+                **self._stats,
+                "acceptance_rate": round(self._stats["accepted"] / predictions, 3) if predictions else 0.0,
+                "min_confidence": self.min_confidence,
+                "trained_docs": model["docs"] if model else {},
+            }
+
+
+_mode_classifier: Optional[ModeClassifier] = None
+
+
+def get_mode_classifier() -> ModeClassifier:
+    """Get or create the process-wide mode classifier (singleton)"""
+    global _mode_classifier
+    if _mode_classifier is None:
+        config = get_config()
+        _mode_classifier = ModeClassifier(
+            min_confidence=config.extraction.mode_classifier_confidence,
+            min_docs=config.extraction.mode_classifier_min_docs,
+            max_docs=config.extraction.mode_classifier_max_docs,
+            refresh_seconds=config.extraction.mode_classifier_refresh,
+            use_redis=config.redis.is_configured,
+        )
+    return _mode_classifier
@@ -5,7 +5,7 @@ Uses LLM (OpenAI or Ollama) to extract structured recipe data from video content
 
 import json
 import os
-from typing import List, Tuple, Optional
+from typing import List, Optional
 from dataclasses import dataclass, asdict
 from datetime import datetime
 
@@ -95,14 +95,15 @@ class RecipeAnalyzer:
         else:
             raise ValueError(f"Unknown provider: {provider}")
 
-    def analyze_frames(self, frames: List[Tuple[float, str]]) -> List[str]:
+    def analyze_frames(self, frames: list) -> List[str]:
         """
-        Analyze video frames using vision model
+        Analyze video frames (video_processor.Frame records) using vision model
         Returns descriptions of what's happening in each frame
         """
         descriptions = []
 
-        for timestamp, base64_image in frames:
+        for frame in frames:
+            timestamp, base64_image = frame.timestamp, frame.base64
             if self.provider == "openai":
                 response = self.client.chat.completions.create(
                     model="gpt-4o-mini",  # Vision-capable model
@@ -216,7 +217,7 @@ class RecipeAnalyzer:
 
 def analyze_video_for_recipe(
     transcript: str,
-    frames: List[Tuple[float, str]] = None,
+    frames: list = None,
     provider: str = "openai",
     video_path: str = None,
     source_url: str = None
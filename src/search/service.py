@@ -5,9 +5,9 @@ Advanced search across content, notes, and tags
 
 from typing import List, Optional, Dict, Any
 from sqlalchemy.orm import Session
-from sqlalchemy import and_, or_
+from sqlalchemy import and_, distinct, exists, func
 
-from database import Note, UserTag, ContentTag
+from database import Bookmark, ContentTag, ContentVector, Note, UserTag
 from tags.service import TagsService
 
 
@@ -25,7 +25,9 @@ class SearchService:
         has_notes: Optional[bool] = None,
         has_bookmarks: Optional[bool] = None,
         n_results: int = 20,
-        match_all_tags: bool = False
+        match_all_tags: bool = False,
+        search_mode: str = "semantic",
+        weights: Optional[Dict[str, float]] = None
     ) -> List[Dict[str, Any]]:
         """
         Search for content with multiple filters.
@@ -41,77 +43,116 @@ class SearchService:
             has_bookmarks: Filter to contents with bookmarks
             n_results: Maximum results
             match_all_tags: If True, content must have ALL tags
+            search_mode: "semantic", "keyword" (no embedding call) or "hybrid"
+            weights: Hybrid rank-fusion weights {"vector": ..., "lexical": ...}
 
         Returns:
-            List of matching content
+            List of matching content (card fields, plus user_tags and note_count)
         """
-        # Start with all user's content
-        all_content = content_memory.list_all(user_id=user_id)
-        content_ids = {c["id"] for c in all_content}
+        filters = SearchService._content_filters(
+            db, user_id, tag_ids, content_type, has_notes, has_bookmarks, match_all_tags
+        )
 
-        # Filter by tags if specified
-        if tag_ids:
-            tagged_ids = set(TagsService.get_contents_by_tags(
-                db, user_id, tag_ids, match_all=match_all_tags
-            ))
-            content_ids &= tagged_ids
+        if query and query.strip():
+            # Tag/note/bookmark filters narrow the candidate set in SQL first, so
+            # ranking only ever sees rows that can be returned (no over-fetch)
+            candidate_ids = None
+            if tag_ids or has_notes is not None or has_bookmarks is not None:
+                candidate_ids = [
+                    row.id for row in db.query(ContentVector.id).filter(*filters).all()
+                ]
+            results = content_memory.search(
+                query=query,
+                user_id=user_id,
+                n_results=n_results,
+                content_type=content_type,
+                mode=search_mode,
+                weights=weights,
+                content_ids=candidate_ids,
+                full=False
+            )
+        else:
+            # No text query - newest filtered content, card fields only
+            page_ids = [
+                row.id for row in db.query(ContentVector.id).filter(*filters)
+                .order_by(ContentVector.created_at.desc()).limit(n_results).all()
+            ]
+            results = content_memory.get_cards(page_ids, user_id=user_id)
+
+        SearchService._attach_tags_and_note_counts(db, user_id, results)
+        return results
+
+    @staticmethod
+    def _content_filters(
+        db: Session,
+        user_id: int,
+        tag_ids: Optional[List[int]],
+        content_type: Optional[str],
+        has_notes: Optional[bool],
+        has_bookmarks: Optional[bool],
+        match_all_tags: bool
+    ) -> list:
+        """SQL filter clauses on ContentVector for the search filters"""
+        filters = [ContentVector.user_id == user_id]
 
-        # Filter by content type
         if content_type:
-            type_ids = {
-                c["id"] for c in all_content
-                if c.get("content_type") == content_type
-            }
-            content_ids &= type_ids
+            filters.append(ContentVector.content_type == content_type)
+
+        if tag_ids:
+            if match_all_tags:
+                tagged = db.query(ContentTag.content_id).filter(
+                    ContentTag.user_id == user_id,
+                    ContentTag.tag_id.in_(tag_ids)
+                ).group_by(ContentTag.content_id).having(
+                    func.count(distinct(ContentTag.tag_id)) == len(set(tag_ids))
+                )
+                filters.append(ContentVector.id.in_(tagged))
+            else:
+                filters.append(exists().where(
+                    ContentTag.content_id == ContentVector.id,
+                    ContentTag.user_id == user_id,
+                    ContentTag.tag_id.in_(tag_ids)
+                ))
 
-        # Filter by has_notes
         if has_notes is not None:
-            notes_content_ids = set(
-                db.query(Note.content_id).filter(Note.user_id == user_id).distinct().all()
+            noted = exists().where(Note.content_id == ContentVector.id, Note.user_id == user_id)
+            filters.append(noted if has_notes else ~noted)
+
+        if has_bookmarks is not None:
+            bookmarked = exists().where(
+                Bookmark.content_id == ContentVector.id, Bookmark.user_id == user_id
             )
-            notes_content_ids = {n[0] for n in notes_content_ids}
+            filters.append(bookmarked if has_bookmarks else ~bookmarked)
 
-            if has_notes:
-                content_ids &= notes_content_ids
-            else:
-                content_ids -= notes_content_ids
+        return filters
 
-        # If there's a text query, use semantic search
-        if query and query.strip():
-            search_results = content_memory.search(
-                query=query,
-                user_id=user_id,
-                n_results=n_results * 2,  # Get more for filtering
-                content_type=content_type
+    @staticmethod
+    def _attach_tags_and_note_counts(db: Session, user_id: int, results: List[Dict[str, Any]]):
+        """Add user_tags and note_count to a result page with two grouped queries"""
+        if not results:
+            return
+        page_ids = [r["id"] for r in results]
+
+        tags_by_content: Dict[str, List[Dict[str, Any]]] = {}
+        tag_rows = db.query(
+            ContentTag.content_id, UserTag.id, UserTag.name, UserTag.color
+        ).join(UserTag, UserTag.id == ContentTag.tag_id).filter(
+            ContentTag.user_id == user_id,
+            ContentTag.content_id.in_(page_ids)
+        ).order_by(ContentTag.id).all()
+        for row in tag_rows:
+            tags_by_content.setdefault(row.content_id, []).append(
+                {"id": row.id, "name": row.name, "color": row.color}
             )
 
-            # Filter to content_ids that passed other filters
-            results = [
-                r for r in search_results
-                if r.get("id") in content_ids
-            ][:n_results]
-        else:
-            # No text query - just return filtered content
-            results = [
-                c for c in all_content
-                if c["id"] in content_ids
-            ][:n_results]
+        note_counts = dict(db.query(Note.content_id, func.count(Note.id)).filter(
+            Note.user_id == user_id,
+            Note.content_id.in_(page_ids)
+        ).group_by(Note.content_id).all())
 
-        # Enrich results with tag info
         for result in results:
-            content_tags = TagsService.get_content_tags(db, user_id, result["id"])
-            result["user_tags"] = [
-                {"id": t.id, "name": t.name, "color": t.color}
-                for t in content_tags.tags
-            ]
-
-            # Add note count
-            note_count = db.query(Note).filter(
-                and_(Note.user_id == user_id, Note.content_id == result["id"])
-            ).count()
-            result["note_count"] = note_count
-
-        return results
+            result["user_tags"] = tags_by_content.get(result["id"], [])
+            result["note_count"] = note_counts.get(result["id"], 0)
 
     @staticmethod
     def search_in_notes(
@@ -185,30 +226,27 @@ class SearchService:
         return suggestions
 
     @staticmethod
-    def get_content_types(content_memory, user_id: int) -> List[str]:
+    def get_content_types(db: Session, user_id: int) -> List[str]:
         """Get all unique content types for a user"""
-        all_content = content_memory.list_all(user_id=user_id)
-        content_types = set()
-        for c in all_content:
-            ct = c.get("content_type")
-            if ct:
-                content_types.add(ct)
-        return sorted(list(content_types))
+        rows = db.query(ContentVector.content_type).filter(
+            ContentVector.user_id == user_id,
+            ContentVector.content_type.isnot(None)
+        ).distinct().all()
+        return sorted(row[0] for row in rows if row[0])
 
     @staticmethod
     def get_search_stats(
-        content_memory,
         db: Session,
         user_id: int
     ) -> Dict[str, Any]:
         """Get statistics for the user's content"""
-        all_content = content_memory.list_all(user_id=user_id)
-
         # Count by content type
-        type_counts = {}
-        for c in all_content:
-            ct = c.get("content_type", "unknown")
-            type_counts[ct] = type_counts.get(ct, 0) + 1
+        type_counts = {
+            (ct or "unknown"): count
+            for ct, count in db.query(
+                ContentVector.content_type, func.count(ContentVector.id)
+            ).filter(ContentVector.user_id == user_id).group_by(ContentVector.content_type).all()
+        }
 
         # Get tag stats
         tags = TagsService.get_all_tags(db, user_id)
@@ -221,7 +259,7 @@ class SearchService:
         total_notes = db.query(Note).filter(Note.user_id == user_id).count()
 
         return {
-            "total_content": len(all_content),
+            "total_content": sum(type_counts.values()),
             "content_by_type": type_counts,
             "total_tags": len(tags),
             "tag_usage": tag_stats[:10],  # Top 10 tags
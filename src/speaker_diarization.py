@@ -4,8 +4,13 @@ Identifies who is speaking when using pyannote-audio
 """
 
 import os
+import threading
+import time
+from collections import defaultdict
 from pathlib import Path
-from typing import List, Dict, Optional
+from typing import List, Dict, Optional, Tuple
+
+from config import get_config
 try:
         import torch
         TORCH_AVAILABLE = True
@@ -128,30 +133,225 @@ class SpeakerDiarizer:
         Returns:
             Merged segments [{start, end, text, speaker}]
         """
-        merged = []
-        
-        for t_seg in transcript_segments:
-            t_start = t_seg.get("start", 0)
-            t_end = t_seg.get("end", t_start)
-            t_mid = (t_start + t_end) / 2
-            
-            # Find which speaker is talking at the midpoint of this segment
-            speaker = "Unknown"
-            for s_seg in speaker_segments:
-                if s_seg["start"] <= t_mid <= s_seg["end"]:
-                    speaker = s_seg["speaker"]
-                    break
-            
-            merged.append({
-                "start": t_start,
-                "end": t_end,
-                "text": t_seg.get("text", ""),
-                "speaker": speaker
-            })
-        
+        merged, _ = merge_speakers(transcript_segments, speaker_segments)
         return merged
 
 
+def merge_speakers(
+    transcript_segments: List[Dict],
+    speaker_segments: List[Dict]
+) -> Tuple[List[Dict], Dict[str, Dict]]:
+    """
+    Label each transcript segment with the speaker it overlaps most, and
+    collect per-speaker statistics in the same pass.
+
+    Both lists are walked once in time order. Diarization segments enter an
+    active set when they start before the current transcript segment ends,
+    and leave it once they end before a transcript segment starts (transcript
+    starts only increase), so the cost is O((N + M) log(N + M)) for sorting
+    plus the overlapping pairs, instead of N * M.
+
+    A zero-length transcript segment takes the speaker whose turn contains
+    it; a segment no speaker overlaps is "Unknown".
+
+    Returns:
+        (merged, stats) where merged is [{start, end, text, speaker}] in the
+        input order and stats maps speaker -> {talk_time, share, turns,
+        longest_turn, segments}. Talk time comes from the diarization; turns
+        are runs of consecutive transcript segments with the same speaker.
+    """
+    order = sorted(range(len(transcript_segments)), key=lambda i: transcript_segments[i].get("start", 0))
+    turns_by_start = sorted(speaker_segments, key=lambda s: s["start"])
+
+    merged = [None] * len(transcript_segments)
+    talk_time = defaultdict(float)
+    turn_stats = defaultdict(lambda: {"turns": 0, "longest_turn": 0.0, "segments": 0})
+    active = []
+    next_turn = 0
+    run_speaker, run_start, run_end = None, 0.0, 0.0  # current run of same-speaker segments
+
+    def close_run():
+        if run_speaker not in (None, "Unknown"):
+            entry = turn_stats[run_speaker]
+            entry["turns"] += 1
+            entry["longest_turn"] = max(entry["longest_turn"], run_end - run_start)
+
+    for i in order:
+        t_seg = transcript_segments[i]
+        t_start = t_seg.get("start", 0)
+        t_end = t_seg.get("end", t_start)
+        span_end = max(t_end, t_start)
+
+        while next_turn < len(turns_by_start) and turns_by_start[next_turn]["start"] <= span_end:
+            turn = turns_by_start[next_turn]
+            active.append(turn)
+            talk_time[turn["speaker"]] += turn["end"] - turn["start"]
+            next_turn += 1
+        active = [turn for turn in active if turn["end"] >= t_start]
+
+        overlaps = {}
+        for turn in active:
+            overlap = min(span_end, turn["end"]) - max(t_start, turn["start"])
+            if overlap > 0 or (overlap == 0 and span_end == t_start):
+                overlaps[turn["speaker"]] = overlaps.get(turn["speaker"], 0) + overlap
+        # Ties go to the speaker whose turn started first
+        speaker = max(overlaps, key=overlaps.get) if overlaps else "Unknown"
+
+        merged[i] = {
+            "start": t_start,
+            "end": t_end,
+            "text": t_seg.get("text", ""),
+            "speaker": speaker
+        }
+
+        if speaker != run_speaker:
+            close_run()
+            run_speaker, run_start, run_end = speaker, t_start, span_end
+        else:
+            run_end = max(run_end, span_end)
+        if speaker != "Unknown":
+            turn_stats[speaker]["segments"] += 1
+    close_run()
+
+    for turn in turns_by_start[next_turn:]:
+        talk_time[turn["speaker"]] += turn["end"] - turn["start"]
+
+    total_talk = sum(talk_time.values())
+    stats = {}
+    for speaker, seconds in talk_time.items():
+        entry = turn_stats[speaker]
+        stats[speaker] = {
+            "talk_time": round(seconds, 2),
+            "share": round(seconds / total_talk, 3) if total_talk else 0.0,
+            "turns": entry["turns"],
+            "longest_turn": round(entry["longest_turn"], 2),
+            "segments": entry["segments"],
+        }
+
+    return merged, stats
+
+
+class DiarizerPool:
+    """Loaded diarization pipelines shared by every job in the process.
+
+    Loading pyannote takes from seconds to a minute, so pipelines are loaded
+    once per process and reused. A pipeline isn't safe to run from two
+    threads at once: each job checks one out, and if all `size` are busy it
+    waits for one to come back. Pipelines load on first demand, or up front
+    with preload().
+    """
+
+    def __init__(self, size: int = 1):
+        self.size = max(1, size)
+        self._idle: List[SpeakerDiarizer] = []
+        self._created = 0
+        self._in_use = 0
+        self._cond = threading.Condition()
+        self._stats = {
+            "loads": 0, "load_seconds": 0.0, "jobs": 0,
+            "wait_seconds": 0.0, "diarize_seconds": 0.0, "failures": 0,
+        }
+
+    def _load(self) -> SpeakerDiarizer:
+        start = time.perf_counter()
+        diarizer = SpeakerDiarizer()
+        diarizer._load_pipeline()
+        elapsed = time.perf_counter() - start
+        with self._cond:
+            self._stats["loads"] += 1
+            self._stats["load_seconds"] += elapsed
+        print(f"[Diarizer] Pipeline loaded in {elapsed:.1f}s (pool size {self.size})")
+        return diarizer
+
+    def _checkout(self) -> Tuple[SpeakerDiarizer, float]:
+        """An idle diarizer, loading a new one if the pool isn't full yet.
+        Returns (diarizer, seconds spent loading it)."""
+        with self._cond:
+            while not self._idle and self._created >= self.size:
+                self._cond.wait()
+            if self._idle:
+                self._in_use += 1
+                return self._idle.pop(), 0.0
+            self._created += 1
+            self._in_use += 1
+        start = time.perf_counter()
+        try:
+            diarizer = self._load()
+        except Exception:
+            with self._cond:
+                self._created -= 1
+                self._in_use -= 1
+                self._cond.notify()
+            raise
+        return diarizer, time.perf_counter() - start
+
+    def _checkin(self, diarizer: SpeakerDiarizer):
+        with self._cond:
+            self._idle.append(diarizer)
+            self._in_use -= 1
+            self._cond.notify()
+
+    def preload(self):
+        """Load one pipeline now (no-op if one is already loaded)"""
+        diarizer, _ = self._checkout()
+        self._checkin(diarizer)
+
+    def diarize(self, audio_path: str) -> Tuple[List[Dict], Dict[str, float]]:
+        """
+        Diarize with a pooled pipeline.
+
+        Returns:
+            (segments, timings) where timings has wait_seconds (queued behind
+            other jobs), load_seconds (0 when the pipeline was warm) and
+            diarize_seconds
+        """
+        start = time.perf_counter()
+        diarizer, load_seconds = self._checkout()
+        wait_seconds = time.perf_counter() - start - load_seconds
+        try:
+            run_start = time.perf_counter()
+            segments = diarizer.diarize(audio_path)
+            diarize_seconds = time.perf_counter() - run_start
+        except Exception:
+            with self._cond:
+                self._stats["failures"] += 1
+            raise
+        finally:
+            self._checkin(diarizer)
+
+        with self._cond:
+            self._stats["jobs"] += 1
+            self._stats["wait_seconds"] += wait_seconds
+            self._stats["diarize_seconds"] += diarize_seconds
+        return segments, {
+            "wait_seconds": round(wait_seconds, 3),
+            "load_seconds": round(load_seconds, 3),
+            "diarize_seconds": round(diarize_seconds, 3),
+        }
+
+    def get_stats(self) -> Dict:
+        with self._cond:
+            return {
+                **{k: round(v, 3) if isinstance(v, float) else v for k, v in self._stats.items()},
+                "size": self.size,
+                "loaded": self._created,
+                "in_use": self._in_use,
+            }
+
+
+_diarizer_pool: Optional[DiarizerPool] = None
+_diarizer_pool_lock = threading.Lock()
+
+
+def get_diarizer_pool() -> DiarizerPool:
+    """Get or create the process-wide diarizer pool"""
+    global _diarizer_pool
+    with _diarizer_pool_lock:
+        if _diarizer_pool is None:
+            _diarizer_pool = DiarizerPool(size=get_config().diarization.pool_size)
+        return _diarizer_pool
+
+
 def diarize_audio(audio_path: str, hf_token: str = None) -> List[Dict]:
     """Convenience function to diarize audio"""
     diarizer = SpeakerDiarizer(hf_token)
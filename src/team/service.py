@@ -440,7 +440,7 @@ class TeamService:
             raise PermissionError("access_denied", "You are not a member of this team")
 
         # Verify content exists and belongs to user
-        content = db.query(ContentVector).filter(
+        content = db.query(ContentVector.id).filter(
             and_(ContentVector.id == content_id, ContentVector.user_id == user_id)
         ).first()
         if not content:
@@ -493,24 +493,32 @@ class TeamService:
         if not membership:
             raise PermissionError("access_denied", "You are not a member of this team")
 
-        shared = db.query(TeamContent).filter(TeamContent.team_id == team_id).all()
-        result = []
-        for tc in shared:
-            content = db.query(ContentVector).filter(ContentVector.id == tc.content_id).first()
-            if content:
-                sharer = db.query(User).filter(User.id == tc.shared_by).first()
-                result.append({
-                    "id": content.id,
-                    "title": content.title,
-                    "summary": content.summary,
-                    "content_type": content.content_type,
-                    "mode": content.mode,
-                    "source_url": content.source_url,
-                    "tags": content.tags,
-                    "shared_by": {
-                        "user_id": tc.shared_by,
-                        "name": sharer.full_name or sharer.email if sharer else "Unknown"
-                    },
-                    "shared_at": tc.shared_at.isoformat() if tc.shared_at else None,
-                })
-        return result
+        # One join, card columns only (no full_content / embedding)
+        rows = db.query(
+            ContentVector.id, ContentVector.title, ContentVector.summary,
+            ContentVector.content_type, ContentVector.mode, ContentVector.source_url,
+            ContentVector.tags, TeamContent.shared_by, TeamContent.shared_at,
+            User.full_name, User.email
+        ).join(
+            TeamContent, TeamContent.content_id == ContentVector.id
+        ).outerjoin(
+            User, User.id == TeamContent.shared_by
+        ).filter(TeamContent.team_id == team_id).order_by(TeamContent.id).all()
+
+        return [
+            {
+                "id": row.id,
+                "title": row.title,
+                "summary": row.summary,
+                "content_type": row.content_type,
+                "mode": row.mode,
+                "source_url": row.source_url,
+                "tags": row.tags,
+                "shared_by": {
+                    "user_id": row.shared_by,
+                    "name": row.full_name or row.email if row.email else "Unknown"
+                },
+                "shared_at": row.shared_at.isoformat() if row.shared_at else None,
+            }
+            for row in rows
+        ]
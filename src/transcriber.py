@@ -5,11 +5,16 @@ Uses OpenAI Whisper API for speech-to-text
 
 import os
 import math
+import sys
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from pathlib import Path
-from typing import Optional
+from typing import List, Optional, Tuple
 import json
 
 from openai import OpenAI
+from config import get_config
 from video_processor import get_ffmpeg_path
 
 # Formats the Whisper API accepts directly
@@ -18,6 +23,39 @@ WHISPER_ACCEPTED = {".mp3", ".mp4", ".mpeg", ".mpga", ".m4a", ".wav", ".webm"}
 # OpenAI Whisper API file size limit (25 MB)
 MAX_FILE_SIZE = 25 * 1024 * 1024
 
+# Chunk boundary alignment: search this fraction of the max chunk length on
+# either side of each ideal cut for a pause of SILENCE_MIN_SECONDS below SILENCE_NOISE_DB
+SILENCE_SEARCH_FRACTION = 0.1
+SILENCE_NOISE_DB = -35
+SILENCE_MIN_SECONDS = 0.4
+
+# Speech preprocessing (see TranscriptionConfig): Whisper works on 16 kHz mono
+# internally, so nothing it uses is lost. Files under PREPROCESS_MIN_SIZE that
+# the API accepts are sent untouched. AAC needs more bits than Opus for speech;
+# Opus runs at compression level 5, about half the CPU of 10 for the same size.
+SPEECH_SAMPLE_RATE = 16000
+PREPROCESS_MIN_SIZE = 8 * 1024 * 1024
+AAC_MIN_KBPS = 32
+# VAD trimming removes silences of at least VAD_MIN_SILENCE_SECONDS, keeping
+# VAD_PADDING_SECONDS of each silence next to the speech around it
+VAD_MIN_SILENCE_SECONDS = 1.0
+VAD_PADDING_SECONDS = 0.25
+# Streamed segments shorter than this (the tail end of a stream) are skipped
+STREAM_MIN_SEGMENT_SECONDS = 0.5
+
+
+class StreamInterrupted(Exception):
+    """Streamed segment input failed part-way through transcribe_stream().
+
+    partial is the merged transcript of every segment received before the
+    failure (None if there was none), covering audio up to covered_seconds.
+    """
+
+    def __init__(self, message: str, partial: Optional[dict], covered_seconds: float):
+        super().__init__(message)
+        self.partial = partial
+        self.covered_seconds = covered_seconds
+
 
 class Transcriber:
     def __init__(self):
@@ -44,26 +82,42 @@ class Transcriber:
         """
         print(f"Transcribing: {audio_path}")
 
+        config = get_config().transcription
         file_size = os.path.getsize(audio_path)
         ext = Path(audio_path).suffix.lower()
+        sendable = ext in WHISPER_ACCEPTED and file_size <= MAX_FILE_SIZE
+        preprocess = config.preprocess and (
+            not sendable or file_size > PREPROCESS_MIN_SIZE or config.vad_trim
+        )
 
-        # If the file is an accepted format AND under the size limit, send directly
-        if ext in WHISPER_ACCEPTED and file_size <= MAX_FILE_SIZE:
+        # Accepted format, under the size limit and not worth re-encoding: send directly
+        if sendable and not preprocess:
             print(f"Sending {ext} file directly to API ({file_size / 1024 / 1024:.1f}MB)")
             return self._transcribe_file(audio_path, language, task)
 
-        # File too large or not accepted — strip video track (stream copy, no re-encode)
-        audio_file = self._strip_to_audio(audio_path)
+        offset_map = None
+        if preprocess:
+            try:
+                audio_file, offset_map = self._preprocess_audio(audio_path, config)
+            except Exception as e:
+                print(f"Warning: speech preprocessing failed, using original audio: {e}")
+                preprocess = False
+        if not preprocess:
+            if sendable:
+                print(f"Sending {ext} file directly to API ({file_size / 1024 / 1024:.1f}MB)")
+                return self._transcribe_file(audio_path, language, task)
+            # File too large or not accepted — strip video track (stream copy, no re-encode)
+            audio_file = self._strip_to_audio(audio_path)
         cleanup = audio_file != audio_path
 
         try:
             file_size = os.path.getsize(audio_file)
             if file_size <= MAX_FILE_SIZE:
                 print(f"Audio-only file is {file_size / 1024 / 1024:.1f}MB, sending to API")
-                return self._transcribe_file(audio_file, language, task)
+                result = self._transcribe_file(audio_file, language, task)
             else:
                 print(f"Audio file is {file_size / 1024 / 1024:.1f}MB (>{MAX_FILE_SIZE // 1024 // 1024}MB), splitting into chunks...")
-                return self._transcribe_chunked(audio_file, language, task)
+                result = self._transcribe_chunked(audio_file, language, task)
         finally:
             if cleanup and os.path.exists(audio_file):
                 try:
@@ -71,6 +125,199 @@ class Transcriber:
                 except OSError:
                     pass
 
+        if offset_map:
+            self._restore_timestamps(result, offset_map)
+        return result
+
+    def _preprocess_audio(self, audio_path: str, config) -> Tuple[str, Optional[List[Tuple[float, float]]]]:
+        """Re-encode audio as mono 16 kHz low-bitrate speech, optionally with
+        long silences cut out (config.vad_trim).
+
+        Falls back from Opus to AAC if the Opus encode fails.
+
+        Returns:
+            (output_path, offset_map). offset_map is None unless silence was
+            removed; otherwise it holds one (trimmed_start, original_start)
+            pair, in seconds, per kept span (see _restore_timestamps).
+        """
+        import subprocess
+
+        ffmpeg_path = get_ffmpeg_path()
+        abs_audio_path = str(Path(audio_path).resolve())
+        original_size = os.path.getsize(audio_path)
+
+        removed = self._find_removable_silence(abs_audio_path, ffmpeg_path) if config.vad_trim else []
+
+        codecs = [config.preprocess_codec] + (["aac"] if config.preprocess_codec != "aac" else [])
+        for codec in codecs:
+            if codec == "opus":
+                ext, encode_args = ".webm", [
+                    "-c:a", "libopus", "-b:a", f"{config.preprocess_kbps}k",
+                    "-application", "voip", "-compression_level", "5"
+                ]
+            else:
+                ext, encode_args = ".m4a", [
+                    "-c:a", "aac", "-b:a", f"{max(config.preprocess_kbps, AAC_MIN_KBPS)}k"
+                ]
+            # Unique ASCII temp name next to the source: jobs running as threads
+            # share a pid, so a pid-based name would collide
+            fd, output_path = tempfile.mkstemp(prefix="_speech_", suffix=ext, dir=Path(audio_path).parent)
+            os.close(fd)
+            try:
+                if removed:
+                    total_samples = self._encode_without_silence(
+                        abs_audio_path, ffmpeg_path, removed, encode_args, output_path
+                    )
+                else:
+                    cmd = [
+                        ffmpeg_path, "-y", "-v", "error", "-nostdin",
+                        "-i", abs_audio_path,
+                        "-vn", "-ac", "1", "-ar", str(SPEECH_SAMPLE_RATE),
+                        *encode_args, output_path,
+                    ]
+                    result = subprocess.run(cmd, capture_output=True, text=True, encoding="utf-8", errors="replace")
+                    if result.returncode != 0:
+                        raise RuntimeError(result.stderr.strip() or f"ffmpeg exited with code {result.returncode}")
+                if not os.path.exists(output_path) or os.path.getsize(output_path) == 0:
+                    raise RuntimeError("ffmpeg produced no output")
+                break
+            except Exception as e:
+                if os.path.exists(output_path):
+                    os.remove(output_path)
+                if codec == codecs[-1]:
+                    raise
+                print(f"{codec} speech encode failed ({e}), trying {codecs[-1]}...")
+
+        size = os.path.getsize(output_path)
+        print(f"Preprocessed audio for speech ({codec}): "
+              f"{original_size / 1024 / 1024:.1f}MB -> {size / 1024 / 1024:.1f}MB")
+        if not removed:
+            return output_path, None
+
+        # Kept spans are the gaps between removed ranges
+        offset_map, trimmed, kept_start = [], 0, 0
+        for start, end in removed:
+            if start > kept_start:
+                offset_map.append((trimmed / SPEECH_SAMPLE_RATE, kept_start / SPEECH_SAMPLE_RATE))
+                trimmed += start - kept_start
+            kept_start = end
+        if kept_start < total_samples:
+            offset_map.append((trimmed / SPEECH_SAMPLE_RATE, kept_start / SPEECH_SAMPLE_RATE))
+            trimmed += total_samples - kept_start
+        print(f"Trimmed {(total_samples - trimmed) / SPEECH_SAMPLE_RATE:.0f}s of silence "
+              f"from {total_samples / SPEECH_SAMPLE_RATE:.0f}s")
+        return output_path, offset_map
+
+    def _find_removable_silence(self, audio_path: str, ffmpeg_path: str) -> List[Tuple[int, int]]:
+        """Sample ranges [start, end) at SPEECH_SAMPLE_RATE that VAD trimming drops.
+
+        Runs silencedetect on the same resampled mono stream the trimming pass
+        reads, with timestamps counted in samples, so ranges line up exactly.
+        """
+        import subprocess
+
+        cmd = [
+            ffmpeg_path, "-v", "info", "-nostdin",
+            "-i", audio_path,
+            "-vn", "-af",
+            f"aresample={SPEECH_SAMPLE_RATE},aformat=channel_layouts=mono,asetpts=N/SR/TB,"
+            f"silencedetect=noise={SILENCE_NOISE_DB}dB:d={VAD_MIN_SILENCE_SECONDS}",
+            "-f", "null", "-",
+        ]
+        result = subprocess.run(cmd, capture_output=True, text=True, encoding="utf-8", errors="replace")
+        if result.returncode != 0:
+            raise RuntimeError(f"Silence detection failed: {result.stderr.strip()[-500:]}")
+
+        removed = []
+        for start, end in self._parse_silences(result.stderr, math.inf):
+            start += VAD_PADDING_SECONDS
+            end -= VAD_PADDING_SECONDS
+            if end <= start:
+                continue
+            removed.append((
+                round(start * SPEECH_SAMPLE_RATE),
+                sys.maxsize if math.isinf(end) else round(end * SPEECH_SAMPLE_RATE)
+            ))
+        return removed
+
+    def _encode_without_silence(
+        self,
+        audio_path: str,
+        ffmpeg_path: str,
+        removed: List[Tuple[int, int]],
+        encode_args: List[str],
+        output_path: str
+    ) -> int:
+        """Decode to 16 kHz mono PCM, drop the removed sample ranges, encode the rest.
+
+        PCM streams from a decoder ffmpeg through this process into an encoder
+        ffmpeg; cuts are exact to the sample. Returns the decoded sample count.
+        """
+        import subprocess
+
+        decoder = subprocess.Popen([
+            ffmpeg_path, "-v", "error", "-nostdin",
+            "-i", audio_path,
+            "-vn", "-ac", "1", "-ar", str(SPEECH_SAMPLE_RATE), "-f", "s16le", "-",
+        ], stdout=subprocess.PIPE, stderr=subprocess.DEVNULL)
+        encoder = subprocess.Popen([
+            ffmpeg_path, "-y", "-v", "error",
+            "-f", "s16le", "-ar", str(SPEECH_SAMPLE_RATE), "-ac", "1", "-i", "-",
+            *encode_args, output_path,
+        ], stdin=subprocess.PIPE, stderr=subprocess.PIPE)
+
+        position, r = 0, 0  # samples read so far, next removed range
+        try:
+            while True:
+                data = decoder.stdout.read(1 << 20)
+                if not data:
+                    break
+                chunk_start, chunk_end = position, position + len(data) // 2
+                cursor = chunk_start
+                while r < len(removed) and removed[r][0] < chunk_end:
+                    start, end = removed[r]
+                    if start > cursor:
+                        encoder.stdin.write(data[(cursor - chunk_start) * 2:(start - chunk_start) * 2])
+                    cursor = max(cursor, min(end, chunk_end))
+                    if end > chunk_end:
+                        break
+                    r += 1
+                if cursor < chunk_end:
+                    encoder.stdin.write(data[(cursor - chunk_start) * 2:(chunk_end - chunk_start) * 2])
+                position = chunk_end
+        finally:
+            encoder.stdin.close()
+            decoder.stdout.close()
+            encoder_err = encoder.stderr.read().decode("utf-8", errors="replace")
+            encoder.stderr.close()
+            decoder_rc, encoder_rc = decoder.wait(), encoder.wait()
+
+        if decoder_rc != 0 or encoder_rc != 0:
+            raise RuntimeError(
+                f"Silence trimming failed (decoder rc={decoder_rc}, encoder rc={encoder_rc}): {encoder_err.strip()}"
+            )
+        return position
+
+    @staticmethod
+    def _restore_timestamps(result: dict, offset_map: List[Tuple[float, float]]):
+        """Map segment times in silence-trimmed audio back to the original audio.
+
+        offset_map holds (trimmed_start, original_start) for each kept span.
+        A time at the seam between two spans is a segment start if it opens
+        the later span and a segment end if it closes the earlier one.
+        """
+        from bisect import bisect_left, bisect_right
+
+        trimmed_starts = [trimmed for trimmed, _ in offset_map]
+
+        def restore(t: float, span: int) -> float:
+            trimmed, original = offset_map[max(span, 0)]
+            return original + (t - trimmed)
+
+        for seg in result["segments"]:
+            seg["start"] = restore(seg["start"], bisect_right(trimmed_starts, seg["start"]) - 1)
+            seg["end"] = restore(seg["end"], bisect_left(trimmed_starts, seg["end"]) - 1)
+
     def _strip_to_audio(self, video_path: str) -> str:
         """Strip video stream, extracting audio into m4a for Whisper API.
 
@@ -161,9 +408,18 @@ class Transcriber:
         language: Optional[str] = None,
         task: str = "transcribe"
     ) -> dict:
-        """Split a large audio file into chunks and transcribe each."""
-        import subprocess
+        """Split a large audio file into chunks and transcribe them concurrently.
+
+        Cut points are planned up front (moved into nearby silence when
+        possible), then the file is split in one ffmpeg segment-muxer pass.
+        Chunks go through a bounded thread pool; each one is retried on its
+        own if its API call fails. Results are reassembled in chunk order,
+        offset by the chunk start times ffmpeg actually used.
+        """
+        import shutil
+        import tempfile
 
+        config = get_config().transcription
         ffmpeg_path = get_ffmpeg_path()
         file_size = os.path.getsize(audio_path)
 
@@ -172,50 +428,194 @@ class Transcriber:
         if duration <= 0:
             raise RuntimeError("Could not determine audio duration for chunking")
 
-        # Calculate chunk duration so each chunk is under the size limit
-        num_chunks = math.ceil(file_size / (MAX_FILE_SIZE * 0.9))  # 90% to be safe
+        # Longest chunk that stays under the size limit (90% to be safe). Ideal
+        # cut points are spaced tighter than that, leaving room on both sides
+        # to move each cut into a silence.
+        max_chunk_seconds = duration * (MAX_FILE_SIZE * 0.9) / file_size
+        window = max_chunk_seconds * SILENCE_SEARCH_FRACTION
+        num_chunks = math.ceil(duration / (max_chunk_seconds - 2 * window))
         chunk_duration = duration / num_chunks
 
-        all_text = []
-        all_segments = []
-        detected_language = language or "en"
-        base = Path(audio_path)
-        time_offset = 0.0
+        cut_points = []
+        for i in range(1, num_chunks):
+            ideal = i * chunk_duration
+            cut = None
+            if config.align_chunks_to_silence:
+                cut = self._silence_near(audio_path, ffmpeg_path, ideal, window)
+            cut_points.append(cut if cut is not None else ideal)
+        aligned = sum(1 for i, cut in enumerate(cut_points, 1) if cut != i * chunk_duration)
+        print(f"Splitting {duration:.0f}s into {num_chunks} chunks "
+              f"({aligned}/{len(cut_points)} cuts aligned to silence)")
+
+        chunk_dir = tempfile.mkdtemp(prefix="_chunks_", dir=str(Path(audio_path).parent))
+        try:
+            chunks = self._split_audio(audio_path, ffmpeg_path, cut_points, chunk_dir)
+            results = [None] * len(chunks)
+            with ThreadPoolExecutor(max_workers=max(1, config.chunk_workers)) as executor:
+                futures = {
+                    executor.submit(self._transcribe_chunk, path, f"{i + 1}/{len(chunks)}", language, task): i
+                    for i, (path, _) in enumerate(chunks)
+                }
+                for future in as_completed(futures):
+                    i = futures[future]
+                    results[i] = future.result()
+                    print(f"Transcribed chunk {i + 1}/{len(chunks)}")
+        finally:
+            shutil.rmtree(chunk_dir, ignore_errors=True)
 
-        for i in range(num_chunks):
-            start_time = i * chunk_duration
-            chunk_path = str(base.parent / f"{base.stem}_chunk{i}{base.suffix}")
+        return self._merge_chunks([start for _, start in chunks], results, language)
 
-            cmd = [
-                ffmpeg_path, "-y",
-                "-i", audio_path,
-                "-ss", str(start_time),
-                "-t", str(chunk_duration),
-                "-acodec", "copy",
-                chunk_path,
-            ]
-            subprocess.run(cmd, capture_output=True, text=True, encoding="utf-8", errors="replace")
+    def transcribe_stream(
+        self,
+        segments,
+        language: Optional[str] = None,
+        task: str = "transcribe",
+        progress_callback: callable = None
+    ) -> dict:
+        """Transcribe audio segments while later ones are still being produced.
 
-            if not os.path.exists(chunk_path):
-                continue
+        Each segment goes to the chunk pool as soon as it arrives, so when the
+        segments come from video_processor.stream_audio_segments() the total
+        time is roughly max(download, transcription) rather than the sum.
 
-            try:
-                result = self._transcribe_file(chunk_path, language, task)
-
-                all_text.append(result["text"])
-                detected_language = result.get("language", detected_language)
-
-                for seg in result["segments"]:
-                    all_segments.append({
-                        "start": seg["start"] + start_time,
-                        "end": seg["end"] + start_time,
-                        "text": seg["text"],
-                    })
-            finally:
+        Args:
+            segments: Iterable of (segment_path, start_seconds, end_seconds) in
+                time order; iterating may block until the next segment exists
+            progress_callback: Optional callback(completed, submitted, input_done)
+                called as segments are submitted and finish
+
+        Raises:
+            The first chunk failure, as soon as it is seen (pending segments are
+            cancelled rather than transcribed for nothing).
+            StreamInterrupted if iterating segments fails; it carries the
+            transcript of the segments received so far (see transcribe_after).
+        """
+        import threading
+
+        config = get_config().transcription
+        starts, futures = [], []
+        covered = 0.0
+        input_error = None
+        state = {"completed": 0, "input_done": False}
+        lock = threading.Lock()
+
+        def report(_future=None):
+            with lock:
+                if _future is not None:
+                    state["completed"] += 1
+                completed, submitted, input_done = state["completed"], len(futures), state["input_done"]
+            if progress_callback:
+                progress_callback(completed, submitted, input_done)
+
+        def raise_failed():
+            for future in futures:
+                if future.done() and not future.cancelled() and future.exception():
+                    for pending in futures:
+                        pending.cancel()
+                    raise future.exception()
+
+        with ThreadPoolExecutor(max_workers=max(1, config.chunk_workers)) as executor:
+            segment_iter = iter(segments)
+            while True:
                 try:
-                    os.remove(chunk_path)
-                except OSError:
-                    pass
+                    path, start, end = next(segment_iter)
+                except StopIteration:
+                    break
+                except Exception as e:
+                    input_error = e
+                    break
+                raise_failed()
+                if end - start < STREAM_MIN_SEGMENT_SECONDS:
+                    # Trailing sliver; the API rejects near-empty audio
+                    continue
+                with lock:
+                    future = executor.submit(self._transcribe_chunk, path, f"{len(futures) + 1}", language, task)
+                    starts.append(start)
+                    futures.append(future)
+                covered = end
+                future.add_done_callback(report)
+                report()
+            with lock:
+                state["input_done"] = True
+            report()
+            results = [future.result() for future in futures]
+
+        if input_error is not None:
+            partial = self._merge_chunks(starts, results, language) if results else None
+            raise StreamInterrupted(str(input_error), partial, covered) from input_error
+
+        print(f"Transcribed {len(results)} streamed segments")
+        return self._merge_chunks(starts, results, language)
+
+    def transcribe_after(
+        self,
+        audio_path: str,
+        partial: Optional[dict],
+        covered_seconds: float,
+        language: Optional[str] = None,
+        task: str = "transcribe"
+    ) -> dict:
+        """Finish an interrupted stream: transcribe audio_path from covered_seconds
+        on and append it to partial (the StreamInterrupted transcript)."""
+        import subprocess
+
+        if not partial or covered_seconds <= 0:
+            return self.transcribe(audio_path, language=language, task=task)
+
+        config = get_config().transcription
+        fd, tail_path = tempfile.mkstemp(prefix="_tail_", suffix=".webm", dir=Path(audio_path).parent)
+        os.close(fd)
+        try:
+            cmd = [
+                get_ffmpeg_path(), "-y", "-v", "error", "-nostdin",
+                "-ss", f"{covered_seconds:.3f}", "-i", str(Path(audio_path).resolve()),
+                "-vn", "-ac", "1", "-ar", str(SPEECH_SAMPLE_RATE),
+                "-c:a", "libopus", "-b:a", f"{config.preprocess_kbps}k", "-application", "voip",
+                tail_path,
+            ]
+            result = subprocess.run(cmd, capture_output=True, text=True, encoding="utf-8", errors="replace")
+            if result.returncode != 0:
+                raise RuntimeError(result.stderr.strip() or f"ffmpeg exited with code {result.returncode}")
+            tail_seconds = self._get_duration(tail_path, get_ffmpeg_path())
+            if 0 < tail_seconds < STREAM_MIN_SEGMENT_SECONDS:
+                return partial
+            print(f"Reusing {covered_seconds:.0f}s already transcribed, transcribing the rest")
+            tail = self.transcribe(tail_path, language=language, task=task)
+        finally:
+            if os.path.exists(tail_path):
+                os.remove(tail_path)
+        return self._merge_chunks([0.0, covered_seconds], [partial, tail], language)
+
+    def _transcribe_chunk(self, chunk_path: str, label: str, language: Optional[str], task: str) -> dict:
+        """_transcribe_file() with per-chunk retries and backoff"""
+        retries = get_config().transcription.chunk_retries
+        for attempt in range(retries + 1):
+            try:
+                return self._transcribe_file(chunk_path, language, task)
+            except Exception as e:
+                if attempt == retries:
+                    raise RuntimeError(
+                        f"Chunk {label} failed after {attempt + 1} attempts: {e}"
+                    ) from e
+                print(f"Chunk {label} failed ({type(e).__name__}), retrying...")
+                time.sleep(2 ** attempt)
+
+    @staticmethod
+    def _merge_chunks(starts: List[float], results: List[dict], language: Optional[str]) -> dict:
+        """Concatenate chunk results in order, offsetting segment times by each chunk's start"""
+        all_text = []
+        all_segments = []
+        detected_language = language or "en"
+        for start_time, result in zip(starts, results):
+            all_text.append(result["text"])
+            detected_language = result.get("language", detected_language)
+
+            for seg in result["segments"]:
+                all_segments.append({
+                    "start": seg["start"] + start_time,
+                    "end": seg["end"] + start_time,
+                    "text": seg["text"],
+                })
 
         return {
             "text": " ".join(all_text),
@@ -223,6 +623,101 @@ class Transcriber:
             "segments": all_segments,
         }
 
+    def _split_audio(
+        self,
+        audio_path: str,
+        ffmpeg_path: str,
+        cut_points: List[float],
+        output_dir: str
+    ) -> List[Tuple[str, float]]:
+        """Cut audio at cut_points in a single stream-copy pass.
+
+        Returns [(chunk_path, start_seconds), ...] in order. Start times come
+        from the segment muxer's list file, i.e. where each cut really landed
+        (packet boundaries), not where it was requested.
+        """
+        import csv
+        import subprocess
+
+        ext = Path(audio_path).suffix.lower()
+        list_path = os.path.join(output_dir, "chunks.csv")
+        cmd = [
+            ffmpeg_path, "-y", "-v", "error",
+            "-i", str(Path(audio_path).resolve()),
+            "-vn", "-acodec", "copy",
+            "-f", "segment",
+            "-segment_times", ",".join(f"{t:.3f}" for t in cut_points),
+            "-reset_timestamps", "1",
+            "-segment_list", list_path,
+            "-segment_list_type", "csv",
+            os.path.join(output_dir, f"chunk%03d{ext}"),
+        ]
+        result = subprocess.run(cmd, capture_output=True, text=True, encoding="utf-8", errors="replace")
+        if result.returncode != 0 or not os.path.exists(list_path):
+            err = result.stderr.strip() or f"ffmpeg exited with code {result.returncode}"
+            raise RuntimeError(f"Failed to split audio into chunks: {err}")
+
+        chunks = []
+        with open(list_path, newline="") as f:
+            for row in csv.reader(f):
+                if row:
+                    chunks.append((os.path.join(output_dir, row[0]), float(row[1])))
+        return chunks
+
+    def _silence_near(
+        self,
+        audio_path: str,
+        ffmpeg_path: str,
+        target: float,
+        window: float
+    ) -> Optional[float]:
+        """Midpoint of the detected silence closest to target, searching
+        target +/- window; None if there is none. Only that window is decoded."""
+        import subprocess
+
+        start = max(0.0, target - window)
+        cmd = [
+            ffmpeg_path, "-v", "info", "-nostdin",
+            "-ss", f"{start:.3f}", "-t", f"{2 * window:.3f}",
+            "-i", audio_path,
+            "-vn", "-af", f"silencedetect=noise={SILENCE_NOISE_DB}dB:d={SILENCE_MIN_SECONDS}",
+            "-f", "null", "-",
+        ]
+        try:
+            result = subprocess.run(
+                cmd, capture_output=True, text=True, encoding="utf-8", errors="replace", timeout=120
+            )
+        except Exception:
+            return None
+
+        silences = [
+            start + (silence_start + silence_end) / 2
+            for silence_start, silence_end in self._parse_silences(result.stderr, 2 * window)
+        ]
+        if not silences:
+            return None
+        return min(silences, key=lambda t: abs(t - target))
+
+    @staticmethod
+    def _parse_silences(ffmpeg_log: str, end: float) -> List[Tuple[float, float]]:
+        """(start, end) silences from silencedetect's log output. A silence still
+        running when the input ends is closed at `end`."""
+        import re
+
+        silences, silence_start = [], None
+        for line in ffmpeg_log.splitlines():
+            match = re.search(r"silence_start: (-?[\d.]+)", line)
+            if match:
+                silence_start = max(0.0, float(match.group(1)))
+                continue
+            match = re.search(r"silence_end: (-?[\d.]+)", line)
+            if match and silence_start is not None:
+                silences.append((silence_start, float(match.group(1))))
+                silence_start = None
+        if silence_start is not None:
+            silences.append((silence_start, end))
+        return silences
+
     def _get_duration(self, audio_path: str, ffmpeg_path: str) -> float:
         """Get duration of an audio file in seconds."""
         import subprocess
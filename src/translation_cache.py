@@ -0,0 +1,96 @@
+"""
+Translated transcript chunk cache
+Translations keyed by hash(model, target language, text): bounded in-process
+LRU in front of an optional shared Redis tier, so re-analyzing a source in the
+same language makes no translation calls.
+"""
+import hashlib
+import threading
+from collections import OrderedDict
+from typing import Dict, Optional
+
+from config import get_config
+from redis_client import get_redis_client
+
+
+class TranslationCache:
+    """Two-tier (memory LRU, then Redis) cache of translated text chunks."""
+
+    KEY_PREFIX = "tr:"
+
+    def __init__(self, max_entries: int, redis_ttl: int, use_redis: bool = True):
+        self.max_entries = max_entries
+        self.redis_ttl = redis_ttl
+        self.use_redis = use_redis
+        self._entries: "OrderedDict[str, str]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._stats = {"memory_hits": 0, "redis_hits": 0, "misses": 0}
+
+    @staticmethod
+    def make_key(model: str, target_lang: str, text: str) -> str:
+        digest = hashlib.sha256(f"{model}\x00{target_lang}\x00{text}".encode("utf-8")).hexdigest()
+        return f"{TranslationCache.KEY_PREFIX}{digest}"
+
+    def get(self, key: str) -> Optional[str]:
+        with self._lock:
+            if key in self._entries:
+                self._entries.move_to_end(key)
+                self._stats["memory_hits"] += 1
+                return self._entries[key]
+
+        value = None
+        client = get_redis_client() if self.use_redis else None
+        if client:
+            try:
+                raw = client.get(key)
+                value = raw.decode("utf-8") if isinstance(raw, bytes) else raw
+            except Exception as e:
+                print(f"[TranslationCache] Redis get error: {e}")
+        if value is not None:
+            self._remember(key, value)
+        with self._lock:
+            self._stats["redis_hits" if value is not None else "misses"] += 1
+        return value
+
+    def put(self, key: str, value: str):
+        self._remember(key, value)
+        client = get_redis_client() if self.use_redis else None
+        if client:
+            try:
+                client.setex(key, self.redis_ttl, value)
+            except Exception as e:
+                print(f"[TranslationCache] Redis set error: {e}")
+
+    def get_stats(self) -> Dict[str, int]:
+        with self._lock:
+            lookups = sum(self._stats.values())
+            hits = self._stats["memory_hits"] + self._stats["redis_hits"]
+            return {
+                **self._stats,
+                "entries": len(self._entries),
+                "max_entries": self.max_entries,
+                "hit_rate": round(hits / lookups, 3) if lookups else 0.0,
+            }
+
+    def _remember(self, key: str, value: str):
+        with self._lock:
+            self._entries[key] = value
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+
+_translation_cache: Optional[TranslationCache] = None
+
+
+def get_translation_cache() -> TranslationCache:
+    """Get or create the process-wide translation cache (singleton)"""
+    global _translation_cache
+    if _translation_cache is None:
+        config = get_config()
+        _translation_cache = TranslationCache(
+            max_entries=config.translation.cache_size,
+            redis_ttl=config.translation.cache_ttl,
+            use_redis=config.redis.is_configured,
+        )
+    return _translation_cache
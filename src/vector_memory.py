@@ -2,27 +2,54 @@
 Vector Memory using PostgreSQL pgvector
 Replaces ChromaDB for scalable multi-user deployment
 """
+import base64
 import json
 import re
 import time
-from typing import List, Optional, Dict
-from sqlalchemy.orm import Session, load_only
-from sqlalchemy import func, text
+from typing import Iterable, List, Optional, Dict, Tuple
+from sqlalchemy.orm import Session, load_only, undefer
+from sqlalchemy import and_, func, text, cast, literal, literal_column, bindparam, tuple_, Float
+from sqlalchemy.dialects.postgresql import JSONB
 from datetime import datetime
-from database import ContentVector, EntityVector, Collection
+from database import (
+    ContentVector, ContentBody, EntityVector, TranscriptPassage, Collection, CollectionItem,
+    CONTENT_BODY_FIELDS, EMBEDDING_DIMS
+)
 from config import get_config
+from embedding_matrix import PassageMatrix, UserMatrix, get_matrix_cache, get_passage_matrix_cache
+from embedding_cache import get_embedding_cache
 
 from openai import OpenAI
 
 # Module-level OpenAI client (reused across all instances)
 _openai_client = None
 
+# Whether embedding columns are native pgvector (checked once per process)
+_native_vector = None
+# pgvector >= 0.8 can keep scanning HNSW until filtered queries fill LIMIT
+_hnsw_iterative_scan = False
+
 
 class VectorMemory:
     # OpenAI text-embedding-3-small: 1536 dims by default, but we request
     # 384 to match the existing DB schema (was all-MiniLM-L6-v2).
     EMBEDDING_MODEL = "text-embedding-3-small"
-    EMBEDDING_DIMS = 384
+    EMBEDDING_DIMS = EMBEDDING_DIMS
+    EMBEDDING_MAX_CHARS = 32000
+    # API limits per request: 2048 inputs, 300k tokens (~4 chars/token, kept well under)
+    EMBEDDING_BATCH_MAX_INPUTS = 2048
+    EMBEDDING_BATCH_MAX_CHARS = 600000
+    SEARCH_MODES = ("semantic", "hybrid", "keyword")
+    RRF_K = 60  # Reciprocal rank fusion constant (standard value from the RRF paper)
+    # Transcript passages: ~1200-char windows overlapping by a paragraph (or 200 chars)
+    PASSAGE_TARGET_CHARS = 1200
+    PASSAGE_OVERLAP_CHARS = 200
+    # Fields a library/search card renders; the rest of full_content stays on /api/content/{id}
+    CARD_FIELDS = ("id", "title", "summary", "mode", "content_type", "tags",
+                   "thumbnail", "duration", "source_url", "created_at")
+    # Extra light fields a caller may ask for with fields=
+    OPTIONAL_CARD_FIELDS = ("topics", "collections", "recipe", "has_transcript", "updated_at")
+    LIBRARY_SORTS = ("created_at", "updated_at", "title")
 
     def __init__(self, db: Session, user_id: Optional[int] = None):
         """
@@ -42,17 +69,93 @@ class VectorMemory:
             _openai_client = OpenAI()
         return _openai_client
 
+    def _uses_native_vector(self) -> bool:
+        """True when running on PostgreSQL with embedding columns of type vector.
+
+        SQLite, and PostgreSQL databases whose embeddings are still JSON,
+        fall back to computing similarity in Python.
+        """
+        global _native_vector, _hnsw_iterative_scan
+        if _native_vector is None:
+            if self.db.get_bind().dialect.name != "postgresql":
+                _native_vector = False
+            else:
+                udts = self.db.execute(text(
+                    "SELECT udt_name FROM information_schema.columns "
+                    "WHERE table_name IN ('content_vectors', 'entity_vectors', 'transcript_passages') "
+                    "AND column_name = 'embedding'"
+                )).scalars().all()
+                _native_vector = bool(udts) and all(u == "vector" for u in udts)
+                version = self.db.execute(text(
+                    "SELECT extversion FROM pg_extension WHERE extname = 'vector'"
+                )).scalar() or "0"
+                _hnsw_iterative_scan = tuple(int(p) for p in version.split(".")[:2]) >= (0, 8)
+        return _native_vector
+
+    def _prepare_ann_scan(self):
+        """Per-transaction HNSW settings so per-user filters don't starve LIMIT."""
+        if _hnsw_iterative_scan:
+            self.db.execute(text("SET LOCAL hnsw.iterative_scan = strict_order"))
+
+    @staticmethod
+    def _cosine_similarity(a, b) -> float:
+        import numpy as np
+        a = np.asarray(a, dtype=np.float32)
+        b = np.asarray(b, dtype=np.float32)
+        return float(np.dot(a, b) / (np.linalg.norm(a) * np.linalg.norm(b)))
+
     def _generate_embedding(self, text: str) -> List[float]:
         """Generate embedding via OpenAI API (no local model needed)."""
-        client = self._get_openai_client()
+        return self._generate_embeddings([text])[0]
+
+    def _generate_embeddings(self, texts: List[str]) -> List[List[float]]:
+        """Embed many texts with as few embeddings.create calls as possible.
+
+        Requests are only split at the API's input limits (count and total
+        size); results come back in input order.
+        """
         # Truncate to ~8000 tokens (~32000 chars) to stay within model limits
-        text = text[:32000] if len(text) > 32000 else text
-        response = client.embeddings.create(
-            model=self.EMBEDDING_MODEL,
-            input=text,
-            dimensions=self.EMBEDDING_DIMS,
-        )
-        return response.data[0].embedding
+        texts = [(t[:self.EMBEDDING_MAX_CHARS] if len(t) > self.EMBEDDING_MAX_CHARS else t) or " " for t in texts]
+
+        # Content-addressed cache: identical (model, dims, text) never hits the API twice
+        cache = get_embedding_cache()
+        keys = [cache.make_key(self.EMBEDDING_MODEL, self.EMBEDDING_DIMS, t) for t in texts]
+        cached = cache.get_many(keys)
+        pending = {}
+        for key, t in zip(keys, texts):
+            if key not in cached:
+                pending.setdefault(key, t)
+
+        if pending:
+            pending_keys = list(pending)
+            pending_texts = [pending[k] for k in pending_keys]
+            client = self._get_openai_client()
+
+            batches, batch, batch_chars = [], [], 0
+            for t in pending_texts:
+                if batch and (len(batch) >= self.EMBEDDING_BATCH_MAX_INPUTS
+                              or batch_chars + len(t) > self.EMBEDDING_BATCH_MAX_CHARS):
+                    batches.append(batch)
+                    batch, batch_chars = [], 0
+                batch.append(t)
+                batch_chars += len(t)
+            if batch:
+                batches.append(batch)
+
+            generated = []
+            for batch in batches:
+                response = client.embeddings.create(
+                    model=self.EMBEDDING_MODEL,
+                    input=batch,
+                    dimensions=self.EMBEDDING_DIMS,
+                )
+                generated.extend(d.embedding for d in sorted(response.data, key=lambda d: d.index))
+
+            fresh = dict(zip(pending_keys, generated))
+            cache.put_many(fresh)
+            cached.update(fresh)
+
+        return [cached[key] for key in keys]
     
     def _create_searchable_text(self, content: Dict) -> str:
         """Create searchable text from content"""
@@ -74,6 +177,77 @@ class VectorMemory:
             content.get("transcript", "")[:1000]  # First 1000 chars of transcript
         ]
         return "\n".join(filter(None, parts))
+
+    def _build_passages(self, content: Dict) -> List[Dict]:
+        """Split a transcript into overlapping passages with start/end seconds.
+
+        Uses timeline transcript entries when present, otherwise the
+        ``[m:ss]`` paragraph headers of the formatted transcript. Transcripts
+        without timestamps become plain character windows (start/end None).
+
+        Returns:
+            [{start, end, text}, ...] in transcript order
+        """
+        paragraphs = [
+            {"start": e.get("timestamp"), "end": e.get("end"), "text": (e.get("text") or "").strip()}
+            for e in (content.get("timeline") or [])
+            if e.get("type") == "transcript"
+        ]
+
+        transcript = content.get("transcript") or ""
+        if not paragraphs and transcript:
+            for block in transcript.split("\n\n"):
+                header, _, body = block.partition("\n")
+                m = re.match(r"^\[(\d+):(\d{2})\]", header.strip())
+                if m and body.strip():
+                    paragraphs.append({
+                        "start": int(m.group(1)) * 60 + int(m.group(2)),
+                        "end": None,
+                        "text": body.strip(),
+                    })
+                elif paragraphs:
+                    paragraphs[-1]["text"] += "\n" + block.strip()
+                else:
+                    paragraphs.append({"start": None, "end": None, "text": block.strip()})
+            # Paragraph ends where the next one starts
+            for cur, nxt in zip(paragraphs, paragraphs[1:]):
+                if cur["end"] is None:
+                    cur["end"] = nxt["start"]
+            if paragraphs and paragraphs[-1]["end"] is None:
+                paragraphs[-1]["end"] = content.get("duration_seconds") or paragraphs[-1]["start"]
+
+        # Oversized paragraphs (e.g. untimestamped text) become overlapping char windows
+        step = self.PASSAGE_TARGET_CHARS - self.PASSAGE_OVERLAP_CHARS
+        pieces = []
+        for p in paragraphs:
+            if not p["text"]:
+                continue
+            if len(p["text"]) <= self.PASSAGE_TARGET_CHARS:
+                pieces.append(p)
+                continue
+            for offset in range(0, len(p["text"]), step):
+                pieces.append({"start": p["start"], "end": p["end"],
+                               "text": p["text"][offset:offset + self.PASSAGE_TARGET_CHARS]})
+                if offset + self.PASSAGE_TARGET_CHARS >= len(p["text"]):
+                    break
+
+        passages, window, fresh = [], [], 0
+        for piece in pieces:
+            if fresh and sum(len(w["text"]) for w in window) + len(piece["text"]) > self.PASSAGE_TARGET_CHARS:
+                passages.append(window)
+                # Carry a short last paragraph over so answers spanning a boundary still match
+                last = window[-1]
+                window = [last] if len(last["text"]) <= self.PASSAGE_TARGET_CHARS // 2 else []
+                fresh = 0
+            window.append(piece)
+            fresh += 1
+        if fresh:
+            passages.append(window)
+
+        return [
+            {"start": w[0]["start"], "end": w[-1]["end"], "text": "\n".join(x["text"] for x in w)}
+            for w in passages
+        ]
     
     @staticmethod
     def _extract_youtube_id(url: str) -> Optional[str]:
@@ -106,6 +280,63 @@ class VectorMemory:
 
         return row[0] if row else None
 
+    @staticmethod
+    def _entity_text(entity: Dict) -> str:
+        return f"{entity.get('name', '')} {entity.get('type', '')} {entity.get('description', '')}"
+
+    @staticmethod
+    def _split_body(content: Dict) -> Tuple[Dict, Dict]:
+        """(light full_content, heavy body fields present in content)"""
+        light = {k: v for k, v in content.items() if k not in CONTENT_BODY_FIELDS}
+        body = {k: content[k] for k in CONTENT_BODY_FIELDS if k in content}
+        return light, body
+
+    def _write_body(self, content_id: str, user_id: int, body: Dict, existing: Optional[ContentBody]):
+        """Insert the content's body row, or update the existing one in place"""
+        if existing is None:
+            self.db.add(ContentBody(content_id=content_id, user_id=user_id, **body))
+        else:
+            for field, value in body.items():
+                setattr(existing, field, value)
+
+    def _with_bodies(self, rows: List[Tuple[str, Dict]], user_id: int) -> List[Dict]:
+        """Reattach heavy fields to (content_id, full_content) rows with one query for all"""
+        ids = [content_id for content_id, _ in rows]
+        bodies = {
+            body.content_id: body for body in self.db.query(ContentBody).filter(
+                ContentBody.content_id.in_(ids),
+                ContentBody.user_id == user_id
+            ).all()
+        } if ids else {}
+        contents = []
+        for content_id, full_content in rows:
+            body = bodies.get(content_id)
+            if body is None:  # Not split yet (pre-content_bodies row): full_content is complete
+                contents.append(full_content)
+            else:
+                contents.append({**full_content, **{f: getattr(body, f) for f in CONTENT_BODY_FIELDS}})
+        return contents
+
+    def get_content_body(self, content_id: str, fields: Iterable[str] = CONTENT_BODY_FIELDS,
+                         user_id: Optional[int] = None) -> Optional[Dict]:
+        """Just the requested heavy fields (e.g. transcript, timeline) for one content"""
+        user_id = user_id or self.user_id
+        if user_id is None:
+            raise ValueError("user_id must be provided")
+        fields = [f for f in fields if f in CONTENT_BODY_FIELDS]
+
+        row = self.db.query(*[getattr(ContentBody, f) for f in fields]).filter(
+            ContentBody.content_id == content_id,
+            ContentBody.user_id == user_id
+        ).first()
+        if row is None:
+            # Not split yet: read the same keys straight out of full_content
+            row = self.db.query(*[ContentVector.full_content[f].label(f) for f in fields]).filter(
+                ContentVector.id == content_id,
+                ContentVector.user_id == user_id
+            ).first()
+        return dict(row._mapping) if row is not None else None
+
     def add_content(self, content: Dict, user_id: Optional[int] = None) -> str:
         """
         Add content to vector database
@@ -117,83 +348,179 @@ class VectorMemory:
         Returns:
             Content ID
         """
+        return self.add_contents([content], user_id)[0]
+
+    def add_contents(self, contents: List[Dict], user_id: Optional[int] = None) -> List[str]:
+        """
+        Add many contents at once (backfills, imports, single saves)
+
+        Content and entity texts for every item are embedded together in
+        batched embeddings.create calls, then written in one commit.
+
+        Args:
+            contents: Content dictionaries
+            user_id: User ID (uses self.user_id if not provided)
+
+        Returns:
+            Content IDs, in input order
+        """
         user_id = user_id or self.user_id
         if user_id is None:
             raise ValueError("user_id must be provided")
-        
-        content_id = content.get("id", f"content_{int(time.time())}")
-        searchable_text = self._create_searchable_text(content)
-        embedding = self._generate_embedding(searchable_text)
-        
-        # Check if content already exists
-        existing = self.db.query(ContentVector).filter(
-            ContentVector.id == content_id,
-            ContentVector.user_id == user_id
-        ).first()
-        
-        if existing:
-            # Update existing
-            existing.embedding = embedding
-            existing.title = content.get("title", "")
-            existing.summary = content.get("summary", "")
-            existing.mode = content.get("mode", "general")
-            existing.topics = content.get("topics", [])
-            existing.tags = content.get("tags", [])
-            existing.collections = content.get("collections", [])
-            existing.source_url = content.get("source_url", "")
-            existing.has_transcript = bool(content.get("transcript"))
-            existing.full_content = content
-            existing.searchable_text = searchable_text
-            existing.updated_at = datetime.utcnow()
-            if content.get("file_size_bytes"):
-                existing.file_size_bytes = content["file_size_bytes"]
-        else:
-            # Create new
-            vector = ContentVector(
-                id=content_id,
-                user_id=user_id,
-                embedding=embedding,
-                title=content.get("title", ""),
-                content_type=content.get("content_type", "other"),
-                mode=content.get("mode", "general"),
-                summary=content.get("summary", ""),
-                topics=content.get("topics", []),
-                tags=content.get("tags", []),
-                collections=content.get("collections", []),
-                source_url=content.get("source_url", ""),
-                has_transcript=bool(content.get("transcript")),
-                full_content=content,
-                searchable_text=searchable_text,
-                file_size_bytes=content.get("file_size_bytes", 0)
-            )
-            self.db.add(vector)
-        
-        # Add entities if provided
-        entities = content.get("entities", [])
-        if entities:
-            # Delete old entities
+        if not contents:
+            return []
+
+        now = int(time.time())
+        content_ids = [
+            c.get("id", f"content_{now}" if len(contents) == 1 else f"content_{now}_{i}")
+            for i, c in enumerate(contents)
+        ]
+        searchable_texts = [self._create_searchable_text(c) for c in contents]
+
+        signature_before = self._signature_before_write(user_id)
+
+        # Check which contents already exist (with the deferred columns we compare against)
+        existing_rows = {
+            row.id: row for row in self.db.query(ContentVector).options(
+                undefer(ContentVector.embedding), undefer(ContentVector.searchable_text)
+            ).filter(
+                ContentVector.id.in_(content_ids),
+                ContentVector.user_id == user_id
+            ).all()
+        }
+        existing_bodies = {
+            row.content_id: row for row in self.db.query(ContentBody).filter(
+                ContentBody.content_id.in_(list(existing_rows)),
+                ContentBody.user_id == user_id
+            ).all()
+        } if existing_rows else {}
+
+        # Unchanged searchable text (e.g. only collections edited) keeps its stored embedding
+        embeddings = [None] * len(contents)
+        texts, slots = [], []
+        for i, (content_id, searchable_text) in enumerate(zip(content_ids, searchable_texts)):
+            existing = existing_rows.get(content_id)
+            if existing is not None and existing.searchable_text == searchable_text and existing.embedding is not None:
+                embeddings[i] = list(existing.embedding)
+            else:
+                texts.append(searchable_text)
+                slots.append(i)
+
+        # Re-chunk transcripts only when they changed
+        passages = {}
+        for content_id, content in zip(content_ids, contents):
+            existing = existing_rows.get(content_id)
+            if content_id in existing_bodies:
+                old_transcript = existing_bodies[content_id].transcript
+            else:  # Row saved before content_bodies existed
+                old_transcript = (existing.full_content or {}).get("transcript") if existing is not None else None
+            if existing is None or old_transcript != content.get("transcript"):
+                passages[content_id] = self._build_passages(content)
+
+        # One flat list: changed content texts, every entity text, then passage texts
+        for content in contents:
+            texts.extend(self._entity_text(e) for e in content.get("entities", []))
+        n_entity_texts = len(texts) - len(slots)
+        for content_id in passages:
+            texts.extend(p["text"] for p in passages[content_id])
+        all_embeddings = self._generate_embeddings(texts) if texts else []
+        for slot, embedding in zip(slots, all_embeddings):
+            embeddings[slot] = embedding
+        entity_embeddings = iter(all_embeddings[len(slots):len(slots) + n_entity_texts])
+        passage_embeddings = iter(all_embeddings[len(slots) + n_entity_texts:])
+
+        if passages:
+            self.db.query(TranscriptPassage).filter(
+                TranscriptPassage.content_id.in_(list(passages)),
+                TranscriptPassage.user_id == user_id
+            ).delete(synchronize_session=False)
+
+        # Delete old entities for contents that bring new ones
+        with_entities = [cid for cid, c in zip(content_ids, contents) if c.get("entities")]
+        if with_entities:
             self.db.query(EntityVector).filter(
-                EntityVector.content_id == content_id,
+                EntityVector.content_id.in_(with_entities),
                 EntityVector.user_id == user_id
-            ).delete()
-            
-            # Add new entities
-            for entity in entities:
-                entity_text = f"{entity.get('name', '')} {entity.get('type', '')} {entity.get('description', '')}"
-                entity_embedding = self._generate_embedding(entity_text)
-                
-                entity_vec = EntityVector(
+            ).delete(synchronize_session=False)
+
+        matrix_updates = []
+        for content_id, content, searchable_text, embedding in zip(content_ids, contents, searchable_texts, embeddings):
+            existing = existing_rows.get(content_id)
+            if existing:
+                # Update existing
+                existing.embedding = embedding
+                existing.title = content.get("title", "")
+                existing.summary = content.get("summary", "")
+                existing.mode = content.get("mode", "general")
+                existing.topics = content.get("topics", [])
+                existing.tags = content.get("tags", [])
+                existing.source_url = content.get("source_url", "")
+                existing.has_transcript = bool(content.get("transcript"))
+                existing.full_content = self._split_body(content)[0]
+                existing.searchable_text = searchable_text
+                existing.updated_at = datetime.utcnow()
+                if content.get("file_size_bytes"):
+                    existing.file_size_bytes = content["file_size_bytes"]
+                content_type = existing.content_type
+            else:
+                # Create new
+                vector = ContentVector(
+                    id=content_id,
+                    user_id=user_id,
+                    embedding=embedding,
+                    title=content.get("title", ""),
+                    content_type=content.get("content_type", "other"),
+                    mode=content.get("mode", "general"),
+                    summary=content.get("summary", ""),
+                    topics=content.get("topics", []),
+                    tags=content.get("tags", []),
+                    source_url=content.get("source_url", ""),
+                    has_transcript=bool(content.get("transcript")),
+                    full_content=self._split_body(content)[0],
+                    searchable_text=searchable_text,
+                    file_size_bytes=content.get("file_size_bytes", 0)
+                )
+                self.db.add(vector)
+                existing_rows[content_id] = vector
+                content_type = vector.content_type
+            matrix_updates.append((content_id, embedding, content_type))
+
+            # Add entities if provided
+            for entity in content.get("entities", []):
+                self.db.add(EntityVector(
                     user_id=user_id,
                     content_id=content_id,
                     entity_name=entity.get("name", ""),
                     entity_type=entity.get("type", ""),
-                    embedding=entity_embedding
-                )
-                self.db.add(entity_vec)
-        
+                    embedding=next(entity_embeddings)
+                ))
+
+        # Content rows must exist before bodies and passages reference them
+        self.db.flush()
+        for content_id, content in zip(content_ids, contents):
+            self._write_body(content_id, user_id, self._split_body(content)[1], existing_bodies.get(content_id))
+        for content_id, content_passages in passages.items():
+            for i, passage in enumerate(content_passages):
+                self.db.add(TranscriptPassage(
+                    user_id=user_id,
+                    content_id=content_id,
+                    chunk_index=i,
+                    start_seconds=passage["start"],
+                    end_seconds=passage["end"],
+                    text=passage["text"],
+                    embedding=next(passage_embeddings)
+                ))
+
         self.db.commit()
-        print(f"Added content: {content.get('title', 'Unknown')} (ID: {content_id})")
-        return content_id
+
+        def _apply(matrix):
+            for update in matrix_updates:
+                matrix.upsert(*update)
+        self._patch_user_matrix(user_id, _apply, signature_before)
+
+        for content_id, content in zip(content_ids, contents):
+            print(f"Added content: {content.get('title', 'Unknown')} (ID: {content_id})")
+        return content_ids
     
     def search(
         self,
@@ -201,10 +528,14 @@ class VectorMemory:
         n_results: int = 5,
         content_type: str = None,
         user_id: Optional[int] = None,
-        collection_id: Optional[str] = None
+        collection_id: Optional[str] = None,
+        mode: str = "semantic",
+        weights: Optional[Dict[str, float]] = None,
+        content_ids: Optional[Iterable[str]] = None,
+        full: bool = True
     ) -> List[Dict]:
         """
-        Search content using vector similarity
+        Search content using vector similarity, keywords, or both
 
         Args:
             query: Search query text
@@ -212,61 +543,337 @@ class VectorMemory:
             content_type: Filter by content type
             user_id: User ID (uses self.user_id if not provided)
             collection_id: Optional collection ID to scope search
+            mode: "semantic" (embeddings), "keyword" (full-text only, no
+                embedding call) or "hybrid" (both, reciprocal rank fusion)
+            weights: Hybrid weights {"vector": 1.0, "lexical": 1.0}
+            content_ids: Optional candidate IDs (pre-filtered in SQL) to rank within
+            full: If False, return card fields only (see CARD_FIELDS)
 
         Returns:
             List of content dictionaries with similarity scores
+            (plus ``_score`` for keyword/hybrid ranking)
         """
         user_id = user_id or self.user_id
         if user_id is None:
             raise ValueError("user_id must be provided")
+        if mode not in self.SEARCH_MODES:
+            raise ValueError(f"mode must be one of {self.SEARCH_MODES}")
+        if content_ids is not None:
+            content_ids = list(content_ids)
+            if not content_ids:
+                return []
 
-        # Generate query embedding
-        query_embedding = self._generate_embedding(query)
+        depth = n_results if mode == "semantic" else n_results * 2
+        similarities, best_passage = {}, {}
+        vector_ranked, lexical_ranked = [], []
 
-        # Build query
-        query_obj = self.db.query(ContentVector).filter(
-            ContentVector.user_id == user_id
-        )
+        if mode != "keyword":
+            # Generate query embedding
+            query_embedding = self._generate_embedding(query)
 
-        # Apply filters
-        if content_type:
-            query_obj = query_obj.filter(
-                ContentVector.content_type == content_type
-            )
+            # Content-level ranking, plus passage-level ranking so matches deep
+            # in long transcripts surface with the timestamp where they occur
+            similarities = dict(self._rank_contents(
+                query_embedding, depth, user_id, content_type, collection_id, content_ids
+            ))
+            for hit in self._rank_passages(
+                query_embedding, depth * 4, user_id,
+                content_type=content_type, collection_id=collection_id, content_ids=content_ids
+            ):
+                cid = hit["content_id"]
+                if cid not in best_passage:  # hits arrive best first
+                    best_passage[cid] = hit
+                    similarities[cid] = max(similarities.get(cid, -1.0), hit["similarity"])
+            vector_ranked = sorted(similarities, key=similarities.get, reverse=True)[:depth]
 
-        # Load all candidate vectors (both DB backends calculate similarity in Python)
-        all_vectors = query_obj.all()
+        if mode != "semantic":
+            lexical_ranked = [cid for cid, _ in self._rank_lexical(
+                query, depth, user_id, content_type, collection_id, content_ids
+            )]
 
-        # Pre-filter by collection membership if scoped
-        if collection_id:
-            all_vectors = [v for v in all_vectors if collection_id in (v.collections or [])]
+        if mode == "semantic":
+            ranked = [(cid, similarities[cid]) for cid in vector_ranked]
+        else:
+            # Reciprocal rank fusion: sum of w / (k + rank) over both lists
+            weights = {"vector": 1.0, "lexical": 1.0, **(weights or {})}
+            fused = {}
+            for source, ids in (("vector", vector_ranked), ("lexical", lexical_ranked)):
+                for rank, cid in enumerate(ids, 1):
+                    fused[cid] = fused.get(cid, 0.0) + weights[source] / (self.RRF_K + rank)
+            ranked = sorted(fused.items(), key=lambda x: x[1], reverse=True)
+        ranked = ranked[:n_results]
+        if not ranked:
+            return []
 
-        # Calculate cosine similarity for each candidate
-        import numpy as np
-        results = []
-        for vec in all_vectors:
-            similarity = np.dot(np.array(vec.embedding), np.array(query_embedding)) / (
-                np.linalg.norm(vec.embedding) * np.linalg.norm(query_embedding)
-            )
-            results.append((similarity, vec))
+        ranked_ids = [cid for cid, _ in ranked]
+        if full:
+            rows = self.db.query(ContentVector.id, ContentVector.full_content).filter(
+                ContentVector.user_id == user_id,
+                ContentVector.id.in_(ranked_ids)
+            ).all()
+            by_id = dict(zip([row.id for row in rows], self._with_bodies(rows, user_id)))
+        else:
+            by_id = {card["id"]: card for card in self.get_cards(ranked_ids, user_id=user_id)}
 
-        results.sort(key=lambda x: x[0], reverse=True)
-        results = [r[1] for r in results[:n_results]]
-        
-        # Convert to dicts with similarity scores
         contents = []
-        for vec in results:
-            content = vec.full_content.copy()
-            # Calculate similarity for display
-            import numpy as np
-            similarity = np.dot(np.array(vec.embedding), np.array(query_embedding)) / (
-                np.linalg.norm(vec.embedding) * np.linalg.norm(query_embedding)
-            )
-            content["_similarity"] = float(similarity)
+        for content_id, score in ranked:
+            if content_id not in by_id:
+                continue
+            content = dict(by_id[content_id])
+            content["_similarity"] = similarities.get(content_id, 0.0)
+            if mode != "semantic":
+                content["_score"] = score
+            passage = best_passage.get(content_id)
+            if passage:
+                content["_timestamp"] = passage["start"]
+                content["_passage"] = {k: passage[k] for k in ("start", "end", "text")}
             contents.append(content)
-        
+
         return contents
-    
+
+    def _rank_lexical(self, query: str, n_results: int, user_id: int,
+                      content_type: Optional[str] = None, collection_id: Optional[str] = None,
+                      content_ids: Optional[List[str]] = None):
+        """Top content ids by full-text match on searchable_text: [(content_id, rank)]"""
+        if self.db.get_bind().dialect.name == "postgresql":
+            # Same expression as the ix_content_vectors_fts GIN index
+            config = literal_column("'english'::regconfig")
+            tsv = func.to_tsvector(config, ContentVector.searchable_text)
+            tsq = func.websearch_to_tsquery(config, query)
+            rank = func.ts_rank_cd(tsv, tsq)
+            query_obj = self.db.query(ContentVector.id, rank.label("rank")).filter(
+                ContentVector.user_id == user_id,
+                tsv.op("@@")(tsq)
+            )
+            if content_type:
+                query_obj = query_obj.filter(ContentVector.content_type == content_type)
+            if collection_id:
+                query_obj = self._join_collection(query_obj, ContentVector.id, collection_id)
+            if content_ids is not None:
+                query_obj = query_obj.filter(ContentVector.id.in_(content_ids))
+            return [(r.id, float(r.rank)) for r in query_obj.order_by(rank.desc()).limit(n_results).all()]
+
+        # SQLite FTS5: quote every term so user input can't inject query syntax
+        terms = re.findall(r"\w+", query)
+        if not terms:
+            return []
+        sql = (
+            "SELECT cv.id, bm25(content_vectors_fts) AS rank FROM content_vectors_fts "
+            "JOIN content_vectors cv ON cv.rowid = content_vectors_fts.rowid "
+            "WHERE content_vectors_fts MATCH :match AND cv.user_id = :user_id"
+        )
+        params = {"match": " ".join(f'"{t}"' for t in terms), "user_id": user_id, "limit": n_results}
+        if content_type:
+            sql += " AND cv.content_type = :content_type"
+            params["content_type"] = content_type
+        if collection_id:
+            sql += (" AND EXISTS (SELECT 1 FROM collection_items ci "
+                    "WHERE ci.collection_id = :collection_id AND ci.content_id = cv.id)")
+            params["collection_id"] = collection_id
+        statement = text(sql + (" AND cv.id IN :content_ids" if content_ids is not None else "") + " ORDER BY rank LIMIT :limit")
+        if content_ids is not None:
+            statement = statement.bindparams(bindparam("content_ids", expanding=True))
+            params["content_ids"] = content_ids
+        try:
+            rows = self.db.execute(statement, params).fetchall()
+        except Exception as e:
+            print(f"[VectorMemory] Full-text search unavailable (run init_db): {e}")
+            return []
+        # bm25() is lower-is-better; flip so callers can sort descending
+        return [(r[0], -float(r[1])) for r in rows]
+
+    def _rank_contents(self, query_embedding, n_results: int, user_id: int,
+                       content_type: Optional[str] = None, collection_id: Optional[str] = None,
+                       content_ids: Optional[List[str]] = None):
+        """Top content ids by whole-content embedding: [(content_id, similarity)]"""
+        if self._uses_native_vector():
+            # Let pgvector rank: ORDER BY embedding <=> :q LIMIT k (HNSW index)
+            self._prepare_ann_scan()
+            distance = ContentVector.embedding.op("<=>", return_type=Float)(query_embedding)
+            query_obj = self.db.query(
+                ContentVector.id, distance.label("distance")
+            ).filter(ContentVector.user_id == user_id)
+            if content_type:
+                query_obj = query_obj.filter(ContentVector.content_type == content_type)
+            if collection_id:
+                query_obj = self._join_collection(query_obj, ContentVector.id, collection_id)
+            if content_ids is not None:
+                query_obj = query_obj.filter(ContentVector.id.in_(content_ids))
+            rows = query_obj.order_by(distance).limit(n_results).all()
+            return [(row.id, 1.0 - float(row.distance)) for row in rows]
+
+        # Fallback (SQLite / JSON embeddings): vectorized top-k over the cached user matrix,
+        # masked to collection members (indexed lookup) when scoped
+        if collection_id:
+            members = self._collection_member_ids(collection_id, user_id)
+            if content_ids is not None:
+                members = set(members).intersection(content_ids)
+            content_ids = members
+        return self._get_user_matrix(user_id).top_k(
+            query_embedding, n_results, content_type=content_type, content_ids=content_ids
+        )
+
+    def _rank_passages(self, query_embedding, n_passages: int, user_id: int,
+                       content_type: Optional[str] = None, collection_id: Optional[str] = None,
+                       content_ids: Optional[List[str]] = None) -> List[Dict]:
+        """Top transcript passages: [{content_id, start, end, text, similarity}], best first"""
+        if not self._uses_native_vector():
+            return self._rank_passages_cached(query_embedding, n_passages, user_id,
+                                              content_type, collection_id, content_ids)
+
+        self._prepare_ann_scan()
+        distance = TranscriptPassage.embedding.op("<=>", return_type=Float)(query_embedding)
+        query_obj = self.db.query(
+            TranscriptPassage.content_id, TranscriptPassage.start_seconds,
+            TranscriptPassage.end_seconds, TranscriptPassage.text, distance.label("distance")
+        ).filter(TranscriptPassage.user_id == user_id)
+        if content_ids is not None:
+            query_obj = query_obj.filter(TranscriptPassage.content_id.in_(content_ids))
+        if content_type:
+            query_obj = query_obj.join(ContentVector, ContentVector.id == TranscriptPassage.content_id)
+            query_obj = query_obj.filter(ContentVector.content_type == content_type)
+        if collection_id:
+            query_obj = self._join_collection(query_obj, TranscriptPassage.content_id, collection_id)
+
+        return [
+            {"content_id": r.content_id, "start": r.start_seconds, "end": r.end_seconds,
+             "text": r.text, "similarity": 1.0 - float(r.distance)}
+            for r in query_obj.order_by(distance).limit(n_passages).all()
+        ]
+
+    def _rank_passages_cached(self, query_embedding, n_passages: int, user_id: int,
+                              content_type: Optional[str], collection_id: Optional[str],
+                              content_ids: Optional[List[str]]) -> List[Dict]:
+        """Fallback (SQLite / JSON embeddings): top-k over the cached passage matrix,
+        masked to the allowed content ids; text is loaded for the hits only"""
+        if collection_id:
+            members = self._collection_member_ids(collection_id, user_id)
+            content_ids = members if content_ids is None else set(members).intersection(content_ids)
+        if content_type:
+            typed = [row.id for row in self.db.query(ContentVector.id).filter(
+                ContentVector.user_id == user_id,
+                ContentVector.content_type == content_type
+            ).all()]
+            content_ids = typed if content_ids is None else set(typed).intersection(content_ids)
+
+        hits = self._get_passage_matrix(user_id).top_k(query_embedding, n_passages, content_ids=content_ids)
+        if not hits:
+            return []
+        rows = {
+            row.id: row for row in self.db.query(
+                TranscriptPassage.id, TranscriptPassage.content_id, TranscriptPassage.start_seconds,
+                TranscriptPassage.end_seconds, TranscriptPassage.text
+            ).filter(TranscriptPassage.id.in_([passage_id for passage_id, _ in hits])).all()
+        }
+        return [
+            {"content_id": rows[pid].content_id, "start": rows[pid].start_seconds, "end": rows[pid].end_seconds,
+             "text": rows[pid].text, "similarity": similarity}
+            for pid, similarity in hits if pid in rows
+        ]
+
+    def search_passages(
+        self,
+        query: str,
+        n_results: int = 8,
+        content_ids: Optional[List[str]] = None,
+        user_id: Optional[int] = None,
+        collection_id: Optional[str] = None
+    ) -> List[Dict]:
+        """
+        Find the transcript passages most relevant to a query
+
+        Args:
+            query: Search query text
+            n_results: Number of passages to return
+            content_ids: Optional content IDs to restrict to (e.g. per-content chat)
+            user_id: User ID (uses self.user_id if not provided)
+            collection_id: Optional collection ID to scope search
+
+        Returns:
+            [{content_id, start, end, text, similarity}], best first
+        """
+        user_id = user_id or self.user_id
+        if user_id is None:
+            raise ValueError("user_id must be provided")
+
+        query_embedding = self._generate_embedding(query)
+        return self._rank_passages(
+            query_embedding, n_results, user_id,
+            collection_id=collection_id, content_ids=content_ids
+        )
+
+    @staticmethod
+    def _join_collection(query_obj, content_id_column, collection_id: str):
+        """Restrict a query to collection members via the collection_items primary key"""
+        return query_obj.join(CollectionItem, and_(
+            CollectionItem.content_id == content_id_column,
+            CollectionItem.collection_id == collection_id
+        ))
+
+    def _collection_member_ids(self, collection_id: str, user_id: int) -> List[str]:
+        return [
+            row.content_id for row in self.db.query(CollectionItem.content_id).filter(
+                CollectionItem.collection_id == collection_id,
+                CollectionItem.user_id == user_id
+            ).all()
+        ]
+
+    def _matrix_signature(self, user_id: int):
+        """Cheap change detector for a user's rows (catches writes from other processes)."""
+        count, last_updated = self.db.query(
+            func.count(ContentVector.id), func.max(ContentVector.updated_at)
+        ).filter(ContentVector.user_id == user_id).one()
+        return (count, last_updated)
+
+    def _get_user_matrix(self, user_id: int) -> UserMatrix:
+        """Per-user embedding matrix from the process cache, rebuilt when stale."""
+        cache = get_matrix_cache()
+        signature = self._matrix_signature(user_id)
+        entry = cache.get(user_id, signature)
+        if entry is None:
+            rows = self.db.query(
+                ContentVector.id, ContentVector.embedding, ContentVector.content_type
+            ).filter(ContentVector.user_id == user_id).all()
+            entry = UserMatrix(rows, self.EMBEDDING_DIMS, signature=signature)
+            cache.put(user_id, entry)
+        return entry
+
+    def _passage_signature(self, user_id: int):
+        """Passages are only inserted and deleted (never updated), so count + max id
+        changes on every write."""
+        count, last_id = self.db.query(
+            func.count(TranscriptPassage.id), func.max(TranscriptPassage.id)
+        ).filter(TranscriptPassage.user_id == user_id).one()
+        return (count, last_id)
+
+    def _get_passage_matrix(self, user_id: int) -> PassageMatrix:
+        """Per-user passage embedding matrix from the process cache, rebuilt when stale."""
+        cache = get_passage_matrix_cache()
+        signature = self._passage_signature(user_id)
+        entry = cache.get(user_id, signature)
+        if entry is None:
+            rows = self.db.query(
+                TranscriptPassage.id, TranscriptPassage.content_id, TranscriptPassage.embedding
+            ).filter(TranscriptPassage.user_id == user_id).all()
+            entry = PassageMatrix(rows, self.EMBEDDING_DIMS, signature=signature)
+            cache.put(user_id, entry)
+        return entry
+
+    def _signature_before_write(self, user_id: int):
+        """Signature to pass to _patch_user_matrix; read it before writing (None on pgvector)."""
+        if self._uses_native_vector():
+            return None
+        return self._matrix_signature(user_id)
+
+    def _patch_user_matrix(self, user_id: int, apply, before):
+        """Apply a just-committed change to the cached matrix instead of rebuilding it.
+
+        `before` comes from _signature_before_write; a cached matrix that no longer
+        matches it has missed someone else's write and is invalidated instead.
+        """
+        if not self._uses_native_vector():
+            get_matrix_cache().patch(user_id, apply, before, self._matrix_signature(user_id))
+
     def search_by_topic(
         self,
         topics: List[str],
@@ -291,32 +898,32 @@ class VectorMemory:
         query = ", ".join(entity_names)
         query_embedding = self._generate_embedding(query)
         
-        # Search in entity vectors
-        entity_query = self.db.query(EntityVector).filter(
-            EntityVector.user_id == user_id
-        )
-        
-        # Calculate similarity
-        import numpy as np
-        results = []
-        for entity_vec in entity_query.all():
-            similarity = np.dot(np.array(entity_vec.embedding), np.array(query_embedding)) / (
-                np.linalg.norm(entity_vec.embedding) * np.linalg.norm(query_embedding)
-            )
-            results.append((similarity, entity_vec))
-        
-        results.sort(key=lambda x: x[0], reverse=True)
-        results = results[:n_results]
-        
+        if self._uses_native_vector():
+            self._prepare_ann_scan()
+            distance = EntityVector.embedding.op("<=>", return_type=Float)(query_embedding)
+            content_ids = [
+                row.content_id for row in self.db.query(EntityVector.content_id).filter(
+                    EntityVector.user_id == user_id
+                ).order_by(distance).limit(n_results).all()
+            ]
+        else:
+            # Search in entity vectors
+            scored = [
+                (self._cosine_similarity(row.embedding, query_embedding), row.content_id)
+                for row in self.db.query(EntityVector.embedding, EntityVector.content_id).filter(
+                    EntityVector.user_id == user_id
+                ).all()
+            ]
+            scored.sort(key=lambda x: x[0], reverse=True)
+            content_ids = [r[1] for r in scored[:n_results]]
+
         # Get content for matched entities
-        content_ids = [r[1].content_id for r in results]
-        contents = []
-        for content_id in content_ids:
-            content = self.get_content(content_id, user_id)
-            if content:
-                contents.append(content)
-        
-        return contents
+        rows = self.db.query(ContentVector.id, ContentVector.full_content).filter(
+            ContentVector.user_id == user_id,
+            ContentVector.id.in_(content_ids)
+        ).all()
+        by_id = dict(zip([row.id for row in rows], self._with_bodies(rows, user_id)))
+        return [by_id[cid] for cid in dict.fromkeys(content_ids) if cid in by_id]
     
     def get_content(self, content_id: str, user_id: Optional[int] = None) -> Optional[Dict]:
         """Get content by ID"""
@@ -324,26 +931,204 @@ class VectorMemory:
         if user_id is None:
             raise ValueError("user_id must be provided")
         
-        vector = self.db.query(ContentVector).filter(
+        row = self.db.query(ContentVector.id, ContentVector.full_content).filter(
             ContentVector.id == content_id,
             ContentVector.user_id == user_id
         ).first()
-        
-        if vector:
-            return vector.full_content
+
+        if row:
+            return self._with_bodies([row], user_id)[0]
         return None
     
+    def _card_columns(self, fields) -> list:
+        """Projected columns for card fields: real columns plus light JSON paths of full_content."""
+        full = ContentVector.full_content
+        available = {
+            "title": [ContentVector.title],
+            "summary": [ContentVector.summary],
+            "mode": [ContentVector.mode],
+            "content_type": [ContentVector.content_type],
+            "tags": [ContentVector.tags],
+            "topics": [ContentVector.topics],
+            "source_url": [ContentVector.source_url],
+            "has_transcript": [ContentVector.has_transcript],
+            "created_at": [ContentVector.created_at],
+            "updated_at": [ContentVector.updated_at],
+            "duration": [full["duration_seconds"].as_float().label("duration")],
+            "recipe": [full["recipe"].label("recipe")],
+            "thumbnail": [
+                full[("metadata", "youtube_thumbnail")].as_string().label("_youtube_thumbnail"),
+                full[("metadata", "thumbnails", 0, "url")].as_string().label("_thumbnail_url"),
+                full[("metadata", "thumbnails", 0, "filename")].as_string().label("_thumbnail_file"),
+            ],
+        }
+        columns = [ContentVector.id]
+        for name in fields:
+            columns.extend(available.get(name, []))
+        return columns
+
+    @staticmethod
+    def _card_from_row(row, fields) -> Dict:
+        values = row._mapping
+        card = {"id": values["id"]}
+        for name in fields:
+            if name == "thumbnail":
+                # Same priority as the frontend: YouTube > blob URL > local thumbnail proxy
+                card["thumbnail"] = (
+                    values["_youtube_thumbnail"] or values["_thumbnail_url"]
+                    or (f"/api/thumbnails/{values['id']}/{values['_thumbnail_file']}"
+                        if values["_thumbnail_file"] else None)
+                )
+            elif name in ("created_at", "updated_at"):
+                card[name] = values[name].isoformat() if values[name] else None
+            elif name in ("tags", "topics"):
+                card[name] = values[name] or []
+            elif name not in ("id", "collections"):  # collections: see _attach_collections
+                card[name] = values[name]
+        return card
+
+    def _resolve_fields(self, fields: Optional[Iterable[str]]) -> List[str]:
+        if fields is None:
+            return list(self.CARD_FIELDS)
+        fields = list(dict.fromkeys(fields))
+        unknown = [f for f in fields if f not in self.CARD_FIELDS + self.OPTIONAL_CARD_FIELDS]
+        if unknown:
+            raise ValueError(f"Unknown fields: {', '.join(unknown)}")
+        return fields
+
+    def get_cards(self, content_ids: List[str], user_id: Optional[int] = None,
+                  fields: Optional[Iterable[str]] = None) -> List[Dict]:
+        """Card fields for the given content IDs, in the given order (one query, no full_content)"""
+        user_id = user_id or self.user_id
+        if user_id is None:
+            raise ValueError("user_id must be provided")
+        if not content_ids:
+            return []
+
+        fields = self._resolve_fields(fields)
+        rows = self.db.query(*self._card_columns(fields)).filter(
+            ContentVector.user_id == user_id,
+            ContentVector.id.in_(content_ids)
+        ).all()
+        by_id = {row.id: self._card_from_row(row, fields) for row in rows}
+        cards = [by_id[cid] for cid in content_ids if cid in by_id]
+        if "collections" in fields:
+            self._attach_collections(cards, user_id)
+        return cards
+
+    def _attach_collections(self, cards: List[Dict], user_id: int):
+        """Fill each card's collection IDs with one indexed query for the page"""
+        by_content = {card["id"]: [] for card in cards}
+        if by_content:
+            for row in self.db.query(CollectionItem.content_id, CollectionItem.collection_id).filter(
+                CollectionItem.user_id == user_id,
+                CollectionItem.content_id.in_(list(by_content))
+            ).order_by(CollectionItem.added_at).all():
+                by_content[row.content_id].append(row.collection_id)
+        for card in cards:
+            card["collections"] = by_content[card["id"]]
+
+    @staticmethod
+    def _encode_cursor(sort_value, content_id: str) -> str:
+        if isinstance(sort_value, datetime):
+            sort_value = sort_value.isoformat()
+        raw = json.dumps([sort_value, content_id]).encode("utf-8")
+        return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+    @staticmethod
+    def _decode_cursor(cursor: str, sort: str):
+        try:
+            raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+            sort_value, content_id = json.loads(raw)
+            if sort != "title":
+                sort_value = datetime.fromisoformat(sort_value)
+            return sort_value, str(content_id)
+        except Exception:
+            raise ValueError("Invalid cursor")
+
+    def list_page(
+        self,
+        user_id: Optional[int] = None,
+        limit: int = 50,
+        cursor: Optional[str] = None,
+        sort: str = "created_at",
+        descending: bool = True,
+        mode: Optional[str] = None,
+        content_type: Optional[str] = None,
+        tag: Optional[str] = None,
+        fields: Optional[Iterable[str]] = None
+    ) -> Tuple[List[Dict], Optional[str]]:
+        """
+        One page of the library as card dicts, keyset-paginated on (sort column, id)
+
+        Args:
+            user_id: User ID (uses self.user_id if not provided)
+            limit: Page size
+            cursor: Opaque cursor from the previous page's next_cursor
+            sort: One of LIBRARY_SORTS
+            descending: Sort direction
+            mode: Filter by mode (recipe, learn, ...)
+            content_type: Filter by content type
+            tag: Filter by extracted tag
+            fields: Card fields to return (defaults to CARD_FIELDS)
+
+        Returns:
+            (cards, next_cursor) — next_cursor is None on the last page
+        """
+        user_id = user_id or self.user_id
+        if user_id is None:
+            raise ValueError("user_id must be provided")
+        if sort not in self.LIBRARY_SORTS:
+            raise ValueError(f"sort must be one of {self.LIBRARY_SORTS}")
+        fields = self._resolve_fields(fields)
+
+        sort_column = getattr(ContentVector, sort)
+        query_obj = self.db.query(
+            *self._card_columns(fields), sort_column.label("_sort_key")
+        ).filter(ContentVector.user_id == user_id)
+        if mode:
+            query_obj = query_obj.filter(ContentVector.mode == mode)
+        if content_type:
+            query_obj = query_obj.filter(ContentVector.content_type == content_type)
+        if tag:
+            if self.db.get_bind().dialect.name == "postgresql":
+                query_obj = query_obj.filter(cast(ContentVector.tags, JSONB).contains([tag]))
+            else:
+                query_obj = query_obj.filter(text(
+                    "EXISTS (SELECT 1 FROM json_each(content_vectors.tags) WHERE json_each.value = :tag)"
+                ).bindparams(tag=tag))
+        if cursor:
+            key = tuple_(sort_column, ContentVector.id)
+            after = tuple_(*self._decode_cursor(cursor, sort))
+            query_obj = query_obj.filter(key < after if descending else key > after)
+
+        if descending:
+            query_obj = query_obj.order_by(sort_column.desc(), ContentVector.id.desc())
+        else:
+            query_obj = query_obj.order_by(sort_column.asc(), ContentVector.id.asc())
+
+        # One extra row tells us whether another page exists
+        rows = query_obj.limit(limit + 1).all()
+        next_cursor = None
+        if len(rows) > limit:
+            rows = rows[:limit]
+            next_cursor = self._encode_cursor(rows[-1]._sort_key, rows[-1].id)
+        cards = [self._card_from_row(row, fields) for row in rows]
+        if "collections" in fields:
+            self._attach_collections(cards, user_id)
+        return cards, next_cursor
+
     def list_all(self, user_id: Optional[int] = None) -> List[Dict]:
         """List all content for user (returns full content dicts)"""
         user_id = user_id or self.user_id
         if user_id is None:
             raise ValueError("user_id must be provided")
         
-        vectors = self.db.query(ContentVector).filter(
+        rows = self.db.query(ContentVector.id, ContentVector.full_content).filter(
             ContentVector.user_id == user_id
         ).order_by(ContentVector.created_at.desc()).all()
 
-        return [v.full_content for v in vectors]
+        return self._with_bodies(rows, user_id)
     
     def count_user_content(self, user_id: int) -> int:
         """Count content for user"""
@@ -368,8 +1153,15 @@ class VectorMemory:
         if not vector:
             return False
 
-        vector.full_content = content
+        light, body = self._split_body(content)
+        vector.full_content = light
         vector.updated_at = datetime.utcnow()
+        if body:
+            existing_body = self.db.query(ContentBody).filter(
+                ContentBody.content_id == content_id,
+                ContentBody.user_id == user_id
+            ).first()
+            self._write_body(content_id, user_id, body, existing_body)
         self.db.commit()
         return True
 
@@ -379,11 +1171,25 @@ class VectorMemory:
         if user_id is None:
             raise ValueError("user_id must be provided")
 
-        # Delete entities first
+        signature_before = self._signature_before_write(user_id)
+
+        # Delete entities, passages and collection memberships first
         self.db.query(EntityVector).filter(
             EntityVector.content_id == content_id,
             EntityVector.user_id == user_id
         ).delete()
+        self.db.query(TranscriptPassage).filter(
+            TranscriptPassage.content_id == content_id,
+            TranscriptPassage.user_id == user_id
+        ).delete()
+        self.db.query(CollectionItem).filter(
+            CollectionItem.content_id == content_id,
+            CollectionItem.user_id == user_id
+        ).delete()
+        self.db.query(ContentBody).filter(
+            ContentBody.content_id == content_id,
+            ContentBody.user_id == user_id
+        ).delete()
 
         # Delete content
         deleted = self.db.query(ContentVector).filter(
@@ -392,6 +1198,8 @@ class VectorMemory:
         ).delete()
 
         self.db.commit()
+        if deleted:
+            self._patch_user_matrix(user_id, lambda m: m.remove(content_id), signature_before)
         return deleted > 0
 
     # =============================================
@@ -417,7 +1225,7 @@ class VectorMemory:
         return collection_id
 
     def get_collections(self, user_id: Optional[int] = None) -> List[Dict]:
-        """List all collections for a user"""
+        """List all collections for a user (with item counts)"""
         user_id = user_id or self.user_id
         if user_id is None:
             raise ValueError("user_id must be provided")
@@ -425,6 +1233,9 @@ class VectorMemory:
         rows = self.db.query(Collection).filter(
             Collection.user_id == user_id
         ).order_by(Collection.created_at.desc()).all()
+        counts = dict(self.db.query(
+            CollectionItem.collection_id, func.count(CollectionItem.content_id)
+        ).filter(CollectionItem.user_id == user_id).group_by(CollectionItem.collection_id).all())
 
         return [
             {
@@ -432,6 +1243,7 @@ class VectorMemory:
                 "name": r.name,
                 "description": r.description or "",
                 "created_at": r.created_at.isoformat() if r.created_at else "",
+                "content_count": counts.get(r.id, 0),
             }
             for r in rows
         ]
@@ -446,6 +1258,10 @@ class VectorMemory:
             Collection.id == collection_id,
             Collection.user_id == user_id,
         ).delete()
+        if deleted:
+            self.db.query(CollectionItem).filter(
+                CollectionItem.collection_id == collection_id
+            ).delete(synchronize_session=False)
         self.db.commit()
         return deleted > 0
 
@@ -455,22 +1271,35 @@ class VectorMemory:
         if user_id is None:
             raise ValueError("user_id must be provided")
 
-        vec = self.db.query(ContentVector).filter(
+        # Single INSERT ... SELECT: only inserts when the user owns both the content
+        # and the collection, and is a no-op when it's already in the collection
+        if self.db.get_bind().dialect.name == "postgresql":
+            from sqlalchemy.dialects.postgresql import insert
+        else:
+            from sqlalchemy.dialects.sqlite import insert
+        owned = self.db.query(
+            Collection.id, ContentVector.id, ContentVector.user_id, literal(datetime.utcnow())
+        ).join(Collection, and_(
+            Collection.id == collection_id,
+            Collection.user_id == ContentVector.user_id,
+        )).filter(
             ContentVector.id == content_id,
             ContentVector.user_id == user_id,
-        ).first()
-        if not vec:
-            return False
-
-        cols = vec.collections or []
-        if collection_id not in cols:
-            cols.append(collection_id)
-            vec.collections = cols
-            # Force SQLAlchemy to detect the change on a mutable JSON field
-            from sqlalchemy.orm.attributes import flag_modified
-            flag_modified(vec, "collections")
-            self.db.commit()
-        return True
+        )
+        inserted = self.db.execute(
+            insert(CollectionItem).from_select(
+                ["collection_id", "content_id", "user_id", "added_at"], owned.statement
+            ).on_conflict_do_nothing(index_elements=["collection_id", "content_id"])
+        ).rowcount
+        self.db.commit()
+        if inserted:
+            return True
+        # Nothing inserted: already a member (True) or not the user's content/collection (False)
+        return self.db.query(CollectionItem.content_id).filter(
+            CollectionItem.collection_id == collection_id,
+            CollectionItem.content_id == content_id,
+            CollectionItem.user_id == user_id,
+        ).first() is not None
 
     def remove_from_collection(self, content_id: str, collection_id: str, user_id: Optional[int] = None) -> bool:
         """Remove content from a collection"""
@@ -478,25 +1307,16 @@ class VectorMemory:
         if user_id is None:
             raise ValueError("user_id must be provided")
 
-        vec = self.db.query(ContentVector).filter(
-            ContentVector.id == content_id,
-            ContentVector.user_id == user_id,
-        ).first()
-        if not vec:
-            return False
-
-        cols = vec.collections or []
-        if collection_id in cols:
-            cols.remove(collection_id)
-            vec.collections = cols
-            from sqlalchemy.orm.attributes import flag_modified
-            flag_modified(vec, "collections")
-            self.db.commit()
-            return True
-        return False
+        deleted = self.db.query(CollectionItem).filter(
+            CollectionItem.collection_id == collection_id,
+            CollectionItem.content_id == content_id,
+            CollectionItem.user_id == user_id,
+        ).delete(synchronize_session=False)
+        self.db.commit()
+        return deleted > 0
 
     def get_collection_contents(self, collection_id: str, user_id: Optional[int] = None, full: bool = False) -> List[Dict]:
-        """Get all content in a collection
+        """Get all content in a collection (most recently added first)
 
         Args:
             collection_id: Collection ID
@@ -508,28 +1328,29 @@ class VectorMemory:
             raise ValueError("user_id must be provided")
 
         if full:
-            # Need full_content for chat context — but not embedding/searchable_text (already deferred)
-            vectors = self.db.query(ContentVector).filter(
-                ContentVector.user_id == user_id
-            ).all()
-            return [v.full_content for v in vectors if collection_id in (v.collections or [])]
+            # Need full content for chat context — only for the collection's rows
+            query_obj = self.db.query(ContentVector.id, ContentVector.full_content)
         else:
             # Only need lightweight metadata columns
-            rows = self.db.query(
+            query_obj = self.db.query(
                 ContentVector.id, ContentVector.title, ContentVector.summary,
-                ContentVector.content_type, ContentVector.tags, ContentVector.topics,
-                ContentVector.collections
-            ).filter(
-                ContentVector.user_id == user_id
-            ).all()
-            return [
-                {
-                    "id": r.id,
-                    "title": r.title or "Untitled",
-                    "summary": r.summary or "",
-                    "content_type": r.content_type or "video",
-                    "tags": r.tags or [],
-                    "topics": r.topics or [],
-                }
-                for r in rows if collection_id in (r.collections or [])
-            ]
+                ContentVector.content_type, ContentVector.tags, ContentVector.topics
+            )
+        rows = self._join_collection(query_obj, ContentVector.id, collection_id).filter(
+            CollectionItem.user_id == user_id,
+            ContentVector.user_id == user_id
+        ).order_by(CollectionItem.added_at.desc()).all()
+
+        if full:
+            return self._with_bodies(rows, user_id)
+        return [
+            {
+                "id": r.id,
+                "title": r.title or "Untitled",
+                "summary": r.summary or "",
+                "content_type": r.content_type or "video",
+                "tags": r.tags or [],
+                "topics": r.topics or [],
+            }
+            for r in rows
+        ]
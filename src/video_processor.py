@@ -8,9 +8,14 @@ import os
 import sys
 import base64
 from pathlib import Path
-from typing import List, Tuple
+from dataclasses import dataclass
+from typing import List, Optional
 import subprocess
 
+from config import get_config
+from media_cache import get_media_cache, media_source_key
+from ytdlp_engine import get_ytdlp_engine
+
 
 def _find_conda_executable(name: str, subdir: str = "Library/bin") -> str:
     """Find an executable, preferring full system builds over conda-bundled ones."""
@@ -91,39 +96,30 @@ def fetch_youtube_captions(video_id: str, preferred_languages=None) -> dict | No
     try:
         ytt_api = YouTubeTranscriptApi()
 
-        # Try fetching transcript in preferred languages
+        # One listing request; it also tells us the language and whether the
+        # track is auto-generated, so nothing needs to be listed again
         try:
-            transcript = ytt_api.fetch(video_id, languages=preferred_languages)
+            transcript_list = ytt_api.list(video_id)
+        except Exception:
+            return None
+        try:
+            # Prefers manually created tracks over generated ones
+            track = transcript_list.find_transcript(preferred_languages)
         except Exception:
             # Fall back to any available language
-            try:
-                transcript_list = ytt_api.list(video_id)
-                if not transcript_list:
-                    return None
-                # Pick first available transcript
-                first = transcript_list[0]
-                transcript = ytt_api.fetch(video_id, languages=[first.language_code])
-            except Exception:
+            track = next(iter(transcript_list), None)
+            if track is None:
                 return None
+        try:
+            transcript = track.fetch()
+        except Exception:
+            return None
 
         if not transcript or not transcript.snippets:
             return None
 
-        # Determine language and if auto-generated
-        detected_language = "en"
-        is_auto_generated = False
-        try:
-            transcript_list = ytt_api.list(video_id)
-            for t in transcript_list:
-                if t.language_code in preferred_languages or not detected_language:
-                    detected_language = t.language_code
-                    is_auto_generated = t.is_generated
-                    break
-            if transcript_list:
-                detected_language = transcript_list[0].language_code
-                is_auto_generated = transcript_list[0].is_generated
-        except Exception:
-            pass
+        detected_language = track.language_code
+        is_auto_generated = track.is_generated
 
         # Convert to Whisper-compatible format
         segments = []
@@ -168,13 +164,21 @@ def get_video_metadata_fast(url: str, cookies_file: str = None) -> dict:
     Uses yt-dlp --no-download + --print to get duration, title, stats, etc.
     Needed for credit billing when using the caption fast path.
     """
-    ytdlp = get_ytdlp_path()
-
     meta_fields = [
         "duration", "title", "view_count", "like_count",
         "comment_count", "channel_follower_count", "upload_date",
         "uploader", "categories", "description", "id",
     ]
+
+    engine = get_ytdlp_engine()
+    if engine:
+        try:
+            # Cached info dict is reused if this job downloads the video later
+            return engine.get_metadata(url, meta_fields, cookies_file=cookies_file)
+        except Exception as e:
+            print(f"  In-process yt-dlp metadata failed, using subprocess: {e}")
+
+    ytdlp = get_ytdlp_path()
     print_template = "|||".join(f"%({f})s" for f in meta_fields)
 
     cmd = [
@@ -195,6 +199,21 @@ def get_video_metadata_fast(url: str, cookies_file: str = None) -> dict:
     return metadata
 
 
+VIDEO_EXTENSIONS = (".mp4", ".webm", ".mkv")
+AUDIO_EXTENSIONS = (".m4a", ".opus", ".webm")
+
+
+def _find_downloaded(output_dir: str, video_id: str, extensions) -> str | None:
+    """Path yt-dlp's "%(id)s.%(ext)s" template produced, checked by name (no directory scan)"""
+    if not video_id:
+        return None
+    for ext in extensions:
+        path = os.path.join(output_dir, f"{video_id}{ext}")
+        if os.path.exists(path):
+            return path
+    return None
+
+
 def download_video(url: str, output_dir: str = "data/videos", cookies_file: str = None) -> str:
     """Download video from YouTube or other platforms using yt-dlp"""
     os.makedirs(output_dir, exist_ok=True)
@@ -204,13 +223,20 @@ def download_video(url: str, output_dir: str = "data/videos", cookies_file: str
 
     # Check if already downloaded (skip redundant yt-dlp calls)
     video_id = _extract_video_id(url)
-    if video_id:
-        for ext in ['*.mp4', '*.webm', '*.mkv']:
-            files = [f for f in Path(output_dir).glob(ext) if video_id in f.stem]
-            if files:
-                cached = str(max(files, key=os.path.getmtime))
-                print(f"  Video already downloaded: {cached}")
-                return cached
+    cache = get_media_cache(output_dir)
+    source_key = media_source_key(url)
+    cached = cache.lookup(source_key, "video")
+    if cached:
+        print(f"  Video already downloaded: {cached}")
+        return cached
+
+    engine = get_ytdlp_engine()
+    if engine:
+        try:
+            path, _info = engine.download(url, "video", output_dir, cookies_file=cookies_file)
+            return cache.insert(source_key, "video", path)
+        except Exception as e:
+            print(f"  In-process yt-dlp download failed, using subprocess: {e}")
 
     ytdlp = get_ytdlp_path()
 
@@ -237,35 +263,24 @@ def download_video(url: str, output_dir: str = "data/videos", cookies_file: str
     # --print after_move:filepath prints the final path as the last line of stdout
     printed_path = result.stdout.strip().split('\n')[-1].strip() if result.stdout.strip() else None
     if printed_path and Path(printed_path).exists():
-        return printed_path
+        return cache.insert(source_key, "video", printed_path)
 
     # Parse output for the actual downloaded file
     for line in result.stdout.split('\n'):
+        path = None
         if '[download] Destination:' in line:
             path = line.split('Destination:', 1)[1].strip()
-            if Path(path).exists():
-                return path
-        if 'has already been downloaded' in line:
+        elif 'has already been downloaded' in line:
             path = line.split('] ', 1)[1].replace(' has already been downloaded', '').strip()
-            if Path(path).exists():
-                return path
-        if '[Merger] Merging formats into' in line:
+        elif '[Merger] Merging formats into' in line:
             path = line.split('into "', 1)[1].rstrip('"').strip()
-            if Path(path).exists():
-                return path
-
-    # Fallback: find most recent file with the video ID in the name
-    if video_id:
-        for ext in ['*.mp4', '*.webm', '*.mkv']:
-            files = [f for f in Path(output_dir).glob(ext) if video_id in str(f)]
-            if files:
-                return str(max(files, key=os.path.getmtime))
-
-    # Final fallback: most recent video file
-    for ext in ['*.mp4', '*.webm', '*.mkv']:
-        files = list(Path(output_dir).glob(ext))
-        if files:
-            return str(max(files, key=os.path.getmtime))
+        if path and Path(path).exists():
+            return cache.insert(source_key, "video", path)
+
+    # Fallback: the file the output template names
+    path = _find_downloaded(output_dir, video_id, VIDEO_EXTENSIONS)
+    if path:
+        return cache.insert(source_key, "video", path)
 
     raise Exception("Could not find downloaded video")
 
@@ -282,13 +297,20 @@ def download_audio(url: str, output_dir: str = "data/videos", cookies_file: str
 
     # Check if audio already downloaded
     video_id = _extract_video_id(url)
-    if video_id:
-        for ext in ['*.m4a', '*.opus', '*.webm']:
-            files = [f for f in Path(output_dir).glob(ext) if video_id in f.stem]
-            if files:
-                cached = str(max(files, key=os.path.getmtime))
-                print(f"  Audio already downloaded: {cached}")
-                return cached
+    cache = get_media_cache(output_dir)
+    source_key = media_source_key(url)
+    cached = cache.lookup(source_key, "audio")
+    if cached:
+        print(f"  Audio already downloaded: {cached}")
+        return cached
+
+    engine = get_ytdlp_engine()
+    if engine:
+        try:
+            path, _info = engine.download(url, "audio", output_dir, cookies_file=cookies_file)
+            return cache.insert(source_key, "audio", path)
+        except Exception as e:
+            print(f"  In-process yt-dlp download failed, using subprocess: {e}")
 
     ytdlp = get_ytdlp_path()
 
@@ -315,14 +337,12 @@ def download_audio(url: str, output_dir: str = "data/videos", cookies_file: str
     # --print after_move:filepath prints the final path
     printed_path = result.stdout.strip().split('\n')[-1].strip() if result.stdout.strip() else None
     if printed_path and Path(printed_path).exists():
-        return printed_path
+        return cache.insert(source_key, "audio", printed_path)
 
-    # Fallback: find most recent audio file with the video ID
-    if video_id:
-        for ext in ['*.m4a', '*.opus', '*.webm']:
-            files = [f for f in Path(output_dir).glob(ext) if video_id in str(f)]
-            if files:
-                return str(max(files, key=os.path.getmtime))
+    # Fallback: the file the output template names
+    path = _find_downloaded(output_dir, video_id, AUDIO_EXTENSIONS)
+    if path:
+        return cache.insert(source_key, "audio", path)
 
     raise Exception("Could not find downloaded audio")
 
@@ -342,15 +362,9 @@ def download_audio_with_metadata(
 
     # Check if audio already downloaded — still need metadata though
     video_id = _extract_video_id(url)
-    cached_audio = None
-    if video_id:
-        for ext in ['*.m4a', '*.opus', '*.webm']:
-            files = [f for f in Path(output_dir).glob(ext) if video_id in f.stem]
-            if files:
-                cached_audio = str(max(files, key=os.path.getmtime))
-                break
-
-    ytdlp = get_ytdlp_path()
+    cache = get_media_cache(output_dir)
+    source_key = media_source_key(url)
+    cached_audio = cache.lookup(source_key, "audio")
 
     # Metadata fields to extract via --print (one per line)
     meta_fields = [
@@ -358,6 +372,21 @@ def download_audio_with_metadata(
         "comment_count", "channel_follower_count", "upload_date",
         "uploader", "categories", "description", "id",
     ]
+
+    engine = get_ytdlp_engine()
+    if engine:
+        try:
+            if cached_audio:
+                print(f"  Audio already downloaded: {cached_audio}")
+                return cached_audio, engine.get_metadata(url, meta_fields, cookies_file=cookies_file)
+            # Metadata comes from the same extraction the download used
+            path, _info = engine.download(url, "audio", output_dir, cookies_file=cookies_file)
+            metadata = engine.get_metadata(url, meta_fields, cookies_file=cookies_file)
+            return cache.insert(source_key, "audio", path), metadata
+        except Exception as e:
+            print(f"  In-process yt-dlp failed, using subprocess: {e}")
+
+    ytdlp = get_ytdlp_path()
     # Build --print flags: each field printed on its own line after download
     print_template = "|||".join(f"%({f})s" for f in meta_fields)
 
@@ -422,18 +451,108 @@ def download_audio_with_metadata(
             break
 
     if not audio_path:
-        # Fallback: find most recent audio file
-        if video_id:
-            for ext in ['*.m4a', '*.opus', '*.webm']:
-                files = [f for f in Path(output_dir).glob(ext) if video_id in str(f)]
-                if files:
-                    audio_path = str(max(files, key=os.path.getmtime))
-                    break
+        # Fallback: the file the output template names
+        audio_path = _find_downloaded(output_dir, video_id, AUDIO_EXTENSIONS)
 
     if not audio_path:
         raise Exception("Could not find downloaded audio")
 
-    return audio_path, metadata
+    return cache.insert(source_key, "audio", audio_path), metadata
+
+
+STREAM_FULL_AUDIO = "full.opus"
+
+
+def stream_audio_segments(
+    url: str,
+    segment_dir: str,
+    segment_seconds: int = 300,
+    kbps: int = 16,
+    cookies_file: str = None,
+    poll_seconds: float = 0.5
+):
+    """Download audio and cut it into segments while it is still downloading.
+
+    yt-dlp writes the audio stream to a pipe; ffmpeg re-encodes it as mono
+    16 kHz Opus (the transcriber's speech format) and its tee muxer writes
+    both `segment_seconds` long .webm segments and the whole recording
+    (segment_dir/STREAM_FULL_AUDIO, for diarization and the media cache).
+
+    Yields:
+        (segment_path, start_seconds, end_seconds) for each segment as soon as
+        ffmpeg has closed it, in order. Raises if yt-dlp or ffmpeg fails.
+    """
+    import csv
+    import io
+    import time
+
+    os.makedirs(segment_dir, exist_ok=True)
+    download_cmd = [
+        get_ytdlp_path(),
+        # Matroska/WebM reads fine from a pipe; a non-fragmented m4a may not
+        "-f", "bestaudio[ext=webm]/bestaudio",
+        "-o", "-",
+        "--no-playlist", "--js-runtimes", "node", "--remote-components", "ejs:github",
+        "--no-progress",
+    ]
+    if cookies_file:
+        download_cmd.extend(["--cookies", cookies_file])
+    download_cmd.append(url)
+
+    # Relative paths (cwd=segment_dir) keep drive letters and other
+    # separators out of the tee muxer's option syntax
+    segment_cmd = [
+        get_ffmpeg_path(), "-y", "-v", "error",
+        "-i", "pipe:0",
+        "-vn", "-map", "0:a:0", "-ac", "1", "-ar", "16000",
+        "-c:a", "libopus", "-b:a", f"{kbps}k", "-application", "voip", "-compression_level", "5",
+        "-f", "tee",
+        f"[f=segment:segment_time={segment_seconds}:segment_format=webm:reset_timestamps=1"
+        f":segment_list=segments.csv:segment_list_type=csv]seg%04d.webm"
+        f"|[f=ogg]{STREAM_FULL_AUDIO}",
+    ]
+
+    list_path = os.path.join(segment_dir, "segments.csv")
+    # Logs go to files: an unread stderr pipe would stall either process
+    with open(os.path.join(segment_dir, "download.log"), "w+") as download_log, \
+            open(os.path.join(segment_dir, "segment.log"), "w+") as segment_log:
+        download = subprocess.Popen(download_cmd, stdout=subprocess.PIPE, stderr=download_log)
+        segmenter = subprocess.Popen(
+            segment_cmd, stdin=download.stdout, stderr=segment_log, cwd=segment_dir
+        )
+        download.stdout.close()  # ffmpeg holds the only read end now
+
+        yielded = 0
+        try:
+            while True:
+                finished = segmenter.poll() is not None
+                # The muxer adds a row only after it has closed that segment.
+                # Parse complete lines only: ffmpeg may be mid-way through the last one
+                if os.path.exists(list_path):
+                    with open(list_path, newline="") as f:
+                        listed = f.read()
+                    listed = listed[:listed.rfind("\n") + 1]
+                    rows = [row for row in csv.reader(io.StringIO(listed)) if row]
+                    for name, start, end in rows[yielded:]:
+                        yielded += 1
+                        yield os.path.join(segment_dir, name), float(start), float(end)
+                if finished:
+                    break
+                time.sleep(poll_seconds)
+
+            download_code = download.wait()
+            if download_code != 0:
+                download_log.seek(0)
+                raise Exception(f"Failed to download audio: {download_log.read()[-2000:]}")
+            if segmenter.returncode != 0:
+                segment_log.seek(0)
+                raise RuntimeError(f"Failed to segment audio stream: {segment_log.read()[-2000:]}")
+        finally:
+            # Consumer gave up or something failed: don't leave either process running
+            for proc in (download, segmenter):
+                if proc.poll() is None:
+                    proc.kill()
+                    proc.wait()
 
 
 def _parse_metadata_output(output: str, fields: list) -> dict:
@@ -505,15 +624,54 @@ def extract_audio(video_path: str, output_path: str = None) -> str:
     return output_path
 
 
+FRAME_BACKENDS = ("ffmpeg", "grab", "seek")
+MAX_FRAME_WIDTH = 1280  # 720p-ish analysis frames
+THUMBNAIL_WIDTH = 320
+
+
+class Frame:
+    """A sampled video frame, held as raw JPEG bytes.
+
+    Both encodes are made from the decoded frame at extraction time: `jpeg`
+    (analysis size, up to MAX_FRAME_WIDTH) and `thumbnail` (THUMBNAIL_WIDTH).
+    Base64 only happens when a vision API request needs it (`base64`).
+    """
+    __slots__ = ("timestamp", "jpeg", "thumbnail", "width", "height")
+
+    def __init__(self, timestamp: float, jpeg: bytes, thumbnail: bytes, width: int, height: int):
+        self.timestamp = timestamp
+        self.jpeg = jpeg
+        self.thumbnail = thumbnail
+        self.width = width
+        self.height = height
+
+    @property
+    def base64(self) -> str:
+        """Analysis JPEG as base64 (computed on each access, not kept)"""
+        return base64.b64encode(self.jpeg).decode("ascii")
+
+    def __repr__(self):
+        return f"Frame({self.timestamp:.1f}s, {self.width}x{self.height}, {len(self.jpeg)} bytes)"
+
+
 def extract_frames(
     video_path: str,
     interval_seconds: int = 30,
-    max_frames: int = 20
-) -> List[Tuple[float, str]]:
+    max_frames: int = 20,
+    backend: str = None
+) -> List[Frame]:
     """
     Extract key frames from video at regular intervals
-    Returns list of (timestamp, base64_image) tuples
+    Returns a list of Frame records in time order
+
+    backend: "ffmpeg" (single sequential pass), "grab" (cv2 grab() between
+    samples) or "seek" (cv2 seek per sample); defaults to config.video.frame_backend.
+    All backends sample the same frame indices.
     """
+    backend = (backend or get_config().video.frame_backend).lower()
+    if backend not in FRAME_BACKENDS:
+        raise ValueError(f"backend must be one of {FRAME_BACKENDS}")
+
     cap = cv2.VideoCapture(video_path)
 
     if not cap.isOpened():
@@ -521,66 +679,152 @@ def extract_frames(
 
     fps = cap.get(cv2.CAP_PROP_FPS)
     total_frames = int(cap.get(cv2.CAP_PROP_FRAME_COUNT))
+    cap.release()
     duration = total_frames / fps
 
-    frames = []
     frame_interval = int(fps * interval_seconds)
 
     # Adjust interval if we'd get too many frames
     if duration / interval_seconds > max_frames:
         interval_seconds = duration / max_frames
         frame_interval = int(fps * interval_seconds)
+    frame_interval = max(frame_interval, 1)
 
-    current_frame = 0
-
-    while True:
-        cap.set(cv2.CAP_PROP_POS_FRAMES, current_frame)
-        ret, frame = cap.read()
+    frames = []
+    if backend == "ffmpeg":
+        try:
+            for timestamp, image in _decode_frames_ffmpeg(video_path, fps, total_frames, frame_interval):
+                frames.append(_encode_frame(timestamp, image))
+        except Exception as e:
+            if frames:
+                print(f"Warning: ffmpeg frame extraction stopped early: {e}")
+            else:
+                print(f"Warning: ffmpeg frame extraction failed, falling back to cv2 grab: {e}")
+                backend = "grab"
+
+    if backend == "grab":
+        decoded = _decode_frames_cv2_grab(video_path, fps, total_frames, frame_interval)
+    elif backend == "seek":
+        decoded = _decode_frames_cv2_seek(video_path, fps, total_frames, frame_interval)
+    else:
+        decoded = ()
+    for timestamp, image in decoded:
+        frames.append(_encode_frame(timestamp, image))
+
+    print(f"Extracted {len(frames)} frames from {duration:.1f}s video ({backend})")
+    return frames
 
-        if not ret:
-            break
 
-        # Resize for efficiency (720p max)
+def _encode_frame(timestamp: float, frame) -> Frame:
+    """Encode a decoded BGR frame as the analysis JPEG (<= MAX_FRAME_WIDTH, q85)
+    and the thumbnail JPEG (THUMBNAIL_WIDTH, q80)"""
+    height, width = frame.shape[:2]
+    if width > MAX_FRAME_WIDTH:
+        scale = MAX_FRAME_WIDTH / width
+        frame = cv2.resize(frame, (MAX_FRAME_WIDTH, int(height * scale)))
         height, width = frame.shape[:2]
-        if width > 1280:
-            scale = 1280 / width
-            frame = cv2.resize(frame, (1280, int(height * scale)))
 
-        # Convert to base64
-        _, buffer = cv2.imencode('.jpg', frame, [cv2.IMWRITE_JPEG_QUALITY, 85])
-        base64_image = base64.b64encode(buffer).decode('utf-8')
+    _, buffer = cv2.imencode('.jpg', frame, [cv2.IMWRITE_JPEG_QUALITY, 85])
 
-        timestamp = current_frame / fps
-        frames.append((timestamp, base64_image))
+    thumb = cv2.resize(
+        frame, (THUMBNAIL_WIDTH, int(height * THUMBNAIL_WIDTH / width)),
+        interpolation=cv2.INTER_AREA
+    )
+    _, thumb_buffer = cv2.imencode('.jpg', thumb, [cv2.IMWRITE_JPEG_QUALITY, 80])
 
-        current_frame += frame_interval
+    return Frame(timestamp, buffer.tobytes(), thumb_buffer.tobytes(), width, height)
 
-        if current_frame >= total_frames:
-            break
 
-    cap.release()
+def _decode_frames_cv2_seek(video_path: str, fps: float, total_frames: int, frame_interval: int):
+    """Seek to every sampled frame (each seek decodes from the previous keyframe)"""
+    cap = cv2.VideoCapture(video_path)
+    try:
+        for current_frame in range(0, total_frames, frame_interval):
+            cap.set(cv2.CAP_PROP_POS_FRAMES, current_frame)
+            ret, frame = cap.read()
+            if not ret:
+                break
+            yield current_frame / fps, frame
+    finally:
+        cap.release()
+
+
+def _decode_frames_cv2_grab(video_path: str, fps: float, total_frames: int, frame_interval: int):
+    """Read sequentially; grab() skips the colour conversion of unsampled frames"""
+    cap = cv2.VideoCapture(video_path)
+    try:
+        for current_frame in range(0, total_frames):
+            if current_frame % frame_interval:
+                if not cap.grab():
+                    break
+                continue
+            ret, frame = cap.read()
+            if not ret:
+                break
+            yield current_frame / fps, frame
+    finally:
+        cap.release()
 
-    print(f"Extracted {len(frames)} frames from {duration:.1f}s video")
-    return frames
+
+def _decode_frames_ffmpeg(video_path: str, fps: float, total_frames: int, frame_interval: int):
+    """One ffmpeg decode pass: select every frame_interval-th frame, downscale,
+    and stream uncompressed BMPs over stdout (self-delimiting via their header)."""
+    import numpy as np
+
+    expected = len(range(0, total_frames, frame_interval))
+    cmd = [
+        get_ffmpeg_path(), "-nostdin", "-v", "error",
+        "-i", video_path,
+        "-an", "-sn",
+        "-vf", f"select='not(mod(n,{frame_interval}))',scale='min({MAX_FRAME_WIDTH},iw)':-2",
+        # Pass selected frames through as-is; the default constant-rate
+        # output would pad the dropped ones with duplicates of frame 0
+        "-fps_mode", "passthrough",
+        "-frames:v", str(expected),
+        "-f", "image2pipe", "-c:v", "bmp", "-",
+    ]
+    proc = subprocess.Popen(cmd, stdout=subprocess.PIPE, stderr=subprocess.PIPE)
+    drained = False
+    try:
+        for i in range(expected):
+            header = proc.stdout.read(14)
+            if len(header) < 14:
+                break
+            size = int.from_bytes(header[2:6], "little")
+            payload = header + proc.stdout.read(size - 14)
+            if len(payload) < size:
+                break
+            frame = cv2.imdecode(np.frombuffer(payload, dtype=np.uint8), cv2.IMREAD_COLOR)
+            if frame is None:
+                raise Exception("ffmpeg produced an undecodable frame")
+            yield (i * frame_interval) / fps, frame
+        drained = True
+    finally:
+        # Consumer stopped early: don't wait on a writer blocked on the pipe
+        if not drained:
+            proc.terminate()
+        proc.stdout.close()
+        stderr = proc.stderr.read().decode("utf-8", errors="replace")
+        proc.stderr.close()
+        if proc.wait() != 0 and drained:
+            raise Exception(f"ffmpeg frame extraction failed: {stderr.strip()[-500:]}")
 
 
 def save_frame_thumbnails(
-    frames: List[Tuple[float, str]],
+    frames: List[Frame],
     content_id: str,
     output_dir: str = "data/thumbnails"
 ) -> List[dict]:
     """Save frame thumbnails to Vercel Blob (or local disk as fallback).
 
     Args:
-        frames: List of (timestamp, base64_image) tuples from extract_frames()
+        frames: Frame records from extract_frames() (their thumbnail JPEGs are stored as-is)
         content_id: Content ID for subdirectory
         output_dir: Root thumbnails directory (used for local fallback only)
 
     Returns:
         List of {timestamp, filename, url} dicts (the thumbnail manifest)
     """
-    import numpy as np
-
     # Check if Vercel Blob is available
     try:
         from blob_storage import upload_thumbnail, is_blob_enabled
@@ -588,49 +832,30 @@ def save_frame_thumbnails(
     except ImportError:
         use_blob = False
 
-    # Local fallback directory
-    if not use_blob:
+    def save_local(filename: str, jpeg_bytes: bytes):
         thumb_dir = os.path.join(output_dir, content_id)
         os.makedirs(thumb_dir, exist_ok=True)
+        with open(os.path.join(thumb_dir, filename), "wb") as f:
+            f.write(jpeg_bytes)
 
     manifest = []
-    for timestamp, b64_image in frames:
-        # Decode base64 to image
-        img_bytes = base64.b64decode(b64_image)
-        img_array = np.frombuffer(img_bytes, dtype=np.uint8)
-        img = cv2.imdecode(img_array, cv2.IMREAD_COLOR)
-        if img is None:
-            continue
-
-        # Resize to 320px wide, maintain aspect ratio
-        h, w = img.shape[:2]
-        target_w = 320
-        scale = target_w / w
-        target_h = int(h * scale)
-        thumb = cv2.resize(img, (target_w, target_h))
-
-        # Encode to JPEG bytes
+    for frame in frames:
+        timestamp = frame.timestamp
         filename = f"{round(timestamp)}.jpg"
-        _, jpeg_buffer = cv2.imencode('.jpg', thumb, [cv2.IMWRITE_JPEG_QUALITY, 80])
-        jpeg_bytes = jpeg_buffer.tobytes()
 
         if use_blob:
             # Upload to Vercel Blob
             try:
-                blob_url = upload_thumbnail(jpeg_bytes, f"thumbnails/{content_id}/{filename}")
+                blob_url = upload_thumbnail(frame.thumbnail, f"thumbnails/{content_id}/{filename}")
                 manifest.append({"timestamp": timestamp, "filename": filename, "url": blob_url})
             except Exception as e:
                 print(f"Warning: Blob upload failed for {filename}: {e}")
                 # Fallback to local
-                thumb_dir = os.path.join(output_dir, content_id)
-                os.makedirs(thumb_dir, exist_ok=True)
-                filepath = os.path.join(thumb_dir, filename)
-                cv2.imwrite(filepath, thumb, [cv2.IMWRITE_JPEG_QUALITY, 80])
+                save_local(filename, frame.thumbnail)
                 manifest.append({"timestamp": timestamp, "filename": filename})
         else:
             # Save locally
-            filepath = os.path.join(thumb_dir, filename)
-            cv2.imwrite(filepath, thumb, [cv2.IMWRITE_JPEG_QUALITY, 80])
+            save_local(filename, frame.thumbnail)
             manifest.append({"timestamp": timestamp, "filename": filename})
 
     storage = "Vercel Blob" if use_blob else output_dir
@@ -641,7 +866,7 @@ def save_frame_thumbnails(
 def extract_frames_at_timestamps(
     video_path: str,
     timestamps: List[float]
-) -> List[Tuple[float, str]]:
+) -> List[Frame]:
     """Extract frames at specific timestamps (for backfill).
 
     Args:
@@ -649,7 +874,7 @@ def extract_frames_at_timestamps(
         timestamps: List of timestamps in seconds
 
     Returns:
-        List of (timestamp, base64_image) tuples
+        List of Frame records
     """
     cap = cv2.VideoCapture(video_path)
     if not cap.isOpened():
@@ -665,15 +890,7 @@ def extract_frames_at_timestamps(
         if not ret:
             continue
 
-        # Resize for efficiency (720p max)
-        height, width = frame.shape[:2]
-        if width > 1280:
-            scale = 1280 / width
-            frame = cv2.resize(frame, (1280, int(height * scale)))
-
-        _, buffer = cv2.imencode('.jpg', frame, [cv2.IMWRITE_JPEG_QUALITY, 85])
-        base64_image = base64.b64encode(buffer).decode('utf-8')
-        frames.append((ts, base64_image))
+        frames.append(_encode_frame(ts, frame))
 
     cap.release()
     print(f"Extracted {len(frames)} frames at specific timestamps")
@@ -703,6 +920,43 @@ def get_video_info(video_path: str) -> dict:
     return info
 
 
+@dataclass
+class JobArtifacts:
+    """What a job has already fetched for its source.
+
+    The worker fills this while it checks captions, duration and credits,
+    and VideoMemoryAI.process_video picks up from there, so each external
+    call (caption listing, yt-dlp metadata, download, probe) happens at
+    most once per job. None means "not fetched yet".
+    """
+    captions: Optional[dict] = None
+    captions_checked: bool = False  # distinguishes "no captions" from "not asked yet"
+    metadata: Optional[dict] = None
+    audio_path: Optional[str] = None
+    video_path: Optional[str] = None
+    video_info: Optional[dict] = None
+    video_info_path: Optional[str] = None
+
+    def get_captions(self, video_id: str) -> Optional[dict]:
+        """YouTube captions for video_id, fetched on first use"""
+        if not self.captions_checked:
+            self.captions = fetch_youtube_captions(video_id)
+            self.captions_checked = True
+        return self.captions
+
+    def get_video_info(self, path: str) -> dict:
+        """get_video_info(path), probed once per path"""
+        if self.video_info is None or self.video_info_path != path:
+            self.video_info = get_video_info(path)
+            self.video_info_path = path
+        return self.video_info
+
+    def cached_path(self, attr: str) -> Optional[str]:
+        """audio_path / video_path if set and still on disk"""
+        path = getattr(self, attr)
+        return path if path and os.path.exists(path) else None
+
+
 if __name__ == "__main__":
     # Test with a sample video
     import sys
@@ -22,9 +22,10 @@ sys.path.insert(0, str(Path(__file__).parent))
 import openai  # noqa: F401
 
 from database import SessionLocal, Job as JobModel, Report, ContentVector, Collection
-from job_service import JobService
+from job_service import JobService, JobProgressReporter
+from job_events import publish_job_event
 from billing import BillingService
-from video_processor import download_audio_with_metadata, get_video_info, fetch_youtube_captions, get_video_metadata_fast, _extract_video_id
+from video_processor import download_audio_with_metadata, get_video_metadata_fast, _extract_video_id, JobArtifacts
 from vector_memory import VectorMemory
 from config import get_config, init_config
 
@@ -106,6 +107,16 @@ def _release_slot():
     _processing_semaphore.release()
 
 
+def _log_diarization_metrics(job_id: str, result):
+    """Per-job diarization overhead next to the process-wide pool totals."""
+    timings = (getattr(result, "metadata", None) or {}).get("diarization")
+    if timings:
+        from speaker_diarization import get_diarizer_pool
+        print(f"[Job {job_id}] Diarization: waited {timings['wait_seconds']:.1f}s, "
+              f"model load {timings['load_seconds']:.1f}s, ran {timings['diarize_seconds']:.1f}s "
+              f"| pool {get_diarizer_pool().get_stats()}")
+
+
 def _get_app(user_id, db):
     """Create a VideoMemoryAI instance for the worker (mirrors api.py get_app)."""
     from app import VideoMemoryAI
@@ -166,6 +177,10 @@ def process_video_job(
             cookies_temp_path = cookies_temp.name
 
         try:
+            # Everything fetched here is handed to process_video() so captions,
+            # metadata and the audio download aren't fetched a second time
+            artifacts = JobArtifacts()
+
             # Check for YouTube caption fast path before downloading audio
             youtube_stats = None
             duration_min = 0
@@ -180,18 +195,20 @@ def process_video_job(
                             db=bg_db, job_id=job_id, progress=2,
                             status="Checking for captions...",
                         )
-                        captions = fetch_youtube_captions(video_id)
+                        captions = artifacts.get_captions(video_id)
                         if captions:
                             caption_fast_path = True
                             print(f"[Job {job_id}] YouTube captions found! Fast path enabled.")
 
-                if caption_fast_path:
-                    # Fast path: fetch metadata only (no audio download)
+                if caption_fast_path or get_config().transcription.streaming:
+                    # Fast path: fetch metadata only (no audio download). When
+                    # streaming, process_video downloads the audio as it transcribes.
                     JobService.update_job_progress(
                         db=bg_db, job_id=job_id, progress=3,
                         status="Fetching video metadata...",
                     )
                     meta = get_video_metadata_fast(url_or_path, cookies_file=cookies_temp_path)
+                    artifacts.metadata = meta
                     duration_sec = meta.get("duration", 0)
                     duration_min = duration_sec / 60
 
@@ -206,7 +223,7 @@ def process_video_job(
                             "categories": meta.get("categories", []),
                             "description": meta.get("description", "")[:500],
                         }
-                    print(f"[Job {job_id}] Fast path metadata: duration={duration_min:.1f} min")
+                    print(f"[Job {job_id}] Metadata (no audio download): duration={duration_min:.1f} min")
                 else:
                     # Standard path: download audio + metadata
                     try:
@@ -218,6 +235,7 @@ def process_video_job(
                             url_or_path, output_dir="data/videos",
                             cookies_file=cookies_temp_path,
                         )
+                        artifacts.audio_path, artifacts.metadata = _audio_path, meta
                         duration_sec = meta.get("duration", 0)
                         duration_min = duration_sec / 60
 
@@ -279,21 +297,10 @@ def process_video_job(
                 )
                 return
 
+            reporter = JobProgressReporter(job_id, user_id)
+
             def progress_callback(percent, status):
-                _pdb = SessionLocal()
-                try:
-                    # Don't overwrite terminal states (failed/completed/cancelled)
-                    j = _pdb.query(JobModel).filter(JobModel.id == job_id).first()
-                    if j and j.status in ("failed", "completed", "cancelled"):
-                        return
-                    JobService.update_job_progress(
-                        db=_pdb, job_id=job_id, progress=percent,
-                        status=status or "processing",
-                    )
-                except Exception as _pe:
-                    print(f"[Job {job_id}] Progress update failed: {_pe}")
-                finally:
-                    _pdb.close()
+                reporter(percent, status)
                 print(f"[Job {job_id}] Progress: {percent}% - {status}")
 
             ai = _get_app(user_id, bg_db)
@@ -315,6 +322,7 @@ def process_video_job(
                 language=language,
                 save_content=False,
                 cookies_file=cookies_temp_path,
+                artifacts=artifacts,
             )
         finally:
             if cookies_temp_path:
@@ -323,6 +331,9 @@ def process_video_job(
                 except OSError:
                     pass
 
+        _log_diarization_metrics(job_id, result)
+        print(f"[Job {job_id}] Progress: {reporter.writes} of {reporter.updates} updates written to the database")
+
         # Fresh DB session for save operations (bg_db already closed above)
         save_db = SessionLocal()
         try:
@@ -332,6 +343,8 @@ def process_video_job(
             j = JobService.get_job(save_db, job_id)
             if j and j.status == "cancelled":
                 print(f"[Job {job_id}] Cancelled by user, skipping save.")
+                # Final word on the stream, after any progress that raced the cancel
+                publish_job_event(user_id, {"id": job_id, "status": "cancelled"})
                 return
 
             # Get file size for storage tracking
@@ -468,10 +481,11 @@ def process_upload_job(
     try:
         print(f"[Job {job_id}] Starting upload processing for: {display_name}")
 
-        # Check video duration
+        # Check video duration (the probe result is reused by process_video)
+        artifacts = JobArtifacts()
         duration_min = 0
         try:
-            info = get_video_info(dest_path)
+            info = artifacts.get_video_info(dest_path)
             duration_min = info.get("duration", 0) / 60
         except Exception as e:
             print(f"[Job {job_id}] Duration check failed (proceeding): {e}")
@@ -510,21 +524,10 @@ def process_upload_job(
             )
             return
 
+        reporter = JobProgressReporter(job_id, user_id)
+
         def progress_callback(percent, status):
-            _pdb = SessionLocal()
-            try:
-                # Don't overwrite terminal states (failed/completed/cancelled)
-                j = _pdb.query(JobModel).filter(JobModel.id == job_id).first()
-                if j and j.status in ("failed", "completed", "cancelled"):
-                    return
-                JobService.update_job_progress(
-                    db=_pdb, job_id=job_id, progress=percent,
-                    status=status or "processing",
-                )
-            except Exception as _pe:
-                print(f"[Job {job_id}] Progress update failed: {_pe}")
-            finally:
-                _pdb.close()
+            reporter(percent, status)
             print(f"[Job {job_id}] Progress: {percent}% - {status}")
 
         ai = _get_app(user_id, bg_db)
@@ -542,8 +545,12 @@ def process_upload_job(
             mode=mode,
             language=language,
             save_content=False,
+            artifacts=artifacts,
         )
 
+        _log_diarization_metrics(job_id, result)
+        print(f"[Job {job_id}] Progress: {reporter.writes} of {reporter.updates} updates written to the database")
+
         # Fresh DB session for save operations (bg_db already closed above)
         save_db = SessionLocal()
         try:
@@ -553,6 +560,8 @@ def process_upload_job(
             j = JobService.get_job(save_db, job_id)
             if j and j.status == "cancelled":
                 print(f"[Job {job_id}] Cancelled by user, skipping save.")
+                # Final word on the stream, after any progress that raced the cancel
+                publish_job_event(user_id, {"id": job_id, "status": "cancelled"})
                 return
 
             # File size for storage tracking
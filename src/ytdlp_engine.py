@@ -0,0 +1,210 @@
+"""
+In-process yt-dlp engine
+Long-lived YoutubeDL instances and a TTL cache of extracted info dicts, so a
+job's metadata probe and its download share one extraction
+"""
+import copy
+import os
+import threading
+import time
+from typing import Dict, Optional
+
+from config import get_config
+
+# Same extractor options the subprocess path passes on the command line
+# (--no-playlist --js-runtimes node --remote-components ejs:github)
+_BASE_PARAMS = {
+    "quiet": True,
+    "no_warnings": True,
+    "noprogress": True,
+    "noplaylist": True,
+    "js_runtimes": {"node": {}},
+    "remote_components": ["ejs:github"],
+}
+
+# Per-kind download options (-f / --extract-audio / --audio-format)
+_DOWNLOAD_PARAMS = {
+    "video": {"format": "best[height<=720]"},
+    "audio": {
+        "format": "bestaudio[ext=m4a]/bestaudio",
+        "postprocessors": [{"key": "FFmpegExtractAudio", "preferredcodec": "m4a"}],
+    },
+}
+
+
+class YtdlpEngine:
+    """yt-dlp through its Python API instead of one subprocess per call.
+
+    Extraction uses a small pool of long-lived YoutubeDL instances (up to
+    `max_extractors`, one per concurrent caller); each keeps its extractor
+    instances (and the YouTube player/JS challenge caches inside them) for
+    the life of the process. Extracted info dicts are cached for `info_ttl` seconds, and
+    downloads run format selection on a copy of the cached dict with a
+    per-kind YoutubeDL, so probing metadata and then downloading the same URL
+    extracts once. The TTL should stay well under the lifetime of the signed
+    media URLs in the info dict (hours for YouTube).
+
+    YoutubeDL isn't thread-safe, so each instance is used by one caller at a
+    time: extractors are checked out of the pool, downloaders have a lock each.
+    Cookie files are per user: calls with cookies get a throwaway instance
+    (still in-process) and don't touch the shared ones, and their info dicts
+    are cached under the cookie file so they're never served to other calls.
+    """
+
+    def __init__(self, info_ttl: int = 1800, max_extractors: int = 4):
+        import yt_dlp  # ImportError here means "use the subprocess path"
+
+        self._yt_dlp = yt_dlp
+        self.info_ttl = info_ttl
+        self.max_extractors = max(1, max_extractors)
+        self._idle_extractors = [yt_dlp.YoutubeDL(dict(_BASE_PARAMS))]
+        self._extractor_count = 1
+        self._extractors_free = threading.Condition()
+        self._downloaders: Dict[tuple, object] = {}
+        self._download_locks: Dict[tuple, threading.Lock] = {}
+        self._info_cache: Dict[tuple, tuple] = {}  # (url, cookies_file) -> (expires_at, raw info dict)
+        self._lock = threading.Lock()
+        self._stats = {"info_hits": 0, "info_misses": 0, "downloads": 0}
+
+    def extract_info(self, url: str, cookies_file: str = None) -> dict:
+        """Raw (unprocessed) info dict for url, from the cache when fresh"""
+        now = time.time()
+        cache_key = (url, cookies_file or None)
+        with self._lock:
+            cached = self._info_cache.get(cache_key)
+            if cached and cached[0] > now:
+                self._stats["info_hits"] += 1
+                return cached[1]
+            self._stats["info_misses"] += 1
+
+        if cookies_file:
+            with self._yt_dlp.YoutubeDL({**_BASE_PARAMS, "cookiefile": cookies_file}) as ydl:
+                info = ydl.extract_info(url, download=False, process=False)
+        else:
+            extractor = self._acquire_extractor()
+            try:
+                info = extractor.extract_info(url, download=False, process=False)
+            finally:
+                self._release_extractor(extractor)
+
+        with self._lock:
+            # Drop expired entries while we're here; the cache stays small
+            for key in [k for k, (expires, _) in self._info_cache.items() if expires <= now]:
+                del self._info_cache[key]
+            self._info_cache[cache_key] = (now + self.info_ttl, info)
+        return info
+
+    def _acquire_extractor(self):
+        """An idle extractor, a new one while under max_extractors, or wait for one"""
+        with self._extractors_free:
+            while not self._idle_extractors and self._extractor_count >= self.max_extractors:
+                self._extractors_free.wait()
+            if self._idle_extractors:
+                return self._idle_extractors.pop()
+            self._extractor_count += 1
+        try:
+            return self._yt_dlp.YoutubeDL(dict(_BASE_PARAMS))
+        except Exception:
+            with self._extractors_free:
+                self._extractor_count -= 1
+                self._extractors_free.notify()
+            raise
+
+    def _release_extractor(self, extractor):
+        with self._extractors_free:
+            self._idle_extractors.append(extractor)
+            self._extractors_free.notify()
+
+    def get_metadata(self, url: str, fields: list, cookies_file: str = None) -> dict:
+        """Metadata dict in the shape _parse_metadata_output() produces"""
+        info = self.extract_info(url, cookies_file=cookies_file)
+        return _metadata_from_info(info, fields)
+
+    def download(self, url: str, kind: str, output_dir: str, cookies_file: str = None) -> tuple:
+        """Download `kind` ("video" or "audio") of url into output_dir.
+
+        Returns:
+            (file_path, raw_info_dict)
+        """
+        info = self.extract_info(url, cookies_file=cookies_file)
+        params = {
+            **_BASE_PARAMS,
+            **_DOWNLOAD_PARAMS[kind],
+            "outtmpl": os.path.join(output_dir, "%(id)s.%(ext)s"),
+        }
+        # Format selection and post-processing mutate the dict they're given
+        processed_input = copy.deepcopy(info)
+
+        if cookies_file:
+            with self._yt_dlp.YoutubeDL({**params, "cookiefile": cookies_file}) as ydl:
+                processed = ydl.process_ie_result(processed_input, download=True)
+        else:
+            key = (kind, output_dir)
+            with self._lock:
+                if key not in self._downloaders:
+                    self._downloaders[key] = self._yt_dlp.YoutubeDL(params)
+                    self._download_locks[key] = threading.Lock()
+                ydl, lock = self._downloaders[key], self._download_locks[key]
+            with lock:
+                processed = ydl.process_ie_result(processed_input, download=True)
+
+        with self._lock:
+            self._stats["downloads"] += 1
+        downloads = processed.get("requested_downloads") or [processed]
+        path = downloads[-1].get("filepath") or processed.get("filepath")
+        if not path or not os.path.exists(path):
+            raise Exception(f"yt-dlp reported no file for {url}")
+        return path, info
+
+    def get_stats(self) -> Dict[str, int]:
+        with self._lock:
+            stats = {**self._stats, "cached_infos": len(self._info_cache)}
+        with self._extractors_free:
+            stats["extractors"] = self._extractor_count
+        return stats
+
+
+_NUMERIC_FIELDS = ("duration", "view_count", "like_count", "comment_count", "channel_follower_count")
+
+
+def _metadata_from_info(info: dict, fields: list) -> dict:
+    """Info dict -> the same field types the --print template parsing yields"""
+    metadata = {}
+    for field in fields:
+        value = info.get(field)
+        if field in _NUMERIC_FIELDS:
+            try:
+                metadata[field] = int(float(value)) if value is not None else 0
+            except (ValueError, TypeError):
+                metadata[field] = 0
+        elif field == "categories":
+            metadata[field] = list(value or [])
+        elif field == "description":
+            metadata[field] = (value or "")[:500]
+        else:
+            metadata[field] = str(value) if value is not None else ""
+    return metadata
+
+
+_engine: Optional[YtdlpEngine] = None
+_engine_lock = threading.Lock()
+_engine_unavailable = False
+
+
+def get_ytdlp_engine() -> Optional[YtdlpEngine]:
+    """The process-wide engine, or None when the subprocess backend should be used"""
+    global _engine, _engine_unavailable
+    if _engine is not None or _engine_unavailable:
+        return _engine
+    config = get_config().video
+    if config.ytdlp_backend != "inprocess":
+        return None
+    with _engine_lock:
+        if _engine is None and not _engine_unavailable:
+            try:
+                _engine = YtdlpEngine(info_ttl=config.ytdlp_info_ttl, max_extractors=config.ytdlp_extractors)
+                print("[YtdlpEngine] In-process yt-dlp ready")
+            except ImportError:
+                _engine_unavailable = True
+                print("[YtdlpEngine] yt_dlp module not importable, using the yt-dlp subprocess")
+    return _engine